@@ -8,7 +8,15 @@ import plotly.graph_objects as go
 import numpy as np
 import json
 from pathlib import Path
-from datetime import datetime
+
+from transystor.core.index import PrincipleIndex
+from transystor.core.store import LAYERS, PrincipleStore
+from transystor.transystor_chatbot import PROVIDER_LABELS, cache_status, stream_tokens
+from transystor.transystor_export import export_all
+from transystor.math.orthogonality import OrthogonalityTracker
+from transystor.visualization.cache import FigureCache
+from transystor.visualization.geometry import layer_geometry, plane_geometry
+from transystor.visualization.lod import LOD_THRESHOLDS, layer_traces
 
 # Configuration de la page
 st.set_page_config(
@@ -84,150 +92,148 @@ if 'principles' not in st.session_state:
          'description': 'Bus = Processus ⊗ Distribution'},
     ]
 
+if 'figure_cache' not in st.session_state:
+    st.session_state.figure_cache = FigureCache()
+
+if 'principle_index' not in st.session_state:
+    st.session_state.principle_index = PrincipleIndex(st.session_state.principles)
+
+if 'ortho_tracker' not in st.session_state:
+    st.session_state.ortho_tracker = OrthogonalityTracker(st.session_state.principles)
+
 # ============================================================================
 # Fonctions utilitaires
 # ============================================================================
 
-def create_visualization():
-    """Crée la visualisation 3D Plotly"""
-    
-    fig = go.Figure()
-    
-    principles = st.session_state.principles
-    visible_layers = st.session_state.visible_layers
-    exclusive_layer = st.session_state.exclusive_layer
-    show_grid = st.session_state.show_grid
-    show_axes = st.session_state.show_axes
-    
-    # Plan CM0
-    if visible_layers.get('CM0') and (not exclusive_layer or exclusive_layer == 'CM0'):
-        z = -0.5
-        for i in range(6):
-            # Lignes horizontales
-            fig.add_trace(go.Scatter3d(
-                x=[0, 5], y=[i, i], z=[z, z],
-                mode='lines',
-                line=dict(color='gray', width=2),
-                opacity=0.3,
-                showlegend=False,
-                hoverinfo='skip'
-            ))
-            # Lignes verticales
-            fig.add_trace(go.Scatter3d(
-                x=[i, i], y=[0, 5], z=[z, z],
-                mode='lines',
-                line=dict(color='gray', width=2),
-                opacity=0.3,
-                showlegend=False,
-                hoverinfo='skip'
-            ))
-    
-    # Fonction pour dessiner un cube
-    def draw_cube(size, center, color, layer_name, show):
-        if not show or (exclusive_layer and exclusive_layer != layer_name):
-            return
-        
-        half = size / 2
-        cx, cy, cz = center
-        
-        # Sommets
-        v = [
-            [cx-half, cy-half, cz-half], [cx+half, cy-half, cz-half],
-            [cx+half, cy+half, cz-half], [cx-half, cy+half, cz-half],
-            [cx-half, cy-half, cz+half], [cx+half, cy-half, cz+half],
-            [cx+half, cy+half, cz+half], [cx-half, cy+half, cz+half]
-        ]
-        
-        # Arêtes
-        edges = [
-            [0,1],[1,2],[2,3],[3,0],
-            [4,5],[5,6],[6,7],[7,4],
-            [0,4],[1,5],[2,6],[3,7]
-        ]
-        
-        lines = []
-        for e in edges:
-            lines.extend([v[e[0]], v[e[1]], [None, None, None]])
-        
-        x, y, z = zip(*lines)
-        
+CUBE_CONFIGS = {
+    'CM1': {'size': 3, 'center': [2, 2, 2], 'color': '#3b82f6'},
+    'CM2': {'size': 4, 'center': [2, 2, 2], 'color': '#10b981'},
+    'CM3': {'size': 5, 'center': [2, 2, 2], 'color': '#8b5cf6'}
+}
+
+FIGURE_TITLES = {
+    'fr': 'TranSysTor - Cubes Imbriqués',
+    'en': 'TranSysTor - Nested Cubes'
+}
+
+
+def cm0_plane_traces():
+    """Traces statiques du plan CM0"""
+    lines = plane_geometry((5, 5), -0.5).lines
+    return [go.Scatter3d(
+        x=lines[:, 0], y=lines[:, 1], z=lines[:, 2],
+        mode='lines',
+        line=dict(color='gray', width=2),
+        opacity=0.3,
+        showlegend=False,
+        hoverinfo='skip'
+    )]
+
+
+def cube_traces(layer_name):
+    """Traces statiques d'un cube (arêtes et faces transparentes)"""
+    config = CUBE_CONFIGS[layer_name]
+    size, color = config['size'], config['color']
+    geometry = layer_geometry(config)
+    edges, vertices, faces = geometry.edge_lines, geometry.vertices, geometry.faces
+    
+    return [
         # Arêtes
-        fig.add_trace(go.Scatter3d(
-            x=x, y=y, z=z,
+        go.Scatter3d(
+            x=edges[:, 0], y=edges[:, 1], z=edges[:, 2],
             mode='lines',
             line=dict(color=color, width=3),
             opacity=0.6,
             name=f'{layer_name} ({size}×{size}×{size})',
             hoverinfo='name'
-        ))
-        
+        ),
         # Faces transparentes avec Mesh3d
-        vertices_x = [v[i][0] for i in range(8)]
-        vertices_y = [v[i][1] for i in range(8)]
-        vertices_z = [v[i][2] for i in range(8)]
-        
-        faces_i = [0,0,4,4,0,2, 1,1,5,5,1,3, 2,2,6,6,4,0, 3,3,7,7,5,1]
-        faces_j = [1,3,5,7,4,6, 2,0,6,4,5,7, 3,1,7,5,6,2, 0,2,4,6,7,3]
-        faces_k = [2,2,6,6,5,5, 3,3,7,7,6,6, 1,1,5,5,7,7, 2,2,6,6,4,4]
-        
-        fig.add_trace(go.Mesh3d(
-            x=vertices_x, y=vertices_y, z=vertices_z,
-            i=faces_i, j=faces_j, k=faces_k,
+        go.Mesh3d(
+            x=vertices[:, 0], y=vertices[:, 1], z=vertices[:, 2],
+            i=faces[:, 0], j=faces[:, 1], k=faces[:, 2],
             color=color,
             opacity=0.08,
             flatshading=True,
             showlegend=False,
             hoverinfo='skip'
-        ))
-    
-    # Dessiner les cubes
-    cube_configs = {
-        'CM1': {'size': 3, 'center': [2, 2, 2], 'color': '#3b82f6'},
-        'CM2': {'size': 4, 'center': [2, 2, 2], 'color': '#10b981'},
-        'CM3': {'size': 5, 'center': [2, 2, 2], 'color': '#8b5cf6'}
-    }
-    
-    for layer, config in cube_configs.items():
-        draw_cube(
-            config['size'],
-            config['center'],
-            config['color'],
-            layer,
-            visible_layers.get(layer, False)
         )
+    ]
+
+
+def grid_traces(layer_name):
+    """Traces statiques de la grille interne d'un cube"""
+    config = CUBE_CONFIGS[layer_name]
+    lattice = layer_geometry(config).lattice_lines
+    return [go.Scatter3d(
+        x=lattice[:, 0], y=lattice[:, 1], z=lattice[:, 2],
+        mode='lines',
+        line=dict(color=config['color'], width=0.5),
+        opacity=0.15,
+        showlegend=False,
+        hoverinfo='skip'
+    )]
+
+
+def axes_traces():
+    """Traces statiques des axes IJK"""
+    return [
+        go.Scatter3d(
+            x=[0, end[0]], y=[0, end[1]], z=[0, end[2]],
+            mode='lines+text',
+            line=dict(color=color, width=4),
+            text=['', label],
+            textfont=dict(size=14, color=color),
+            showlegend=False,
+            hoverinfo='skip'
+        )
+        for color, end, label in [
+            ('red', [5.5, 0, 0], 'I'),
+            ('green', [0, 5.5, 0], 'J'),
+            ('blue', [0, 0, 5.5], 'K')
+        ]
+    ]
+
+
+def principle_hover_text(p):
+    """Texte de survol d'un principe"""
+    pos = p['position']
+    
+    hover_text = f"<b>{p['name']}</b><br>"
+    hover_text += f"Couche: {p['layer']}<br>"
+    hover_text += f"Position: [{pos[0]:.1f}, {pos[1]:.1f}, {pos[2]:.1f}]<br>"
+    hover_text += f"{p['description']}"
+    return hover_text
+
+
+def principle_traces(principles, visible_layers, exclusive_layer):
+    """Traces des principes affichés (dépendent des données)"""
+    shown = [
+        p for p in principles
+        if (p['layer'] == exclusive_layer if exclusive_layer
+            else visible_layers.get(p['layer'], False))
+    ]
     
-    # Axes IJK
-    if show_axes:
-        for axis, color, end, label in [
-            ('I', 'red', [5.5, 0, 0], 'I'),
-            ('J', 'green', [0, 5.5, 0], 'J'),
-            ('K', 'blue', [0, 0, 5.5], 'K')
-        ]:
-            fig.add_trace(go.Scatter3d(
-                x=[0, end[0]], y=[0, end[1]], z=[0, end[2]],
-                mode='lines+text',
-                line=dict(color=color, width=4),
-                text=['', label],
-                textfont=dict(size=14, color=color),
-                showlegend=False,
-                hoverinfo='skip'
-            ))
-    
-    # Principes
-    for p in principles:
-        if exclusive_layer and p['layer'] != exclusive_layer:
-            continue
-        if not exclusive_layer and not visible_layers.get(p['layer'], False):
-            continue
-        
+    # Grands modèles : une trace par couche avec niveau de détail adapté,
+    # positions, noms et couleurs lus en tranches du stockage colonnaire
+    if len(shown) > LOD_THRESHOLDS['labels']:
+        store = PrincipleStore(shown)
+        traces = []
+        for layer in LAYERS:
+            if not store.count(layer):
+                continue
+            color = CUBE_CONFIGS.get(layer, {}).get('color', '#4b5563')
+            traces += layer_traces(
+                layer, store.layer(layer), color, principle_hover_text,
+                positions=store.positions_view(layer), names=store.names_view(layer),
+                colors=store.colors_of(layer, color)
+            )
+        return traces
+    
+    traces = []
+    for p in shown:
         pos = p['position']
         
-        hover_text = f"<b>{p['name']}</b><br>"
-        hover_text += f"Couche: {p['layer']}<br>"
-        hover_text += f"Position: [{pos[0]:.1f}, {pos[1]:.1f}, {pos[2]:.1f}]<br>"
-        hover_text += f"{p['description']}"
-        
-        fig.add_trace(go.Scatter3d(
+        traces.append(go.Scatter3d(
             x=[pos[0]], y=[pos[1]], z=[pos[2]],
             mode='markers+text',
             marker=dict(
@@ -240,79 +246,91 @@ def create_visualization():
             textposition='top center',
             textfont=dict(size=9, color=p['color']),
             name=p['name'],
-            hovertext=hover_text,
+            hovertext=principle_hover_text(p),
             hoverinfo='text'
         ))
-    
-    # Mise en page
-    fig.update_layout(
-        title='TranSysTor - Cubes Imbriqués',
-        scene=dict(
-            xaxis=dict(title='I', range=[-0.5, 5.5], showgrid=False),
-            yaxis=dict(title='J', range=[-0.5, 5.5], showgrid=False),
-            zaxis=dict(title='K', range=[-1, 5.5], showgrid=False),
-            camera=dict(eye=dict(x=1.5, y=1.5, z=1.3)),
-            aspectmode='cube',
-            bgcolor='rgba(0,0,0,0)'
-        ),
-        showlegend=True,
-        height=700,
-        paper_bgcolor='#1f2937',
-        plot_bgcolor='#1f2937',
-        font=dict(color='white')
-    )
-    
-    return fig
+    return traces
 
 
-def compute_orthogonality():
-    """Calcule l'orthogonalité"""
-    principles = st.session_state.principles
-    vectors = np.array([p['position'] for p in principles])
+def create_visualization():
+    """Crée la visualisation 3D Plotly (mise en cache)"""
+    
+    cache = st.session_state.figure_cache
     
-    if len(vectors) < 2:
-        return 1.0
+    principles = st.session_state.principles
+    visible_layers = st.session_state.visible_layers
+    exclusive_layer = st.session_state.exclusive_layer
+    show_grid = st.session_state.show_grid
+    show_axes = st.session_state.show_axes
+    language = st.session_state.language
     
-    n = len(vectors)
-    matrix = np.zeros((n, n))
+    key = cache.figure_key(principles, visible_layers, exclusive_layer,
+                           show_grid, show_axes, language)
     
-    for i in range(n):
-        for j in range(n):
-            if i != j:
-                v1 = vectors[i] / (np.linalg.norm(vectors[i]) + 1e-6)
-                v2 = vectors[j] / (np.linalg.norm(vectors[j]) + 1e-6)
-                matrix[i, j] = abs(np.dot(v1, v2))
+    def build_figure():
+        traces = []
+        
+        # Plan CM0
+        if visible_layers.get('CM0') and (not exclusive_layer or exclusive_layer == 'CM0'):
+            traces += cache.part(('CM0',), cm0_plane_traces)
+        
+        # Cubes
+        for layer in CUBE_CONFIGS:
+            if not visible_layers.get(layer, False):
+                continue
+            if exclusive_layer and exclusive_layer != layer:
+                continue
+            traces += cache.part(('cube', layer), lambda: cube_traces(layer))
+            if show_grid:
+                traces += cache.part(('grid', layer), lambda: grid_traces(layer))
+        
+        # Axes IJK
+        if show_axes:
+            traces += cache.part(('axes',), axes_traces)
+        
+        # Principes (clé : empreinte des données et filtre de couches)
+        traces += cache.part(
+            ('principles',) + key[:3],
+            lambda: principle_traces(principles, visible_layers, exclusive_layer)
+        )
+        
+        fig = go.Figure(data=traces)
+        
+        # Mise en page
+        fig.update_layout(
+            title=FIGURE_TITLES.get(language, FIGURE_TITLES['fr']),
+            scene=dict(
+                xaxis=dict(title='I', range=[-0.5, 5.5], showgrid=False),
+                yaxis=dict(title='J', range=[-0.5, 5.5], showgrid=False),
+                zaxis=dict(title='K', range=[-1, 5.5], showgrid=False),
+                camera=dict(eye=dict(x=1.5, y=1.5, z=1.3)),
+                aspectmode='cube',
+                bgcolor='rgba(0,0,0,0)'
+            ),
+            showlegend=True,
+            height=700,
+            paper_bgcolor='#1f2937',
+            plot_bgcolor='#1f2937',
+            font=dict(color='white')
+        )
+        
+        return fig
     
-    score = 1 - np.mean(matrix[matrix > 0]) if matrix.any() else 1.0
-    return score
+    return cache.figure(key, build_figure)
 
 
-def export_owl():
-    """Génère export OWL"""
-    principles = st.session_state.principles
-    
-    owl = """@prefix : <http://transystor.org/ontology/tscp#> .
-@prefix owl: <http://www.w3.org/2002/07/owl#> .
-@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+def compute_orthogonality():
+    """Calcule l'orthogonalité (mise à jour incrémentale du suivi)"""
+    tracker = st.session_state.ortho_tracker
+    tracker.sync(st.session_state.principles)
+    return tracker.score
 
-:TSCP rdf:type owl:Ontology ;
-    rdfs:label "TSCP Ontology" ;
-    owl:versionInfo "0.2.0" .
 
-"""
-    for p in principles:
-        name = p['name'].replace(' ', '_')
-        owl += f"\n:{name} rdf:type :CM{p['layer'][-1]}_Class ;\n"
-        owl += f'    rdfs:label "{p["name"]}" ;\n'
-        owl += f'    :hasPosition "{p["position"]}" .\n'
-    
-    filename = f"tscp_owl_{datetime.now().strftime('%Y%m%d_%H%M%S')}.ttl"
-    filepath = EXPORT_DIR / filename
-    
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(owl)
-    
-    return filepath, owl
+def export_bundle():
+    """Génère les exports OWL, SHACL et RDFS en une passe"""
+    bundle = export_all(st.session_state.principles, export_dir=EXPORT_DIR)
+    content = bundle['files']['owl'].read_text(encoding='utf-8')
+    return bundle, content
 
 
 # ============================================================================
@@ -368,15 +386,15 @@ with st.sidebar:
     # Statistiques
     st.subheader("📊 Statistiques")
     principles = st.session_state.principles
-    by_layer = {}
-    for p in principles:
-        by_layer.setdefault(p['layer'], []).append(p)
+    index = st.session_state.principle_index
+    index.sync(principles)
+    counts = index.layer_counts()
     
     for layer in ['CM0', 'CM1', 'CM2', 'CM3']:
-        count = len(by_layer.get(layer, []))
-        st.metric(layer, count)
+        st.metric(layer, counts.get(layer, 0))
     
     st.metric("Total", len(principles))
+    st.metric("Orthogonalité", f"{compute_orthogonality():.3f}")
 
 # Layout principal à 2 colonnes
 col1, col2 = st.columns([3, 1])
@@ -400,9 +418,12 @@ with col1:
                 st.warning(f"⚠️ Orthogonalité: {score:.3f} - À REVOIR")
     
     with btn_col3:
-        if st.button("📥 Export OWL", use_container_width=True):
-            filepath, content = export_owl()
-            st.success(f"✅ Exporté: {filepath.name}")
+        if st.button("📥 Export", use_container_width=True):
+            bundle, content = export_bundle()
+            timings = ", ".join(
+                f"{name.upper()} {bundle['timings'][name]:.2f}s" for name in bundle['files']
+            )
+            st.success(f"✅ Exporté: {bundle['path'].name} ({timings})")
             with st.expander("Voir le contenu"):
                 st.code(content[:500] + "...", language="turtle")
     
@@ -413,20 +434,50 @@ with col1:
 with col2:
     st.subheader("🗂️ Explorateur")
     
-    principles = st.session_state.principles
-    by_layer = {}
-    for p in principles:
-        by_layer.setdefault(p['layer'], []).append(p)
+    index = st.session_state.principle_index
     
     for layer in ['CM0', 'CM1', 'CM2', 'CM3']:
-        with st.expander(f"**{layer}** ({len(by_layer.get(layer, []))})"):
-            for p in by_layer.get(layer, []):
+        layer_principles = index.by_layer(layer)
+        with st.expander(f"**{layer}** ({len(layer_principles)})"):
+            for p in layer_principles:
                 st.markdown(
                     f"<div style='padding: 5px; border-left: 3px solid {p['color']};'>"
                     f"{p['name']}</div>",
                     unsafe_allow_html=True
                 )
 
+# Assistant IA
+st.markdown("---")
+st.subheader("💬 Assistant IA")
+
+assistant_col1, assistant_col2 = st.columns([1, 3])
+
+with assistant_col1:
+    provider_label = st.selectbox(
+        "Fournisseur", list(PROVIDER_LABELS), index=list(PROVIDER_LABELS).index('Local (test)')
+    )
+    provider_name = PROVIDER_LABELS[provider_label]
+    api_key = st.text_input(
+        "Clé API", type="password", disabled=provider_name not in ('anthropic', 'openai')
+    )
+
+with assistant_col2:
+    question = st.text_area("Question", placeholder="Posez votre question sur le framework TSCP...")
+    send_col, cancel_col = st.columns(2)
+    send = send_col.button("📨 Envoyer", use_container_width=True)
+    # Un clic relance le script : le flux en cours est fermé, ce qui
+    # annule la génération
+    cancel_col.button("⏹ Annuler", use_container_width=True)
+    
+    if send and question:
+        if provider_name in ('anthropic', 'openai') and not api_key:
+            st.warning(f"Veuillez configurer votre clé API {provider_label.split()[0]}")
+        else:
+            st.write_stream(stream_tokens(
+                provider_name, question, api_key, principles=st.session_state.principles
+            ))
+            st.caption(cache_status())
+
 # Footer
 st.markdown("---")
 st.markdown("*TranSysTor IDE v0.2.0 - Streamlit Edition*")
\ No newline at end of file
@@ -18,4 +18,10 @@ setup(
         "jsonschema>=4.17.0",
         "pyyaml>=6.0",
     ],
+    entry_points={
+        "console_scripts": [
+            "transystor=transystor.cli.main:main",
+            "transystor-audit=transystor.cli.audit:main",
+        ],
+    },
 )
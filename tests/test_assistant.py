@@ -0,0 +1,217 @@
+"""
+Tests de la session de l'assistant avec le fournisseur bouchon : envoi
+parallèle, délai dépassé, flux et annulation, cache des réponses, résumé
+du modèle joint aux questions
+"""
+
+import threading
+import time
+
+import pytest
+
+from transystor.assistant.cache import ResponseCache
+from transystor.assistant.context import ContextBuilder, ModelDigest, estimate_tokens
+from transystor.assistant.providers import Provider, StubProvider, split_tokens
+from transystor.assistant.session import AssistantSession
+
+
+@pytest.fixture
+def session():
+    session = AssistantSession(timeout=5)
+    yield session
+    session.close()
+
+
+def test_provider_is_abstract():
+    with pytest.raises(TypeError):
+        Provider()
+
+    class Incomplete(Provider):
+        name = 'incomplete'
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_fan_out_keeps_order_and_isolates_failures(session):
+    providers = [
+        StubProvider(reply='lent', delay=0.2, model='lent'),
+        StubProvider(reply=RuntimeError('panne'), model='panne'),
+        StubProvider(reply='rapide', model='rapide'),
+    ]
+    start = time.perf_counter()
+    answers = session.fan_out(providers, "Question ?").result()
+    elapsed = time.perf_counter() - start
+
+    assert [a.text for a in answers] == ['lent', None, 'rapide']
+    assert answers[1].error == "Erreur: panne"
+    assert answers[0].error is None and answers[2].error is None
+    # Requêtes simultanées : la durée est celle du plus lent
+    assert elapsed < 0.2 + 0.15
+
+
+def test_timeout_is_reported_as_error(session):
+    provider = StubProvider(reply='trop tard', delay=1.0)
+    answer = session.ask(provider, "Question ?", timeout=0.05).result()
+    assert answer.text is None
+    assert answer.error == "Délai dépassé (0.05s)"
+    assert answer.elapsed < 0.5
+
+
+def test_stream_delivers_tokens_in_order(session):
+    text = "Le principe Bus combine Processus et Interface."
+    tokens = []
+    answer = session.stream(StubProvider(reply=text), "Bus ?", tokens.append).result()
+    assert tokens == split_tokens(text)
+    assert answer.text == text and answer.error is None
+
+
+def test_stream_cancellation_stops_generation(session):
+    provider = StubProvider(reply="mot " * 200, token_delay=0.01)
+    tokens = []
+    first = threading.Event()
+
+    def on_token(token):
+        tokens.append(token)
+        first.set()
+
+    future = session.stream(provider, "Question ?", on_token)
+    assert first.wait(2)
+    future.cancel()
+    time.sleep(0.1)
+    received = len(tokens)
+    time.sleep(0.1)
+    assert len(tokens) == received < 200
+
+
+def test_iter_tokens(session):
+    text = "Réponse en plusieurs mots"
+    assert list(session.iter_tokens(StubProvider(reply=text), "Question ?")) == \
+        split_tokens(text)
+
+
+def test_iter_tokens_reports_errors_last(session):
+    tokens = list(session.iter_tokens(StubProvider(reply=ValueError('invalide')), "Question ?"))
+    assert tokens == ["\n\n❌ Erreur: invalide"]
+
+
+class CountingProvider(StubProvider):
+    """Bouchon comptant les tokens effectivement produits"""
+
+    produced = 0
+
+    async def stream(self, question, system=None):
+        async for token in super().stream(question, system):
+            self.produced += 1
+            yield token
+
+
+def test_iter_tokens_close_cancels_generation(session):
+    provider = CountingProvider(reply="mot " * 200, token_delay=0.01)
+    tokens = session.iter_tokens(provider, "Question ?")
+    assert next(tokens) == "mot "
+    tokens.close()
+    time.sleep(0.1)
+    produced = provider.produced
+    time.sleep(0.1)
+    assert provider.produced == produced < 200
+    # La boucle de la session reste disponible après l'annulation
+    assert session.ask(StubProvider(reply='ok'), "Question ?").result().text == 'ok'
+
+
+def test_cached_answer_skips_the_provider():
+    session = AssistantSession(timeout=5, cache=ResponseCache(':memory:'))
+    try:
+        provider = StubProvider(reply='réponse')
+        first = session.ask(provider, "Question ?", model_hash='abc').result()
+        second = session.ask(provider, "Question ?", model_hash='abc').result()
+        tokens = list(session.iter_tokens(provider, "Question ?", model_hash='abc'))
+    finally:
+        session.close()
+
+    assert not first.cached and second.cached
+    assert second.text == 'réponse' and tokens == ['réponse']
+    assert provider.calls == 1
+
+
+def test_response_cache_expiry():
+    cache = ResponseCache(':memory:', ttl=0.05)
+    cache.put('ancienne', 'réponse')
+    assert cache.get('ancienne') == 'réponse'
+    time.sleep(0.1)
+    assert cache.get('ancienne') is None
+
+    # Les entrées expirées sont purgées au prochain enregistrement
+    cache.put('nouvelle', 'réponse')
+    assert len(cache) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_response_cache_evicts_least_recently_read():
+    cache = ResponseCache(':memory:', max_entries=2)
+    for key in ('a', 'b'):
+        cache.put(key, key)
+        time.sleep(0.01)
+    assert cache.get('a') == 'a'
+    time.sleep(0.01)
+
+    cache.put('c', 'c')
+    assert len(cache) == 2
+    assert cache.get('b') is None
+    assert (cache.get('a'), cache.get('c')) == ('a', 'c')
+
+
+PRINCIPLES = [
+    {'name': 'Interface', 'layer': 'CM1', 'position': [2, 1.5, 2],
+     'description': "Frontière d'échange " * 6},
+    {'name': 'Processus', 'layer': 'CM0', 'position': [1, 1, -0.5]},
+    {'name': 'Bus', 'layer': 'CM2', 'position': [1, 3, 3], 'description': 'Canal partagé'},
+    {'name': 'Réseau', 'layer': 'CM2', 'position': [2, 6, 6]},
+    {'name': 'Trait', 'layer': 'CM0', 'position': [4, 4, -0.5]},
+]
+
+
+def names(digest, rows):
+    return [digest.principles[row]['name'] for row in rows]
+
+
+def test_digest_ranking():
+    digest = ModelDigest(PRINCIPLES)
+    # Principe cité puis son voisin colinéaire
+    assert names(digest, digest.rank("Que relie Bus ?")[:2]) == ['Bus', 'Réseau']
+    # Couche citée, ordre du modèle à pertinence égale
+    assert names(digest, digest.rank("Et la couche CM0 ?")[:2]) == ['Processus', 'Trait']
+    # Recouvrement lexical avec la description
+    assert names(digest, digest.rank("Quel canal ?", neighbours=0)[:1]) == ['Bus']
+    assert digest.mentioned("la structure du bus") == []
+
+
+def test_budget_skips_long_lines():
+    digest = ModelDigest(PRINCIPLES)
+    rows = {p['name']: row for row, p in enumerate(PRINCIPLES)}
+    budget = (estimate_tokens(digest.header) + 1
+              + digest.costs[rows['Processus']] + digest.costs[rows['Bus']])
+    assert digest.costs[rows['Interface']] > digest.costs[rows['Bus']]
+
+    # Interface (trop longue) est sautée, Bus tient encore dans le budget
+    lines = digest.render("Bus ?", budget, neighbours=0).split('\n')
+    assert lines[0] == digest.header
+    assert [line.split(' [')[0] for line in lines[1:-1]] == ['- Bus', '- Processus']
+    assert lines[-1] == "… 3 principe(s) omis"
+
+    assert "omis" not in digest.render("Bus ?", budget=10000)
+
+
+def test_context_reuses_digests_per_revision():
+    builder = ContextBuilder()
+    digest = builder.digest(PRINCIPLES, revision=1)
+    assert builder.digest(list(PRINCIPLES), revision=1) is digest
+    assert builder.digest(PRINCIPLES, revision=2) is not digest
+    # Sans révision : empreinte des principes
+    assert builder.digest([dict(p) for p in PRINCIPLES]) is builder.digest(PRINCIPLES)
+
+    context = builder.build(PRINCIPLES, "Bus ?", revision=1)
+    assert builder.build(PRINCIPLES, "Bus ?", revision=1) == context
+    assert builder.contexts.stats()['hits'] == 1
+    assert builder.system_prompt(PRINCIPLES, "Bus ?", revision=1).endswith(context)
+    assert builder.system_prompt([], "Bus ?", system='base') == 'base'
@@ -0,0 +1,133 @@
+"""
+Tests de l'audit par lot : ordre des résultats, nouvelles tentatives,
+délai dépassé, limite de débit et rapport
+"""
+
+import asyncio
+import json
+import time
+
+import pytest
+
+from transystor.assistant.batch import BatchRunner, RateLimiter, is_retryable, load_questions
+from transystor.assistant.providers import StubProvider
+from transystor.assistant.session import AssistantSession
+
+QUESTIONS = [('Q1', "Première ?"), ('Q2', "Deuxième ?"), ('Q3', "Troisième ?")]
+
+
+class Overloaded(Exception):
+    status_code = 529
+
+
+class Flaky:
+    """Réponse qui échoue les premières fois (surcharge temporaire)"""
+
+    def __init__(self, failures, error=Overloaded):
+        self.failures = failures
+        self.error = error
+
+    def __call__(self, question, system):
+        if self.failures:
+            self.failures -= 1
+            raise self.error('surcharge')
+        return f"ok: {question}"
+
+
+@pytest.fixture
+def session():
+    session = AssistantSession(timeout=5)
+    yield session
+    session.close()
+
+
+def test_results_follow_questions_and_providers(session):
+    providers = [StubProvider(reply=lambda q, s: f"a:{q}", delay=0.05, model='a'),
+                 StubProvider(reply=lambda q, s: f"b:{q}", model='b')]
+    report = BatchRunner(session, concurrency=6).run(providers, QUESTIONS)
+
+    assert [(r['label'], r['model']) for r in report.results] == \
+        [(label, model) for label, _ in QUESTIONS for model in ('a', 'b')]
+    assert [r['text'] for r in report.results][:2] == ["a:Première ?", "b:Première ?"]
+    assert not report.failures
+
+
+def test_temporary_failures_are_retried(session):
+    provider = StubProvider(reply=Flaky(2))
+    report = BatchRunner(session, retries=2, backoff=0.01).run([provider], QUESTIONS[:1])
+    result = report.results[0]
+    assert result['text'] == "ok: Première ?" and result['error'] is None
+    assert result['attempts'] == 3
+
+
+def test_permanent_failures_are_not_retried(session):
+    provider = StubProvider(reply=Flaky(5, ValueError))
+    report = BatchRunner(session, retries=3, backoff=0.01).run([provider], QUESTIONS[:1])
+    assert report.results[0]['attempts'] == 1
+    assert report.results[0]['error'] == "Erreur: surcharge"
+
+
+def test_timeout_costs_a_single_attempt(session):
+    provider = StubProvider(reply='trop tard', delay=1.0)
+    start = time.perf_counter()
+    report = BatchRunner(session, retries=3, backoff=0.01, timeout=0.1).run(
+        [provider], QUESTIONS[:1])
+    elapsed = time.perf_counter() - start
+
+    assert report.results[0]['attempts'] == 1
+    assert report.results[0]['error'] == "Délai dépassé (0.1s)"
+    assert elapsed < 0.5
+
+
+def test_is_retryable():
+    assert is_retryable(ConnectionError())
+    assert is_retryable(Overloaded())
+    assert not is_retryable(asyncio.TimeoutError())
+    assert not is_retryable(ImportError())
+
+
+def test_rate_limit_spaces_requests(session):
+    provider = StubProvider(model='limité')
+    report = BatchRunner(session, concurrency=3, rate_limits={'stub': 20}).run(
+        [provider], QUESTIONS)
+    # Trois requêtes à 20/s : au moins deux intervalles de 50 ms
+    assert report.elapsed >= 0.09
+    assert provider.calls == 3
+
+
+def test_rate_limiter_outside_a_loop():
+    limiter = RateLimiter(100)
+
+    async def acquire_all():
+        start = time.monotonic()
+        for _ in range(3):
+            await limiter.acquire()
+        return time.monotonic() - start
+
+    # Créé hors de toute boucle, utilisable sur des boucles successives
+    assert asyncio.run(acquire_all()) >= 0.015
+    assert asyncio.run(acquire_all()) >= 0.015
+
+
+def test_report_formats(session, tmp_path):
+    providers = [StubProvider(reply='réponse'), StubProvider(reply=ValueError('x'), model='m')]
+    report = BatchRunner(session).run(providers, QUESTIONS[:1])
+
+    data = json.loads(report.save(tmp_path / 'audit.json').read_text(encoding='utf-8'))
+    assert (data['total'], data['failures']) == (2, 1)
+    markdown = report.save(tmp_path / 'audit.md').read_text(encoding='utf-8')
+    assert "| Q1 | stub |" in markdown and "❌ Erreur: x" in markdown
+
+
+def test_load_questions(tmp_path):
+    path = tmp_path / 'questions.yaml'
+    path.write_text("- Une question ?\n- label: Nommée\n  question: Deuxième ?\n",
+                    encoding='utf-8')
+    assert load_questions(path) == [('Question 1', "Une question ?"), ('Nommée', "Deuxième ?")]
+
+    path.write_text("Étiquette: Question ?\n", encoding='utf-8')
+    assert load_questions(path) == [('Étiquette', "Question ?")]
+
+    path.write_text("- label: Sans question\n", encoding='utf-8')
+    with pytest.raises(ValueError):
+        load_questions(path)
@@ -0,0 +1,88 @@
+"""
+Tests du format binaire .npz : aller-retour avec le JSON d'origine
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from transystor.core.binary import load_binary, save_binary
+from transystor.core.lazy import open_binary
+
+MODEL = {
+    'layer': 'CM2',
+    'version': '0.2.0',
+    'principles': [
+        {'name': 'Bus', 'layer': 'CM2', 'position': [1, 3, 3], 'color': '#10b981',
+         'description': 'Bus = Processus ⊗ Distribution'},
+        {'name': 'Réseau', 'position': [0.5, 2, 4.25], 'derives': ['Bus', 'Interface'],
+         'description': 'Guillemets "doubles"\net barre \\'},
+        {'name': 'Sans position', 'layer': 'CM3', 'meta': {'poids': 2, 'actif': True}},
+    ],
+    'meta_traits': [
+        {'name': 'Récursivité', 'description': 'Trait sans position'},
+    ],
+    'empty': [],
+}
+
+
+def test_round_trip_matches_json(tmp_path):
+    path = save_binary(MODEL, tmp_path / 'cm2.npz')
+    assert load_binary(path) == MODEL
+
+
+def test_round_trip_keeps_integer_positions(tmp_path):
+    model = load_binary(save_binary(MODEL, tmp_path / 'cm2.npz'))
+    assert json.dumps(model, sort_keys=True) == json.dumps(MODEL, sort_keys=True)
+    assert [type(c) for c in model['principles'][0]['position']] == [int, int, int]
+
+
+def test_save_is_atomic(tmp_path):
+    path = tmp_path / 'models' / 'cm2.npz'
+    save_binary(MODEL, path)
+    save_binary({**MODEL, 'version': '0.3.0'}, path)
+    assert load_binary(path)['version'] == '0.3.0'
+    assert [p.name for p in path.parent.iterdir()] == ['cm2.npz']
+
+
+@pytest.mark.parametrize('model', [{'layer': 'CM0'}, {'layer': 'CM1', 'principles': []}])
+def test_round_trip_without_records(tmp_path, model):
+    assert load_binary(save_binary(model, tmp_path / 'empty.npz')) == model
+
+
+@pytest.fixture
+def binary_path(tmp_path):
+    return save_binary(MODEL, tmp_path / 'cm2.npz')
+
+
+def test_open_binary_matches_load_binary(binary_path):
+    with open_binary(binary_path) as model:
+        assert model.to_dict() == load_binary(binary_path)
+        principles = model['principles']
+        assert principles[-1] == MODEL['principles'][-1]
+        assert principles.names_view('CM3').tolist() == ['Sans position']
+
+
+def test_close_releases_the_mapping(binary_path):
+    with open_binary(binary_path) as model:
+        assert any(isinstance(a, np.memmap) for a in model._arrays.values())
+    assert not model._arrays
+    binary_path.unlink()
+
+
+def test_detach_keeps_the_model_usable(binary_path):
+    model = open_binary(binary_path)
+    model.detach()
+    assert not any(isinstance(a, np.memmap) for a in model._arrays.values())
+    assert model.to_dict() == MODEL
+    binary_path.unlink()
+    assert model['principles'][0]['name'] == 'Bus'
+
+
+def test_save_binary_over_its_own_mapping(binary_path):
+    model = open_binary(binary_path)
+    assert model['principles'][1]['name'] == 'Réseau'
+    save_binary(model, binary_path)
+    assert load_binary(binary_path) == MODEL
+    assert model.to_dict() == MODEL
@@ -0,0 +1,74 @@
+"""
+Tests des caches LRU : succès/échecs, ordre d'éviction et invalidation
+des figures quand les principes changent
+"""
+
+from transystor.core.cache import LRUCache
+from transystor.visualization.cache import FigureCache
+
+PRINCIPLES = [
+    {'name': 'Processus', 'layer': 'CM0', 'position': [1, 1, -0.5]},
+    {'name': 'Bus', 'layer': 'CM2', 'position': [1, 3, 3]},
+]
+
+LAYERS = {'CM0': True, 'CM1': False, 'CM2': True, 'CM3': False}
+
+
+def test_hits_and_misses():
+    cache = LRUCache(maxsize=4)
+    assert cache.get('a', 'défaut') == 'défaut'
+    builds = []
+    for _ in range(3):
+        assert cache.get_or_build('a', lambda: builds.append('a') or 1) == 1
+    assert builds == ['a']
+    assert cache.stats() == {'size': 1, 'maxsize': 4, 'hits': 2, 'misses': 2}
+
+    cache.clear()
+    assert 'a' not in cache and cache.stats()['misses'] == 0
+
+
+def test_eviction_order():
+    cache = LRUCache(maxsize=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    # Lire 'a' en fait l'entrée la plus récente : 'b' est évincée
+    cache.get('a')
+    cache.put('c', 3)
+    assert list(cache._entries) == ['a', 'c']
+
+    cache.put('a', 4)
+    cache.put('d', 5)
+    assert list(cache._entries) == ['a', 'd'] and cache.get('a') == 4
+
+
+def key(principles, language='fr'):
+    return FigureCache.figure_key(principles, LAYERS, None, True, True, language)
+
+
+def test_figure_key_follows_the_principles():
+    assert key(PRINCIPLES) == key([dict(p) for p in PRINCIPLES])
+    moved = [PRINCIPLES[0], dict(PRINCIPLES[1], position=[2, 3, 3])]
+    assert key(moved) != key(PRINCIPLES)
+    assert key(PRINCIPLES[::-1]) != key(PRINCIPLES)
+    assert key(PRINCIPLES, language='en') != key(PRINCIPLES)
+
+
+def test_figures_rebuilt_when_principles_change():
+    cache = FigureCache(max_figures=2)
+    builds = []
+
+    def figure(principles):
+        # Géométrie statique partagée, principes propres à la figure
+        static = cache.part(('cube', 'CM2'), lambda: builds.append('cube') or ['cube'])
+        return cache.figure(key(principles),
+                            lambda: builds.append('figure') or static + [len(principles)])
+
+    first = figure(PRINCIPLES)
+    assert figure([dict(p) for p in PRINCIPLES]) is first
+    assert figure(PRINCIPLES[:1]) == ['cube', 1]
+    assert builds == ['cube', 'figure', 'figure']
+    assert cache.stats()['figures']['hits'] == 1
+
+    cache.clear()
+    figure(PRINCIPLES)
+    assert builds[-2:] == ['cube', 'figure']
@@ -0,0 +1,133 @@
+"""
+Tests de la commande transystor : codes de sortie et sorties des
+sous-commandes
+"""
+
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from transystor import transystor_core
+from transystor.cli.main import main
+
+REPO_MODELS = Path(transystor_core.__file__).resolve().parent.parent / 'models'
+
+STATE = {'principles': [
+    {'name': 'Processus', 'layer': 'CM0', 'position': [1, 1, -0.5], 'color': '#6b7280'},
+    {'name': 'Interface', 'layer': 'CM1', 'position': [2, 1.5, 2], 'color': '#3b82f6'},
+    {'name': 'Bus', 'layer': 'CM2', 'position': [1, 3, 3], 'color': '#10b981'},
+    {'name': 'Réseau', 'layer': 'CM2', 'position': [2, 6, 6], 'color': '#10b981'},
+]}
+
+
+@pytest.fixture(autouse=True)
+def paths(monkeypatch):
+    # --home et --model-dir configurent les chemins du processus
+    monkeypatch.setattr(transystor_core, '_configured_paths', {})
+
+
+@pytest.fixture
+def home(tmp_path):
+    shutil.copytree(REPO_MODELS, tmp_path / 'models')
+    return tmp_path
+
+
+@pytest.fixture
+def state(tmp_path):
+    path = tmp_path / 'state.json'
+    path.write_text(json.dumps(STATE), encoding='utf-8')
+    return str(path)
+
+
+def test_validate_repository_models(home, capsys):
+    assert main(['--home', str(home), 'validate', '-l', 'CM0']) == 0
+    assert "✅ CM0" in capsys.readouterr().out
+
+
+def test_validate_invalid_model(home, capsys):
+    model_path = home / 'models' / 'tscp' / 'cm0.json'
+    model = json.loads(model_path.read_text(encoding='utf-8'))
+    del model['layer']
+    model_path.write_text(json.dumps(model), encoding='utf-8')
+
+    assert main(['--home', str(home), 'validate', '-l', 'CM0']) == 1
+    assert "❌ CM0" in capsys.readouterr().out
+
+
+def test_validate_duplicate_names(home, capsys):
+    model_path = home / 'models' / 'tscp' / 'cm0.json'
+    model = json.loads(model_path.read_text(encoding='utf-8'))
+    model['meta_traits'].append(dict(model['meta_traits'][0]))
+    model_path.write_text(json.dumps(model), encoding='utf-8')
+
+    assert main(['--home', str(home), 'validate', '-l', 'CM0']) == 1
+    assert "déjà défini" in capsys.readouterr().out
+
+
+def test_stats_json(state, capsys):
+    assert main(['stats', '-i', state, '--json', '--violations']) == 0
+    stats = json.loads(capsys.readouterr().out)
+    assert stats['principles'] == 4 and stats['positioned'] == 4
+    assert stats['layers'] == {'CM0': 1, 'CM1': 1, 'CM2': 2}
+    # Bus et Réseau sont colinéaires : paire la plus proche
+    first = stats['violations'][0]
+    assert (first['source'], first['target']) == ('Bus', 'Réseau')
+    assert first['orthogonality'] == pytest.approx(0, abs=1e-6)
+
+
+def test_stats_layer_filter(state, capsys):
+    assert main(['stats', '-i', state, '-l', 'cm2', '--json']) == 0
+    assert json.loads(capsys.readouterr().out)['principles'] == 2
+
+
+def test_export(state, tmp_path):
+    assert main(['export', '-i', state, '-f', 'owl', '-f', 'nt', '-o', str(tmp_path / 'out')]) == 0
+    (bundle,) = (tmp_path / 'out').iterdir()
+    assert sorted(p.name for p in bundle.iterdir()) == ['tscp_nt.nt', 'tscp_owl.ttl']
+
+
+def test_render(state, tmp_path, capsys):
+    pytest.importorskip('plotly')
+    output = tmp_path / 'vue' / 'cubes.html'
+    assert main(['render', '-i', state, '-o', str(output), '--cdn']) == 0
+    assert output.exists()
+    assert "(4 principes)" in capsys.readouterr().out
+
+
+def test_missing_input_fails(tmp_path, capsys):
+    assert main(['stats', '-i', str(tmp_path / 'absent.json')]) == 1
+    assert capsys.readouterr().err.startswith("❌")
+
+
+def test_unknown_layer_is_a_usage_error():
+    with pytest.raises(SystemExit) as error:
+        main(['stats', '-l', 'CM9'])
+    assert error.value.code == 2
+
+
+def test_audit_with_stub(tmp_path):
+    output = tmp_path / 'audit.json'
+    assert main(['audit', '--no-context', '--no-cache', '-o', str(output)]) == 0
+    report = json.loads(output.read_text(encoding='utf-8'))
+    assert report['total'] > 0 and report['failures'] == 0
+
+
+def test_audit_without_questions(capsys):
+    assert main(['audit', '--no-predefined', '--no-cache']) == 2
+    assert "Aucune question" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize('option, message', [
+    (['-j', '0'], "Entier >= 1 attendu: 0"),
+    (['--concurrency', 'deux'], "Entier attendu: deux"),
+    (['--retries', '-1'], "Entier >= 0 attendu: -1"),
+    (['--rate', 'stub=0'], "Débit strictement positif attendu: stub=0"),
+    (['--rate', 'stub'], "Format attendu fournisseur=requêtes/s: stub"),
+])
+def test_audit_rejects_invalid_limits(option, message, capsys):
+    with pytest.raises(SystemExit) as error:
+        main(['audit', '--no-cache'] + option)
+    assert error.value.code == 2
+    assert message in capsys.readouterr().err
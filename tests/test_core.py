@@ -0,0 +1,68 @@
+"""
+Tests du chargement des modèles : toutes les couches en parallèle, avec
+des threads ou des processus
+"""
+
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from transystor import transystor_core
+from transystor.transystor_core import configure_paths, load_all_models
+
+REPO_MODELS = Path(transystor_core.__file__).resolve().parent.parent / 'models'
+
+CM2 = {'layer': 'CM2', 'version': '0.2.0', 'principles': [
+    {'name': 'Bus', 'layer': 'CM2', 'position': [1, 3, 3], 'color': '#10b981'},
+    {'name': 'Réseau', 'layer': 'CM2', 'position': [2, 6, 6], 'derives': ['Bus']},
+]}
+
+
+@pytest.fixture
+def home(tmp_path, monkeypatch):
+    monkeypatch.setattr(transystor_core, '_configured_paths', {})
+    shutil.copytree(REPO_MODELS, tmp_path / 'models')
+    write_model(tmp_path, CM2)
+    configure_paths(tmp_path)
+    return tmp_path
+
+
+def write_model(home, model):
+    path = home / 'models' / 'tscp' / f"{model['layer'].lower()}.json"
+    path.write_text(json.dumps(model), encoding='utf-8')
+
+
+@pytest.mark.parametrize('executor', ['thread', 'process'])
+def test_load_all_models(home, executor):
+    result = load_all_models(executor=executor)
+    assert list(result['layers']) == ['CM0', 'CM1', 'CM2', 'CM3']
+    assert result['layers']['CM2'] == CM2
+    # Couche absente : modèle vide
+    assert result['layers']['CM1'] == {'layer': 'CM1', 'version': '0.2.0'}
+
+    index = result['index']
+    assert index.get('Réseau')['derives'] == ['Bus']
+    # Les éléments de CM0 (sans couche) sont indexés sous CM0
+    polarity = index.get('Polarité')
+    assert polarity is not None and polarity['layer'] == 'CM0'
+
+
+@pytest.mark.parametrize('executor', ['thread', 'process'])
+def test_invalid_model_is_reported(home, executor):
+    write_model(home, dict(CM2, version='deux'))
+    with pytest.raises(ValueError, match="CM2 invalide"):
+        load_all_models(executor=executor)
+
+
+def test_name_defined_in_two_layers(home):
+    write_model(home, {'layer': 'CM3', 'version': '0.2.0', 'principles': [
+        {'name': 'Bus', 'layer': 'CM3'}]})
+    with pytest.raises(ValueError, match="Nom défini dans CM2 et CM3: Bus"):
+        load_all_models(layers=('CM2', 'CM3'))
+
+
+def test_unknown_executor(home):
+    with pytest.raises(ValueError, match="Exécuteur inconnu"):
+        load_all_models(executor='gpu')
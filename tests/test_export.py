@@ -0,0 +1,140 @@
+"""
+Tests des exports sémantiques : relecture par rdflib de chaque format
+"""
+
+import gzip
+
+import pytest
+
+rdflib = pytest.importorskip('rdflib')
+from rdflib.compare import isomorphic
+
+from transystor.transystor_export import (
+    export_all, export_incremental, export_to_owl, export_to_rdfs, export_to_shacl,
+    iter_nquads, iter_ntriples, save_triples
+)
+
+TSCP = rdflib.Namespace('http://transystor.org/ontology/tscp#')
+
+PRINCIPLES = [
+    {'name': 'Processus', 'layer': 'CM0', 'position': [1, 1, -0.5],
+     'description': 'Meta-metaclasse : Transformation dans le temps'},
+    {'name': 'Interface', 'layer': 'CM1', 'position': [2, 1.5, 2],
+     'description': 'Médiation "entre" systèmes\nsur deux lignes \\ avec barre'},
+    {'name': 'Bus', 'layer': 'CM2', 'position': [1, 3, 3],
+     'description': 'Bus = Processus ⊗ Distribution', 'combination': 'Processus ⊗ Interface'},
+    {'name': 'Non positionné', 'layer': 'CM3', 'description': 'Instance sans position'},
+]
+
+
+@pytest.fixture
+def exports(tmp_path, monkeypatch):
+    from transystor import transystor_core
+    # Chemins configurés rétablis après le test
+    monkeypatch.setattr(transystor_core, '_configured_paths', {})
+    transystor_core.configure_paths(export_dir=tmp_path)
+    return tmp_path
+
+
+def parse(content, format='turtle'):
+    graph = rdflib.Graph() if format != 'nquads' else rdflib.Dataset()
+    graph.parse(data=content, format=format)
+    return graph
+
+
+@pytest.mark.parametrize('export', [export_to_owl, export_to_shacl, export_to_rdfs])
+def test_turtle_formats_parse(export):
+    graph = parse(export(PRINCIPLES))
+    assert len(graph) > 0
+
+
+def test_literals_are_escaped():
+    description = PRINCIPLES[1]['description']
+    for export in (export_to_owl, export_to_shacl):
+        graph = parse(export(PRINCIPLES))
+        descriptions = {str(d) for d in graph.objects(None, TSCP.hasDescription)}
+        assert description in descriptions
+
+    graph = parse(export_to_rdfs(PRINCIPLES))
+    labels = {str(label) for label in graph.objects(None, rdflib.RDFS.label)}
+    assert 'Non positionné' in labels
+
+
+def test_ntriples_match_owl():
+    owl = parse(export_to_owl(PRINCIPLES))
+    nt = parse(''.join(iter_ntriples(PRINCIPLES)), 'nt')
+    assert isomorphic(owl, nt)
+
+    nq = parse(''.join(iter_nquads(PRINCIPLES)), 'nquads')
+    assert len(nq) == len(nt)
+
+
+def test_save_triples_gzip(exports):
+    path = save_triples(PRINCIPLES, 'nt', compression='gzip')
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        graph = parse(f.read(), 'nt')
+    assert len(graph) == len(parse(export_to_owl(PRINCIPLES, 'tscp')))
+
+
+def test_export_all_bundle(exports):
+    bundle = export_all(PRINCIPLES, formats=('owl', 'shacl', 'rdfs', 'nt'))
+    assert set(bundle['files']) == {'owl', 'shacl', 'rdfs', 'nt'}
+    for format_name, path in bundle['files'].items():
+        parse(path.read_text(encoding='utf-8'), 'nt' if format_name == 'nt' else 'turtle')
+
+
+def edited(principles):
+    """Copie modifiée : un déplacement, un retrait et un ajout"""
+    principles = [dict(p) for p in principles if p['name'] != 'Bus']
+    principles[0]['position'] = [2, 2, -0.5]
+    principles.append({'name': 'Réseau', 'layer': 'CM1', 'position': [2.5, 2, 2.5],
+                       'description': 'Structure organisationnelle'})
+    return principles
+
+
+def test_incremental_patch_matches_full_export(exports):
+    first = export_incremental(PRINCIPLES)
+    assert isomorphic(parse(first['path'].read_text(encoding='utf-8')),
+                      parse(export_to_owl(PRINCIPLES, 'tscp')))
+
+    second = export_incremental(edited(PRINCIPLES))
+    assert second['path'] != first['path']
+    assert (second['added'], second['removed']) == ([':Réseau'], [':Bus'])
+    assert isomorphic(parse(second['path'].read_text(encoding='utf-8')),
+                      parse(export_to_owl(edited(PRINCIPLES), 'tscp')))
+
+
+def test_incremental_diff_applies_to_previous_export(exports):
+    graph = parse(export_incremental(PRINCIPLES)['path'].read_text(encoding='utf-8'))
+
+    diff = export_incremental(edited(PRINCIPLES), mode='diff')
+    for line in diff['path'].read_text(encoding='utf-8').splitlines():
+        op, _, triple = line.partition(' ')
+        if op in ('A', 'D'):
+            (statement,) = parse(triple, 'nt')
+            (graph.add if op == 'A' else graph.remove)(statement)
+
+    assert isomorphic(graph, parse(export_to_owl(edited(PRINCIPLES), 'tscp')))
+
+
+def test_incremental_exports_do_not_overwrite(exports):
+    paths = {export_incremental(PRINCIPLES)['path'] for _ in range(3)}
+    paths |= {export_incremental(edited(PRINCIPLES), mode='diff')['path'] for _ in range(3)}
+    assert len(paths) == 6
+
+
+def test_duplicate_names_are_exported():
+    duplicated = PRINCIPLES + [dict(PRINCIPLES[2], position=[3, 1, 3])]
+    graph = parse(export_to_owl(duplicated))
+    labels = [str(label) for label in graph.objects(None, rdflib.RDFS.label)]
+    assert 'Bus' in labels
+    parse(export_to_shacl(duplicated))
+    parse(export_to_rdfs(duplicated))
+
+
+@pytest.mark.parametrize('name', ['Bus', "B'us"])
+def test_incremental_rejects_subject_collisions(exports, name):
+    colliding = PRINCIPLES + [{'name': name, 'layer': 'CM2', 'position': [3, 1, 3]}]
+    with pytest.raises(ValueError, match="Sujet :Bus partagé"):
+        export_incremental(colliding)
+    assert not any(exports.iterdir())
@@ -0,0 +1,116 @@
+"""
+Tests du serveur de flux factice : format des flux de chaque API, puis
+vrais SDK (anthropic, openai, ollama) pointés sur le serveur, ignorés si
+le SDK n'est pas installé
+"""
+
+import asyncio
+import json
+import time
+import urllib.request
+
+import pytest
+
+from transystor.assistant.fake_server import FakeStreamingServer
+from transystor.assistant.providers import create_provider, split_tokens
+from transystor.assistant.session import AssistantSession
+
+REPLY = "Le principe Bus combine Processus et Interface."
+
+# Options de chaque fournisseur pointé sur le serveur
+OPTIONS = {
+    'anthropic': lambda url: {'api_key': 'test', 'base_url': url},
+    'openai': lambda url: {'api_key': 'test', 'base_url': url + '/v1'},
+    'ollama': lambda url: {'host': url},
+}
+
+
+@pytest.fixture
+def server():
+    with FakeStreamingServer(reply=REPLY, token_delay=0) as server:
+        yield server
+
+
+def post(url, payload):
+    request = urllib.request.Request(url, json.dumps(payload).encode('utf-8'),
+                                     {'Content-Type': 'application/json'})
+    with urllib.request.urlopen(request, timeout=5) as response:
+        return response.read().decode('utf-8')
+
+
+def events(body):
+    return [json.loads(line[len('data: '):]) for line in body.splitlines()
+            if line.startswith('data: ') and line != 'data: [DONE]']
+
+
+def test_openai_stream_format(server):
+    body = post(server.url + '/v1/chat/completions',
+                {'model': 'm', 'stream': True, 'messages': [{'role': 'user', 'content': 'Bus ?'}]})
+    chunks = events(body)
+    assert [c['choices'][0]['delta'].get('content') for c in chunks[:-1]] == split_tokens(REPLY)
+    assert chunks[-1]['choices'][0]['finish_reason'] == 'stop'
+    assert body.rstrip().endswith('data: [DONE]')
+    assert server.requests == ['Bus ?']
+
+
+def test_anthropic_stream_format(server):
+    body = post(server.url + '/v1/messages',
+                {'model': 'm', 'stream': True, 'messages': [{'role': 'user', 'content': 'Bus ?'}]})
+    chunks = events(body)
+    assert chunks[0]['type'] == 'message_start' and chunks[-1]['type'] == 'message_stop'
+    assert [c['delta']['text'] for c in chunks if c['type'] == 'content_block_delta'] == \
+        split_tokens(REPLY)
+
+
+def test_ollama_stream_format(server):
+    body = post(server.url + '/api/chat',
+                {'model': 'm', 'messages': [{'role': 'user', 'content': 'Bus ?'}]})
+    parts = [json.loads(line) for line in body.splitlines()]
+    assert [p['message']['content'] for p in parts[:-1]] == split_tokens(REPLY)
+    assert parts[-1]['done'] and not any(p['done'] for p in parts[:-1])
+
+
+def test_complete_without_stream(server):
+    body = post(server.url + '/api/chat', {'stream': False, 'messages': [
+        {'role': 'user', 'content': 'Bus ?'}]})
+    assert json.loads(body)['message']['content'] == REPLY
+
+
+@pytest.mark.parametrize('sdk', sorted(OPTIONS))
+def test_sdk_stream_and_aclose(server, sdk):
+    pytest.importorskip(sdk)
+    provider = create_provider(sdk, **OPTIONS[sdk](server.url))
+
+    async def run():
+        tokens = [token async for token in provider.stream("Bus ?")]
+        client = provider._client
+        await provider.aclose()
+        return tokens, client
+
+    tokens, client = asyncio.run(run())
+    assert tokens == split_tokens(REPLY)
+    assert server.requests == ["Bus ?"]
+    # aclose libère le client ; le suivant est recréé à la demande
+    assert client is not None and provider._client is None
+
+
+@pytest.mark.parametrize('sdk', sorted(OPTIONS))
+def test_sdk_cancellation_closes_the_stream(sdk):
+    pytest.importorskip(sdk)
+    with FakeStreamingServer(reply="mot " * 500, token_delay=0.01) as server:
+        session = AssistantSession(timeout=5)
+        try:
+            provider = session.provider(sdk, **OPTIONS[sdk](server.url))
+            tokens = session.iter_tokens(provider, "Question ?")
+            assert next(tokens) == "mot "
+            tokens.close()
+
+            # Le serveur constate la déconnexion du client
+            deadline = time.monotonic() + 2
+            while not server.cancelled and time.monotonic() < deadline:
+                time.sleep(0.02)
+            assert server.cancelled == 1
+        finally:
+            session.close()
+        # La session ferme les clients de ses fournisseurs
+        assert provider._client is None
@@ -0,0 +1,58 @@
+"""
+Tests de la géométrie statique : nombre de segments des réseaux de chaque
+couche et séparateurs NaN des tampons de lignes
+"""
+
+import numpy as np
+import pytest
+
+from transystor.transystor_core import CUBE_CONFIGS
+from transystor.visualization.geometry import layer_geometry, segments_to_lines
+
+
+def split_segments(lines):
+    """Vérifie le motif (origine, extrémité, NaN) et retourne les segments"""
+    assert lines.shape[0] % 3 == 0
+    triples = lines.reshape(-1, 3, 3)
+    assert np.isnan(triples[:, 2]).all()
+    assert not np.isnan(triples[:, :2]).any()
+    return triples[:, 0], triples[:, 1]
+
+
+def test_segments_to_lines():
+    lines = segments_to_lines([[0, 0, 0], [1, 1, 1]], [[1, 0, 0], [2, 2, 2]])
+    assert lines.shape == (6, 3)
+    starts, ends = split_segments(lines)
+    assert starts.tolist() == [[0, 0, 0], [1, 1, 1]]
+    assert ends.tolist() == [[1, 0, 0], [2, 2, 2]]
+
+
+@pytest.mark.parametrize('layer', ['CM1', 'CM2', 'CM3'])
+def test_cube_lattice(layer):
+    config = CUBE_CONFIGS[layer]
+    size, center = config['size'], np.array(config['center'], dtype=float)
+    geometry = layer_geometry(config)
+
+    starts, ends = split_segments(geometry.lattice_lines)
+    # (size + 1)² lignes parallèles à chacun des trois axes
+    assert len(starts) == 3 * (size + 1) ** 2
+    lengths = np.abs(ends - starts)
+    assert ((lengths == size).sum(axis=1) == 1).all()
+    assert ((lengths == 0).sum(axis=1) == 2).all()
+    assert (np.abs(np.concatenate([starts, ends]) - center) <= size / 2).all()
+
+    assert len(split_segments(geometry.edge_lines)[0]) == 12
+    assert not geometry.lattice_lines.flags.writeable
+
+
+def test_plane_grid():
+    config = CUBE_CONFIGS['CM0']
+    nx, ny = config['size']
+    starts, ends = split_segments(layer_geometry(config).lines)
+    assert len(starts) == (nx + 1) + (ny + 1)
+    assert (starts[:, 2] == config['z']).all() and (ends[:, 2] == config['z']).all()
+
+
+def test_geometry_is_computed_once():
+    config = CUBE_CONFIGS['CM2']
+    assert layer_geometry(dict(config)) is layer_geometry(config)
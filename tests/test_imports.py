@@ -0,0 +1,70 @@
+"""
+Tests des imports : modules chargés en import absolu (transystor/ dans
+sys.path, comme dans les notebooks) et dépendances chargées à la demande
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PACKAGE_DIR = Path(__file__).resolve().parent.parent / 'transystor'
+
+
+def run_python(code, cwd):
+    """Exécute du code dans un nouvel interpréteur et retourne sa sortie"""
+    result = subprocess.run([sys.executable, '-c', code], cwd=cwd,
+                            capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    return result.stdout
+
+
+def run_flat(code):
+    """Exécute du code avec transystor/ comme seul répertoire du projet dans sys.path"""
+    return run_python(code, PACKAGE_DIR)
+
+
+PRINCIPLES = ("[{'name': 'A', 'layer': 'CM1', 'position': [1, 0, 0]},"
+              " {'name': 'B', 'layer': 'CM2', 'position': [1, 1, 0]}]")
+
+
+def test_flat_export():
+    output = run_flat(
+        "from transystor_export import export_to_owl\n"
+        f"print('orthogonalityScore' in export_to_owl({PRINCIPLES}))\n"
+    )
+    assert output.strip() == 'True'
+
+
+def test_flat_orthogonality():
+    output = run_flat(
+        "from transystor_viz import compute_orthogonality\n"
+        f"print(round(compute_orthogonality({PRINCIPLES})[0], 3))\n"
+    )
+    assert output.strip() == '0.293'
+
+
+def test_flat_response_cache(tmp_path):
+    output = run_flat(
+        "import transystor_core\n"
+        f"transystor_core.configure_paths(cache_dir={str(tmp_path)!r})\n"
+        "from assistant.cache import ResponseCache\n"
+        "print(ResponseCache().path)\n"
+    )
+    assert output.strip() == str(tmp_path / 'assistant_responses.sqlite')
+
+
+# Modules chargés seulement à la première validation, vue ou question
+LAZY_MODULES = ('jsonschema', 'plotly', 'transystor.assistant', 'assistant')
+
+
+@pytest.mark.parametrize('module, cwd', [('transystor.transystor_core', PACKAGE_DIR.parent),
+                                         ('transystor_core', PACKAGE_DIR)])
+def test_core_import_is_lazy(module, cwd):
+    output = run_python(
+        f"import sys\nimport {module}\n"
+        f"print(sorted(m for m in sys.modules if m.startswith({LAZY_MODULES!r})))\n",
+        cwd
+    )
+    assert output.strip() == '[]'
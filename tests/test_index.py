@@ -0,0 +1,82 @@
+"""
+Tests de l'index des principes : recherches par nom, couche, cellule et
+type, résolution des derives et noms en double
+"""
+
+import logging
+
+import pytest
+
+from transystor.core.index import PrincipleIndex, cell_of
+
+PRINCIPLES = [
+    {'name': 'Processus', 'layer': 'CM0', 'type': 'MetaMetaClass', 'position': [1, 1, -0.5]},
+    {'name': 'Interface', 'layer': 'CM1', 'type': 'MetaClass', 'position': [2, 1.5, 2]},
+    {'name': 'Bus', 'layer': 'CM2', 'type': 'Class', 'position': [1, 3, 3]},
+    {'name': 'Réseau', 'layer': 'CM2', 'type': 'Class', 'position': [1.2, 2.8, 3.4]},
+    {'name': 'Trait', 'layer': 'CM1', 'type': 'Trait'},
+]
+
+
+@pytest.fixture
+def index():
+    return PrincipleIndex(PRINCIPLES)
+
+
+def test_cell_of():
+    assert cell_of([1.5, 2.49, -0.5]) == (2, 2, 0)
+    assert cell_of((1, 2, 3, 4)) == (1, 2, 3)
+
+
+def test_lookups(index):
+    assert len(index) == 5 and 'Bus' in index
+    assert index.get('Bus') is PRINCIPLES[2]
+    assert index.get('Absent') is None
+    assert [p['name'] for p in index.by_layer('CM2')] == ['Bus', 'Réseau']
+    assert index.layer_counts() == {'CM0': 1, 'CM1': 2, 'CM2': 2}
+    assert [p['name'] for p in index.at_cell([1, 3, 3])] == ['Bus', 'Réseau']
+    assert [p['name'] for p in index.by_type('Trait')] == ['Trait']
+
+
+def test_mutations_update_buckets(index):
+    index.update('Réseau', dict(PRINCIPLES[3], layer='CM3', position=[4, 4, 4]))
+    assert [p['name'] for p in index.at_cell((1, 3, 3))] == ['Bus']
+    assert [p['name'] for p in index.by_layer('CM3')] == ['Réseau']
+
+    index.remove('Trait')
+    assert index.by_type('Trait') == [] and 'Trait' not in index
+
+
+def test_sync_reindexes_changes_only(index):
+    principles = [dict(p) for p in PRINCIPLES[:4]]
+    principles[2]['position'] = [3, 3, 3]
+    index.sync(principles)
+    assert len(index) == 4
+    assert [p['name'] for p in index.at_cell((3, 3, 3))] == ['Bus']
+    assert index.get('Processus') is principles[0]
+
+
+@pytest.mark.parametrize('reference, expected', [
+    ('Interface', 'Interface'),
+    ('Interface ⊂ CM1', 'Interface'),
+    ('Bus (CM2)', 'Bus'),
+    ('Inconnu ⊂ CM1', None),
+])
+def test_resolve(index, reference, expected):
+    resolved = index.resolve(reference)
+    assert (resolved['name'] if resolved else None) == expected
+
+
+def test_duplicate_names_keep_the_first(caplog):
+    duplicate = {'name': 'Bus', 'layer': 'CM3', 'position': [4, 4, 4]}
+    with caplog.at_level(logging.WARNING):
+        index = PrincipleIndex(PRINCIPLES + [duplicate])
+    assert index.get('Bus') is PRINCIPLES[2]
+    assert index.duplicates == [duplicate]
+    assert index.by_layer('CM3') == []
+    assert "Bus" in caplog.text
+
+
+def test_duplicate_names_in_strict_mode():
+    with pytest.raises(KeyError):
+        PrincipleIndex(PRINCIPLES + [dict(PRINCIPLES[0])], strict=True)
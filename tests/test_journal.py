@@ -0,0 +1,104 @@
+"""
+Tests du journal des modifications : rejeu, compactage, annulation et
+réparation d'une entrée tronquée
+"""
+
+import pytest
+
+from transystor.core.journal import ModelJournal
+
+PRINCIPLES = [
+    {'name': 'Processus', 'layer': 'CM0', 'position': [1, 1, -0.5]},
+    {'name': 'Interface', 'layer': 'CM1', 'position': [2, 1.5, 2]},
+    {'name': 'Bus', 'layer': 'CM2', 'position': [1, 3, 3], 'description': 'Bus'},
+]
+
+
+def edit_all(journal):
+    for principle in PRINCIPLES:
+        journal.add(principle)
+    journal.move('Processus', [2, 2, -0.5])
+    journal.edit('Bus', {'name': 'Réseau', 'layer': 'CM2', 'position': [1, 3, 3]})
+    journal.delete('Interface')
+    journal.update_settings({'language': 'en'})
+
+
+EXPECTED = [
+    {'name': 'Processus', 'layer': 'CM0', 'position': [2, 2, -0.5]},
+    {'name': 'Réseau', 'layer': 'CM2', 'position': [1, 3, 3]},
+]
+
+
+def test_operations(tmp_path):
+    journal = ModelJournal(tmp_path, compact_every=None)
+    edit_all(journal)
+    assert journal.principles == EXPECTED
+    assert journal.settings == {'language': 'en'}
+    assert 'Réseau' in journal and 'Bus' not in journal
+    with pytest.raises(KeyError):
+        journal.add({'name': 'Processus', 'layer': 'CM0'})
+
+
+def test_replay(tmp_path):
+    edit_all(ModelJournal(tmp_path, compact_every=None))
+    journal = ModelJournal(tmp_path, compact_every=None)
+    assert journal.principles == EXPECTED
+    assert journal.settings == {'language': 'en'}
+
+
+@pytest.mark.parametrize('compact_every', [1, 3, 100])
+def test_replay_after_compaction(tmp_path, compact_every):
+    journal = ModelJournal(tmp_path, compact_every=compact_every, history_size=2)
+    edit_all(journal)
+    journal.compact()
+    journal.add({'name': 'Trait', 'layer': 'CM1'})
+
+    replayed = ModelJournal(tmp_path, compact_every=compact_every, history_size=2)
+    assert replayed.principles == EXPECTED + [{'name': 'Trait', 'layer': 'CM1'}]
+    assert replayed.settings == {'language': 'en'}
+    assert len(replayed.history()) <= 3
+
+
+def test_undo(tmp_path):
+    journal = ModelJournal(tmp_path, compact_every=None)
+    edit_all(journal)
+    for _ in range(4):
+        journal.undo()
+    assert journal.principles == [
+        {'name': 'Processus', 'layer': 'CM0', 'position': [1, 1, -0.5]},
+        PRINCIPLES[1],
+        PRINCIPLES[2],
+    ]
+    assert journal.settings == {'language': None}
+
+    # Les annulations sont journalisées et survivent au rejeu
+    assert ModelJournal(tmp_path, compact_every=None).principles == journal.principles
+    for _ in range(3):
+        journal.undo()
+    assert journal.principles == []
+    assert journal.undo() is None
+
+
+def test_sync(tmp_path):
+    journal = ModelJournal(tmp_path, compact_every=None)
+    assert journal.sync(PRINCIPLES, {'language': 'fr'}) == 4
+
+    principles = [dict(p) for p in PRINCIPLES[1:]]
+    principles[0]['position'] = [3, 3, 3]
+    assert journal.sync(principles, {'language': 'fr'}) == 2
+    assert [e['op'] for e in journal.history()[-2:]] == ['delete', 'move']
+    assert ModelJournal(tmp_path).principles == principles
+
+
+def test_truncated_entry_is_repaired(tmp_path):
+    journal = ModelJournal(tmp_path, compact_every=None)
+    edit_all(journal)
+    with open(journal.journal_path, 'ab') as f:
+        f.write(b'{"op": "add", "principle": {"na')
+
+    replayed = ModelJournal(tmp_path, compact_every=None)
+    assert replayed.principles == EXPECTED
+    assert journal.journal_path.read_bytes().endswith(b'\n')
+
+    replayed.add({'name': 'Trait', 'layer': 'CM1'})
+    assert ModelJournal(tmp_path).principles == EXPECTED + [{'name': 'Trait', 'layer': 'CM1'}]
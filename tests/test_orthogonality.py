@@ -0,0 +1,90 @@
+"""
+Tests du moteur d'orthogonalité, de l'index de colinéarité et du suivi
+incrémental (comparés à la boucle de référence)
+"""
+
+import numpy as np
+import pytest
+
+from transystor.math.collinearity import CollinearityIndex, orthogonality_violations
+from transystor.math.orthogonality import (
+    OrthogonalityTracker, compute_orthogonality, named_vectors, principle_vectors
+)
+
+
+def reference_orthogonality(principles):
+    """Boucle d'origine de transystor_viz.compute_orthogonality"""
+    vectors = np.array([p['position'] for p in principles if 'position' in p])
+    if len(vectors) < 2:
+        return 1.0, np.array([[]])
+
+    n = len(vectors)
+    matrix = np.zeros((n, n))
+    for i in range(n):
+        for j in range(n):
+            if i != j:
+                v1 = vectors[i] / (np.linalg.norm(vectors[i]) + 1e-6)
+                v2 = vectors[j] / (np.linalg.norm(vectors[j]) + 1e-6)
+                matrix[i, j] = abs(np.dot(v1, v2))
+    score = 1 - np.mean(matrix[matrix > 0]) if matrix.any() else 1.0
+    return score, matrix
+
+
+def random_principles(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return [{'name': f'P{i}', 'layer': 'CM2', 'position': rng.uniform(-3, 3, 3).tolist()}
+            for i in range(n)]
+
+
+@pytest.mark.parametrize('principles', [
+    [],
+    [{'name': 'a', 'layer': 'CM1'}],
+    [{'name': 'a', 'layer': 'CM1', 'position': [1, 2, 3]}],
+])
+def test_empty_and_unpositioned_inputs(principles):
+    score, _ = compute_orthogonality(principles)
+    assert score == 1.0
+    assert principle_vectors(principles).shape[1] == 3
+    assert OrthogonalityTracker(principles).score == 1.0
+    assert orthogonality_violations(principles) == []
+
+
+def test_named_vectors_empty():
+    names, vectors = named_vectors([{'name': 'a'}])
+    assert names == [] and vectors.shape == (0, 3)
+
+
+def test_engine_matches_reference_loop():
+    principles = random_principles(60) + [{'name': 'zero', 'position': [0, 0, 0]}]
+    score, matrix = compute_orthogonality(principles, chunk_size=7)
+    expected_score, expected_matrix = reference_orthogonality(principles)
+    assert score == pytest.approx(expected_score)
+    np.testing.assert_allclose(matrix, expected_matrix, atol=1e-12)
+
+
+def test_tracker_follows_mutations():
+    principles = random_principles(30)
+    tracker = OrthogonalityTracker(principles[:20])
+    for p in principles[20:]:
+        tracker.add(p['name'], p['position'])
+    tracker.move('P3', [1, 0, 0])
+    tracker.remove('P7')
+
+    current = [dict(p) for p in principles if p['name'] != 'P7']
+    current[3]['position'] = [1, 0, 0]
+    assert tracker.score == pytest.approx(reference_orthogonality(current)[0])
+
+
+def test_collinearity_index_matches_matrix():
+    principles = random_principles(80, seed=1)
+    index = CollinearityIndex(principles)
+    _, matrix = reference_orthogonality(principles)
+
+    neighbours = index.most_collinear('P0', k=5)
+    expected = np.sort(matrix[0])[::-1][:5]
+    np.testing.assert_allclose([c for _, c in neighbours], expected, atol=1e-6)
+
+    violations = index.violations(0.6)
+    expected_pairs = {(i, j) for i in range(80) for j in range(i + 1, 80)
+                      if 1 - matrix[i, j] < 0.6}
+    assert {(int(v['source'][1:]), int(v['target'][1:])) for v in violations} == expected_pairs
@@ -0,0 +1,109 @@
+"""
+Tests du stockage colonnaire : équivalence avec la liste de principes
+d'origine (ordre, positions entières, champs) et chemins qui l'utilisent
+"""
+
+import numpy as np
+import pytest
+
+from transystor.core.store import PrincipleStore
+from transystor.math.collinearity import orthogonality_violations
+from transystor.math.orthogonality import compute_orthogonality, named_vectors, principle_vectors
+
+PRINCIPLES = [
+    {'name': 'Bus', 'layer': 'CM2', 'position': [1, 3, 3], 'color': '#10b981',
+     'combination': 'Processus ⊗ Interface'},
+    {'name': 'Processus', 'layer': 'CM0', 'position': [1, 1, -0.5]},
+    {'name': 'Interface', 'layer': 'CM1', 'position': [2, 1.5, 2], 'color': '#3b82f6'},
+    {'name': 'Réseau', 'layer': 'CM2', 'position': [3, 1, 3], 'color': '#10b981'},
+    {'name': 'Sans position', 'layer': 'CM3', 'description': 'Instance'},
+]
+
+
+def test_iteration_matches_the_list():
+    store = PrincipleStore(PRINCIPLES)
+    assert list(store) == PRINCIPLES
+    assert [store[i] for i in range(len(store))] == PRINCIPLES
+    assert store[-1] == PRINCIPLES[-1]
+    assert store[1:4] == PRINCIPLES[1:4] and store[::-2] == PRINCIPLES[::-2]
+    assert [type(c) for c in store[0]['position']] == [int, int, int]
+    assert [type(c) for c in store[1]['position']] == [int, int, float]
+    assert 'color' not in store[1]
+
+
+def test_layer_views_are_slices():
+    store = PrincipleStore(PRINCIPLES)
+    view = store.positions_view('CM2')
+    assert np.shares_memory(view, store.positions)
+    assert view.tolist() == [[1, 3, 3], [3, 1, 3]]
+    assert store.names_view('CM2').tolist() == ['Bus', 'Réseau']
+    assert store.colors_of('CM0', '#3b82f6').tolist() == ['#3b82f6']
+    assert list(store.layer('CM1')) == [PRINCIPLES[2]]
+
+
+def test_mutations_keep_insertion_order():
+    store = PrincipleStore(PRINCIPLES)
+    expected = [dict(p) for p in PRINCIPLES]
+
+    moved = dict(expected[0], layer='CM1', position=[0, 1, 2])
+    store.update(store.find('Bus'), moved)
+    expected[0] = moved
+    assert list(store) == expected
+
+    store.remove(store.find('Processus'))
+    del expected[1]
+    added = {'name': 'Trait', 'layer': 'CM0', 'position': [4, 4, -0.5]}
+    store.append(added)
+    expected.append(added)
+    assert list(store) == expected
+    assert store.count('CM0') == 1
+
+
+def test_orthogonality_uses_the_columns():
+    store = PrincipleStore(PRINCIPLES)
+    names, vectors = named_vectors(store)
+    list_names, list_vectors = named_vectors(PRINCIPLES)
+    assert names == list_names
+    np.testing.assert_array_equal(vectors, list_vectors)
+    assert orthogonality_violations(store, 0.99) == orthogonality_violations(PRINCIPLES, 0.99)
+
+
+def test_vectors_and_matrix_follow_insertion_order():
+    np.testing.assert_array_equal(principle_vectors(PrincipleStore(PRINCIPLES)),
+                                  principle_vectors(PRINCIPLES))
+    score, matrix = compute_orthogonality(PrincipleStore(PRINCIPLES))
+    list_score, list_matrix = compute_orthogonality(PRINCIPLES)
+    assert score == pytest.approx(list_score)
+    np.testing.assert_allclose(matrix, list_matrix)
+
+
+def test_export_records_match_the_list():
+    from transystor.transystor_export import principle_records
+
+    assert list(principle_records(PrincipleStore(PRINCIPLES))) == \
+        list(principle_records(PRINCIPLES))
+
+
+@pytest.mark.parametrize('lod', [False, True])
+def test_render_matches_the_list(lod):
+    pytest.importorskip('plotly')
+    from transystor.transystor_viz import create_nested_cubes_visualization
+
+    positioned = [p for p in PRINCIPLES if 'position' in p]
+    layers = {layer: True for layer in ('CM0', 'CM1', 'CM2', 'CM3')}
+    figures = [create_nested_cubes_visualization(principles, layers, batched=True, lod=lod)
+               for principles in (positioned, PrincipleStore(positioned))]
+
+    # Une trace par couche (dans l'ordre des couches pour le stockage)
+    traces = [sorted((t.name, list(t.x), list(t.y), list(t.z), t.marker.color, t.hovertext)
+                     for t in fig.data if 'markers' in (t.mode or ''))
+              for fig in figures]
+    assert len(traces[0]) == 3
+    assert traces[0] == traces[1]
+
+
+def test_palette_beyond_uint16():
+    principles = [{'name': f'P{i}', 'layer': 'CM2', 'color': f'#{i:06x}'} for i in range(70000)]
+    store = PrincipleStore(principles)
+    assert store[-1]['color'] == '#01116f'
+    assert store.colors_of('CM2')[-1] == '#01116f'
@@ -0,0 +1,297 @@
+"""
+TranSysTor Assistant - Audit par lot
+Envoi concurrent d'une série de questions à un ou plusieurs fournisseurs
+(concurrence bornée, débit limité par fournisseur, nouvelles tentatives
+avec attente exponentielle) et rapport JSON/Markdown des réponses
+"""
+
+import asyncio
+import json
+import random
+import time
+from pathlib import Path
+
+from transystor.assistant.providers import SYSTEM_PROMPT
+
+# Requêtes simultanées au plus, tous fournisseurs confondus
+DEFAULT_CONCURRENCY = 4
+
+# Nouvelles tentatives après un échec temporaire
+DEFAULT_RETRIES = 2
+
+# Attente avant la première nouvelle tentative (secondes), doublée ensuite
+DEFAULT_BACKOFF = 1.0
+
+# Codes HTTP d'un échec temporaire (surcharge, limite de débit)
+_RETRY_STATUS = {408, 409, 429}
+
+
+def load_questions(path):
+    """
+    Charge des questions depuis un fichier YAML
+
+    Formats acceptés : liste de {label, question}, liste de questions, ou
+    dict label -> question.
+
+    Args:
+        path: Chemin du fichier YAML
+
+    Returns:
+        Liste de tuples (label, question)
+
+    Raises:
+        ValueError: Si le fichier n'a pas l'un des formats attendus
+    """
+    import yaml
+
+    with open(path, 'r', encoding='utf-8') as f:
+        data = yaml.safe_load(f) or []
+
+    if isinstance(data, dict):
+        data = [{'label': label, 'question': question} for label, question in data.items()]
+    if not isinstance(data, list):
+        raise ValueError(f"{path}: liste ou dict de questions attendu")
+
+    questions = []
+    for n, item in enumerate(data, 1):
+        if isinstance(item, str):
+            questions.append((f"Question {n}", item))
+        elif isinstance(item, dict) and item.get('question'):
+            questions.append((str(item.get('label') or f"Question {n}"), str(item['question'])))
+        else:
+            raise ValueError(f"{path}: entrée {n} sans question")
+    return questions
+
+
+def is_retryable(error):
+    """
+    Indique si un échec est temporaire (connexion, surcharge ou limite de
+    débit de l'API)
+
+    Un délai dépassé n'est pas retenté : chaque tentative coûterait de
+    nouveau le délai complet pour un fournisseur qui reste lent.
+
+    Args:
+        error: Exception levée par le fournisseur
+
+    Returns:
+        True si une nouvelle tentative a un sens
+    """
+    if isinstance(error, (ImportError, ValueError, TypeError, asyncio.TimeoutError)):
+        return False
+    status = getattr(error, 'status_code', None)
+    if status is None:
+        return True
+    return status in _RETRY_STATUS or status >= 500
+
+
+class RateLimiter:
+    """
+    Limiteur de débit d'un fournisseur : les requêtes sont espacées d'au
+    moins 1 / rate secondes
+    """
+
+    def __init__(self, rate):
+        """
+        Args:
+            rate: Requêtes par seconde
+        """
+        self.interval = 1.0 / rate
+        self._next = 0.0
+        # Verrou créé au premier appel, sur la boucle qui l'utilise (avant
+        # Python 3.10, asyncio.Lock() se lie à la boucle courante dès sa
+        # création)
+        self._lock = None
+
+    async def acquire(self):
+        """Attend le prochain créneau libre"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class BatchReport:
+    """Résultats d'un audit par lot"""
+
+    def __init__(self, results, elapsed, started=None):
+        """
+        Args:
+            results: Liste de dicts (label, question, provider, model,
+                text, error, elapsed, attempts, cached)
+            elapsed: Durée totale en secondes
+            started: Date de lancement (ISO 8601)
+        """
+        self.results = results
+        self.elapsed = elapsed
+        self.started = started or time.strftime('%Y-%m-%dT%H:%M:%S')
+
+    @property
+    def failures(self):
+        """Résultats en échec"""
+        return [r for r in self.results if r['error'] is not None]
+
+    def to_dict(self):
+        """Retourne le rapport sous forme de dict sérialisable"""
+        return {
+            'started': self.started,
+            'elapsed': round(self.elapsed, 3),
+            'total': len(self.results),
+            'failures': len(self.failures),
+            'results': self.results
+        }
+
+    def to_json(self):
+        """Retourne le rapport en JSON"""
+        return json.dumps(self.to_dict(), indent=2, ensure_ascii=False)
+
+    def to_markdown(self):
+        """Retourne le rapport en Markdown"""
+        lines = [
+            "# Audit TSCP",
+            "",
+            f"- Lancé le : {self.started}",
+            f"- Durée : {self.elapsed:.2f} s",
+            f"- Réponses : {len(self.results) - len(self.failures)} / {len(self.results)}",
+            "",
+            "| Question | Fournisseur | Durée (s) | Tentatives | Statut |",
+            "|---|---|---|---|---|",
+        ]
+        for r in self.results:
+            status = '⚡ cache' if r['cached'] else ('❌' if r['error'] else '✅')
+            lines.append(f"| {r['label']} | {r['provider']} | {r['elapsed']:.2f} "
+                         f"| {r['attempts']} | {status} |")
+
+        for r in self.results:
+            lines += ["", f"## {r['label']} — {r['provider']}", "", f"> {r['question']}", ""]
+            lines.append(f"❌ {r['error']}" if r['error'] else r['text'])
+        return '\n'.join(lines) + '\n'
+
+    def save(self, path):
+        """
+        Écrit le rapport (JSON si le fichier finit par .json, Markdown sinon)
+
+        Args:
+            path: Chemin du fichier
+
+        Returns:
+            Path du fichier écrit
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        content = self.to_json() if path.suffix.lower() == '.json' else self.to_markdown()
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return path
+
+
+class BatchRunner:
+    """
+    Envoie chaque question à chaque fournisseur sur la boucle d'une
+    AssistantSession
+
+    Toutes les requêtes partent ensemble : la durée de l'audit est celle
+    de l'appel le plus lent, bornée par la concurrence et le débit
+    autorisés. Un échec temporaire est retenté après une attente qui
+    double à chaque tentative (avec une part aléatoire) ; pendant
+    l'attente, la place dans le sémaphore est libérée. Un délai dépassé
+    n'est pas retenté : une question coûte au plus un délai.
+    """
+
+    def __init__(self, session, concurrency=DEFAULT_CONCURRENCY, rate_limits=None,
+                 retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF, timeout=None):
+        """
+        Args:
+            session: AssistantSession (boucle, fournisseurs et cache)
+            concurrency: Requêtes simultanées au plus
+            rate_limits: Dict nom du fournisseur -> requêtes par seconde
+            retries: Nouvelles tentatives après un échec temporaire
+            backoff: Attente avant la première nouvelle tentative (secondes)
+            timeout: Délai maximal d'une requête, non retentée s'il est
+                dépassé (défaut : celui de la session)
+        """
+        self.session = session
+        self.concurrency = concurrency
+        self.rate_limits = dict(rate_limits or {})
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout or session.timeout
+
+    async def _ask(self, provider, label, question, system, model_hash, semaphore, limiter):
+        start = time.perf_counter()
+        result = {'label': label, 'question': question, 'provider': provider.name,
+                  'model': provider.model, 'text': None, 'error': None,
+                  'elapsed': 0.0, 'attempts': 0, 'cached': False}
+
+        key = self.session.cache_key(provider, question, system, model_hash)
+        if key is not None:
+            text = self.session.cache.get(key)
+            if text is not None:
+                result.update(text=text, cached=True, elapsed=time.perf_counter() - start)
+                return result
+
+        for attempt in range(self.retries + 1):
+            async with semaphore:
+                if limiter is not None:
+                    await limiter.acquire()
+                result['attempts'] += 1
+                try:
+                    text = await asyncio.wait_for(provider.complete(question, system),
+                                                  self.timeout)
+                except asyncio.TimeoutError as e:
+                    error, message = e, f"Délai dépassé ({self.timeout:g}s)"
+                except ImportError as e:
+                    error, message = e, str(e)
+                except Exception as e:
+                    error, message = e, f"Erreur: {e}"
+                else:
+                    result.update(text=text, error=None)
+                    if key is not None:
+                        self.session.cache.put(key, text, provider.name, provider.model)
+                    break
+
+            result['error'] = message
+            if attempt == self.retries or not is_retryable(error):
+                break
+            delay = self.backoff * 2 ** attempt
+            await asyncio.sleep(delay + random.uniform(0, delay / 2))
+
+        result['elapsed'] = time.perf_counter() - start
+        return result
+
+    async def _run(self, providers, questions, system, model_hash):
+        semaphore = asyncio.Semaphore(self.concurrency)
+        limiters = {name: RateLimiter(rate) for name, rate in self.rate_limits.items() if rate}
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(
+            self._ask(provider, label, question, system(question), model_hash,
+                      semaphore, limiters.get(provider.name))
+            for label, question in questions
+            for provider in providers
+        ))
+        return BatchReport(list(results), time.perf_counter() - start)
+
+    def run(self, providers, questions, system=SYSTEM_PROMPT, model_hash=None):
+        """
+        Lance l'audit et attend le rapport
+
+        Args:
+            providers: Liste d'instances de Provider (voir session.provider)
+            questions: Liste de tuples (label, question)
+            system: Prompt système, ou fonction question -> prompt (ex:
+                prompt complété par le résumé du modèle)
+            model_hash: Empreinte des principes (réponses lues et rangées
+                dans le cache de la session si fournie)
+
+        Returns:
+            BatchReport
+        """
+        build_system = system if callable(system) else (lambda question: system)
+        return self.session.submit(
+            self._run(list(providers), list(questions), build_system, model_hash)
+        ).result()
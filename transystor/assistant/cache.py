@@ -0,0 +1,162 @@
+"""
+TranSysTor Assistant - Cache des réponses
+Cache SQLite persistant des réponses des fournisseurs, avec durée de vie
+et éviction LRU bornée
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+# Durée de vie d'une réponse (secondes)
+DEFAULT_TTL = 7 * 24 * 3600
+
+# Nombre maximal de réponses conservées
+DEFAULT_MAX_ENTRIES = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    provider TEXT NOT NULL,
+    model TEXT,
+    response TEXT NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);
+"""
+
+
+def response_key(provider, model, system, question, model_hash=''):
+    """
+    Calcule la clé d'une réponse
+
+    Args:
+        provider: Nom du fournisseur
+        model: Modèle interrogé
+        system: Prompt système
+        question: Question posée
+        model_hash: Empreinte des principes (une réponse ne vaut que pour
+            l'état du modèle TSCP auquel elle répond)
+
+    Returns:
+        Clé hexadécimale (SHA-256)
+    """
+    payload = json.dumps([provider, model, system, question, model_hash], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """
+    Cache persistant des réponses de l'assistant
+
+    Les réponses sont rangées dans une base SQLite ; une entrée plus
+    ancienne que ttl est ignorée puis purgée, et au-delà de max_entries
+    les entrées les moins récemment lues sont évincées. Les compteurs de
+    succès/échecs portent sur la session.
+    """
+
+    def __init__(self, path=None, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES):
+        """
+        Args:
+            path: Fichier SQLite (défaut <cache>/assistant_responses.sqlite,
+                voir transystor_core.get_path) ; ':memory:' pour un cache
+                non persistant
+            ttl: Durée de vie d'une réponse en secondes (None : illimitée)
+            max_entries: Nombre maximal de réponses conservées
+        """
+        if path is None:
+            try:
+                from transystor.transystor_core import get_path
+            except ImportError:
+                from transystor_core import get_path
+            path = get_path('cache') / 'assistant_responses.sqlite'
+        if str(path) != ':memory:':
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        # Connexion partagée entre le thread de l'assistant et l'interface
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def _expired_before(self, now):
+        return now - self.ttl if self.ttl is not None else float('-inf')
+
+    def get(self, key):
+        """
+        Retourne une réponse en cache et la marque comme récemment lue
+
+        Args:
+            key: Clé (voir response_key)
+
+        Returns:
+            Texte de la réponse, ou None (absente ou expirée)
+        """
+        now = time.time()
+        with self._lock, self._db:
+            row = self._db.execute(
+                "SELECT response FROM responses WHERE key = ? AND created >= ?",
+                (key, self._expired_before(now))
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+        self.hits += 1
+        return row[0]
+
+    def put(self, key, response, provider='', model=None):
+        """
+        Enregistre une réponse, puis purge les entrées expirées et évince
+        les moins récemment lues au-delà de max_entries
+
+        Args:
+            key: Clé (voir response_key)
+            response: Texte de la réponse
+            provider: Nom du fournisseur
+            model: Modèle interrogé
+        """
+        now = time.time()
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (key, provider, model, response, now, now)
+            )
+            self._db.execute("DELETE FROM responses WHERE created < ?",
+                             (self._expired_before(now),))
+            if self.max_entries is not None:
+                self._db.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    " SELECT key FROM responses ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+
+    def clear(self):
+        """Vide le cache et remet les compteurs à zéro"""
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM responses")
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        """Retourne les statistiques du cache"""
+        return {'size': len(self), 'maxsize': self.max_entries, 'ttl': self.ttl,
+                'hits': self.hits, 'misses': self.misses}
+
+    def close(self):
+        """Ferme la base"""
+        with self._lock:
+            self._db.close()
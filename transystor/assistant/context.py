@@ -0,0 +1,311 @@
+"""
+TranSysTor Assistant - Contexte du modèle
+Résumé compact des principes joint au prompt système : principes classés
+par pertinence pour la question puis tronqués à un budget de tokens,
+préparation mise en cache par révision du modèle
+"""
+
+import re
+import unicodedata
+from collections import Counter
+
+from transystor.assistant.providers import SYSTEM_PROMPT
+from transystor.core.cache import LRUCache
+from transystor.core.hashing import principles_fingerprint
+from transystor.core.index import PrincipleIndex, cell_of
+
+# Budget par défaut du résumé (tokens estimés)
+DEFAULT_TOKEN_BUDGET = 1500
+
+# Voisins colinéaires retenus autour de chaque principe cité
+DEFAULT_NEIGHBOURS = 5
+
+# Longueur maximale d'une description dans le résumé (caractères)
+MAX_DESCRIPTION = 80
+
+# Poids du classement par pertinence
+_MENTION_WEIGHT = 10.0
+_NEIGHBOUR_WEIGHT = 5.0
+_CELL_WEIGHT = 2.0
+_LAYER_WEIGHT = 3.0
+_WORD_WEIGHT = 1.0
+
+# Mots de la question pris en compte pour le recouvrement lexical :
+# longueur minimale et mots vides
+_MIN_WORD_LENGTH = 4
+_STOPWORDS = {'avec', 'dans', 'entre', 'pour', 'plus', 'quels', 'quelles', 'sont', 'tous',
+              'toutes', 'cette', 'principe', 'principes', 'propose', 'analyse'}
+
+_LAYER_PATTERN = re.compile(r'\bCM\s*([0-3])\b', re.IGNORECASE)
+
+
+def estimate_tokens(text):
+    """
+    Estime le nombre de tokens d'un texte (environ 4 caractères par
+    token, sans dépendre du tokenizer d'un fournisseur)
+
+    Args:
+        text: Texte
+
+    Returns:
+        Nombre de tokens estimé
+    """
+    return (len(text) + 3) // 4
+
+
+def _words(text):
+    """Mots normalisés (minuscules, sans accents) d'un texte"""
+    text = unicodedata.normalize('NFKD', text.casefold())
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    return set(re.findall(r'\w+', text))
+
+
+def _format_number(value):
+    return f"{value:g}" if isinstance(value, (int, float)) else str(value)
+
+
+def principle_line(principle):
+    """
+    Ligne compacte décrivant un principe
+
+    Args:
+        principle: Dict du principe
+
+    Returns:
+        Texte (ex: "- Bus [CM2 (1,3,3)] : Bus = Processus ⊗ Distribution")
+    """
+    tags = [principle.get('layer') or '?']
+    if 'position' in principle:
+        tags.append('(' + ','.join(_format_number(c) for c in principle['position'][:3]) + ')')
+    if principle.get('type'):
+        tags.append(principle['type'])
+
+    line = f"- {principle['name']} [{' '.join(tags)}]"
+
+    description = principle.get('description')
+    if description:
+        if len(description) > MAX_DESCRIPTION:
+            description = description[:MAX_DESCRIPTION - 1].rstrip() + '…'
+        line += f" : {description}"
+
+    derives = principle.get('derives')
+    if derives:
+        if not isinstance(derives, (list, tuple)):
+            derives = [derives]
+        line += f" ; dérive de {', '.join(map(str, derives))}"
+    return line
+
+
+class ModelDigest:
+    """
+    Préparation d'une révision du modèle pour le résumé
+
+    Lignes compactes, coûts en tokens, mots et index des principes sont
+    calculés une fois par révision ; l'index de colinéarité (NumPy/SciPy)
+    n'est construit qu'à la première question citant un principe.
+    """
+
+    def __init__(self, principles):
+        """
+        Args:
+            principles: Liste des principes
+        """
+        self.principles = list(principles)
+        self.lines = [principle_line(p) for p in self.principles]
+        self.costs = [estimate_tokens(line) + 1 for line in self.lines]
+        self.words = [_words(f"{p['name']} {p.get('description', '')}") for p in self.principles]
+        # Première ligne de chaque nom (l'index garde le premier en cas de doublon)
+        self.rows = {}
+        for row, p in enumerate(self.principles):
+            self.rows.setdefault(p['name'], row)
+        self.index = PrincipleIndex(self.principles)
+        # Noms cités tels quels (casse comprise) : 'Structure' est un
+        # principe, 'la structure du cube' n'en cite pas
+        self._name_words = {name: set(re.findall(r'\w+', name)) for name in self.rows}
+        self._collinearity = None
+
+        counts = Counter(p.get('layer') for p in self.principles)
+        layers = ', '.join(f"{layer}: {counts[layer]}"
+                           for layer in sorted(counts, key=lambda layer: str(layer)))
+        self.header = f"Modèle courant : {len(self.principles)} principes ({layers})"
+
+    @property
+    def collinearity(self):
+        """CollinearityIndex des positions (construit au premier accès)"""
+        if self._collinearity is None:
+            from transystor.math.collinearity import CollinearityIndex
+            self._collinearity = CollinearityIndex(self.principles)
+        return self._collinearity
+
+    def mentioned(self, question):
+        """
+        Principes cités par leur nom dans une question
+
+        Args:
+            question: Question de l'utilisateur
+
+        Returns:
+            Liste des rangs des principes cités
+        """
+        words = set(re.findall(r'\w+', question))
+        return [
+            self.rows[name] for name, name_words in self._name_words.items()
+            if name_words and name_words <= words
+        ]
+
+    def rank(self, question, neighbours=DEFAULT_NEIGHBOURS):
+        """
+        Classe les principes par pertinence pour une question
+
+        Un principe cité par son nom passe en tête ; ses voisins les plus
+        colinéaires et ceux de sa cellule du réseau suivent, puis les
+        principes des couches citées (CM0 à CM3) et ceux dont le nom ou
+        la description partage des mots avec la question. À pertinence
+        égale, l'ordre du modèle est conservé.
+
+        Args:
+            question: Question de l'utilisateur
+            neighbours: Voisins colinéaires retenus par principe cité
+
+        Returns:
+            Liste des rangs des principes, le plus pertinent d'abord
+        """
+        scores = [0.0] * len(self.principles)
+
+        mentioned = self.mentioned(question)
+        for row in mentioned:
+            principle = self.principles[row]
+            scores[row] += _MENTION_WEIGHT
+
+            if 'position' not in principle:
+                continue
+            for neighbour in self.index.at_cell(cell_of(principle['position'])):
+                scores[self.rows[neighbour['name']]] += _CELL_WEIGHT
+            if neighbours:
+                for name, cosine in self.collinearity.most_collinear(principle['name'], neighbours):
+                    scores[self.rows[name]] += _NEIGHBOUR_WEIGHT * cosine
+
+        layers = {f"CM{digit}" for digit in _LAYER_PATTERN.findall(question)}
+        for layer in layers:
+            for principle in self.index.by_layer(layer):
+                scores[self.rows[principle['name']]] += _LAYER_WEIGHT
+
+        words = {w for w in _words(question)
+                 if len(w) >= _MIN_WORD_LENGTH and w not in _STOPWORDS}
+        if words:
+            for row, principle_words in enumerate(self.words):
+                scores[row] += _WORD_WEIGHT * len(words & principle_words)
+
+        return sorted(range(len(scores)), key=lambda row: -scores[row])
+
+    def render(self, question, budget=DEFAULT_TOKEN_BUDGET, neighbours=DEFAULT_NEIGHBOURS):
+        """
+        Produit le résumé du modèle pour une question
+
+        Args:
+            question: Question de l'utilisateur
+            budget: Budget du résumé (tokens estimés)
+            neighbours: Voisins colinéaires retenus par principe cité
+
+        Returns:
+            Texte du résumé (en-tête, principes retenus, nombre d'omis)
+        """
+        used = estimate_tokens(self.header) + 1
+        selected = []
+        for row in self.rank(question, neighbours):
+            # Une ligne trop longue n'empêche pas les suivantes, plus courtes
+            if used + self.costs[row] > budget:
+                continue
+            used += self.costs[row]
+            selected.append(row)
+
+        lines = [self.header] + [self.lines[row] for row in selected]
+        omitted = len(self.principles) - len(selected)
+        if omitted:
+            lines.append(f"… {omitted} principe(s) omis")
+        return '\n'.join(lines)
+
+
+class ContextBuilder:
+    """
+    Construit le contexte du modèle joint aux questions
+
+    Les préparations (ModelDigest) sont gardées par révision du modèle et
+    les résumés par (révision, question, budget) : une même question sur
+    un modèle inchangé ne coûte qu'une recherche dans le cache.
+    """
+
+    def __init__(self, budget=DEFAULT_TOKEN_BUDGET, neighbours=DEFAULT_NEIGHBOURS,
+                 revisions=4, maxsize=128):
+        """
+        Args:
+            budget: Budget par défaut du résumé (tokens estimés)
+            neighbours: Voisins colinéaires retenus par principe cité
+            revisions: Nombre de révisions du modèle gardées
+            maxsize: Nombre de résumés gardés
+        """
+        self.budget = budget
+        self.neighbours = neighbours
+        self.digests = LRUCache(maxsize=revisions)
+        self.contexts = LRUCache(maxsize=maxsize)
+
+    def digest(self, principles, revision=None):
+        """
+        Retourne la préparation d'une révision du modèle
+
+        Args:
+            principles: Liste des principes
+            revision: Identifiant de révision (défaut : empreinte des
+                principes ; ex: numéro d'entrée du journal)
+
+        Returns:
+            ModelDigest
+        """
+        if revision is None:
+            revision = principles_fingerprint(principles)
+        return self.digests.get_or_build(revision, lambda: ModelDigest(principles))
+
+    def build(self, principles, question, budget=None, revision=None):
+        """
+        Résume le modèle pour une question dans un budget de tokens
+
+        Args:
+            principles: Liste des principes
+            question: Question de l'utilisateur
+            budget: Budget du résumé (défaut : celui du constructeur)
+            revision: Identifiant de révision (défaut : empreinte des principes)
+
+        Returns:
+            Texte du résumé
+        """
+        budget = budget or self.budget
+        if revision is None:
+            revision = principles_fingerprint(principles)
+        return self.contexts.get_or_build(
+            (revision, question, budget),
+            lambda: self.digest(principles, revision).render(question, budget, self.neighbours)
+        )
+
+    def system_prompt(self, principles, question, budget=None, revision=None,
+                      system=SYSTEM_PROMPT):
+        """
+        Prompt système complété par le résumé du modèle
+
+        Args:
+            principles: Liste des principes (None : prompt inchangé)
+            question: Question de l'utilisateur
+            budget: Budget du résumé
+            revision: Identifiant de révision
+            system: Prompt système de base
+
+        Returns:
+            Texte du prompt système
+        """
+        if not principles:
+            return system
+        return f"{system}\n\n{self.build(principles, question, budget, revision)}"
+
+    def clear(self):
+        """Vide les caches"""
+        self.digests.clear()
+        self.contexts.clear()
@@ -0,0 +1,199 @@
+"""
+TranSysTor Assistant - Serveur de flux factice
+Serveur HTTP local imitant les API en flux d'Anthropic (/v1/messages),
+d'OpenAI (/v1/chat/completions) et d'Ollama (/api/chat), pour tester le
+streaming hors ligne avec les vrais SDK
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from transystor.assistant.providers import split_tokens
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        return json.loads(self.rfile.read(length) or b'{}')
+
+    def _send_json(self, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _start_stream(self, content_type):
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+
+    def _chunk(self, data):
+        data = data.encode('utf-8')
+        self.wfile.write(f"{len(data):x}\r\n".encode('ascii') + data + b"\r\n")
+        self.wfile.flush()
+
+    def _end_stream(self):
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+    def _tokens(self, question):
+        server = self.server.owner
+        server.requests.append(question)
+        for token in split_tokens(server.answer(question)):
+            yield token
+            if server.token_delay:
+                time.sleep(server.token_delay)
+
+    def do_POST(self):
+        request = self._read_json()
+        messages = request.get('messages', [])
+        question = messages[-1]['content'] if messages else ''
+        model = request.get('model', 'fake')
+
+        try:
+            if self.path.endswith('/chat/completions'):
+                self._openai(request, question, model)
+            elif self.path.endswith('/messages'):
+                self._anthropic(request, question, model)
+            elif self.path.endswith('/api/chat'):
+                self._ollama(request, question, model)
+            else:
+                self.send_error(404)
+        except (BrokenPipeError, ConnectionResetError):
+            # Client parti (génération annulée)
+            self.server.owner.cancelled += 1
+
+    def _openai(self, request, question, model):
+        if not request.get('stream'):
+            self._send_json({
+                'id': 'fake', 'object': 'chat.completion', 'created': int(time.time()),
+                'model': model,
+                'choices': [{'index': 0, 'finish_reason': 'stop', 'message': {
+                    'role': 'assistant', 'content': self.server.owner.answer(question)}}]
+            })
+            return
+
+        self._start_stream('text/event-stream')
+        base = {'id': 'fake', 'object': 'chat.completion.chunk',
+                'created': int(time.time()), 'model': model}
+        for token in self._tokens(question):
+            chunk = dict(base, choices=[{'index': 0, 'finish_reason': None,
+                                         'delta': {'content': token}}])
+            self._chunk(f"data: {json.dumps(chunk)}\n\n")
+        chunk = dict(base, choices=[{'index': 0, 'finish_reason': 'stop', 'delta': {}}])
+        self._chunk(f"data: {json.dumps(chunk)}\n\n")
+        self._chunk("data: [DONE]\n\n")
+        self._end_stream()
+
+    def _anthropic(self, request, question, model):
+        message = {'id': 'fake', 'type': 'message', 'role': 'assistant', 'model': model,
+                   'stop_reason': None, 'stop_sequence': None,
+                   'usage': {'input_tokens': 0, 'output_tokens': 0}}
+        if not request.get('stream'):
+            self._send_json(dict(message, stop_reason='end_turn', content=[
+                {'type': 'text', 'text': self.server.owner.answer(question)}]))
+            return
+
+        def event(name, payload):
+            self._chunk(f"event: {name}\ndata: {json.dumps(dict(payload, type=name))}\n\n")
+
+        self._start_stream('text/event-stream')
+        event('message_start', {'message': dict(message, content=[])})
+        event('content_block_start', {'index': 0, 'content_block': {'type': 'text', 'text': ''}})
+        for token in self._tokens(question):
+            event('content_block_delta', {'index': 0, 'delta': {'type': 'text_delta', 'text': token}})
+        event('content_block_stop', {'index': 0})
+        event('message_delta', {'delta': {'stop_reason': 'end_turn', 'stop_sequence': None},
+                                'usage': {'output_tokens': 0}})
+        event('message_stop', {})
+        self._end_stream()
+
+    def _ollama(self, request, question, model):
+        base = {'model': model, 'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ')}
+        if request.get('stream') is False:
+            self._send_json(dict(base, done=True, message={
+                'role': 'assistant', 'content': self.server.owner.answer(question)}))
+            return
+
+        self._start_stream('application/x-ndjson')
+        for token in self._tokens(question):
+            self._chunk(json.dumps(dict(base, done=False, message={
+                'role': 'assistant', 'content': token})) + "\n")
+        self._chunk(json.dumps(dict(base, done=True, done_reason='stop', message={
+            'role': 'assistant', 'content': ''})) + "\n")
+        self._end_stream()
+
+
+class FakeStreamingServer:
+    """
+    Serveur local de réponses en flux
+
+    Exemple :
+        with FakeStreamingServer(reply="Bonjour", token_delay=0.05) as server:
+            OllamaProvider(host=server.url)
+            OpenAIProvider(api_key='test', base_url=server.url + '/v1')
+            AnthropicProvider(api_key='test', base_url=server.url)
+    """
+
+    def __init__(self, reply=None, token_delay=0.01, host='127.0.0.1', port=0):
+        """
+        Args:
+            reply: Réponse (str) ou fonction question -> str ; défaut :
+                écho de la question
+            token_delay: Intervalle entre deux tokens (secondes)
+            host: Adresse d'écoute
+            port: Port (0 : choisi par le système)
+        """
+        self.reply = reply
+        self.token_delay = token_delay
+        self.requests = []
+        self.cancelled = 0
+
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.owner = self
+        self._thread = None
+
+    @property
+    def url(self):
+        """URL de base du serveur"""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def answer(self, question):
+        """Réponse complète à une question"""
+        if callable(self.reply):
+            return self.reply(question)
+        if self.reply is not None:
+            return self.reply
+        return f"Réponse factice à : {question}"
+
+    def start(self):
+        """Démarre le serveur dans un thread de fond"""
+        self._thread = threading.Thread(target=self._httpd.serve_forever,
+                                        name='transystor-fake-llm', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Arrête le serveur"""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
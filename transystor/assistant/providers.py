@@ -0,0 +1,341 @@
+"""
+TranSysTor Assistant - Fournisseurs de modèles de langage
+Interface asynchrone commune (Anthropic, OpenAI, Ollama, bouchon local)
+avec un client réutilisé pour toute la session, en réponse complète ou
+en flux de tokens
+"""
+
+import asyncio
+import re
+from abc import ABC, abstractmethod
+
+# Prompt système décrivant le framework aux modèles
+SYSTEM_PROMPT = """Tu es un expert du framework TSCP (Principes Transdisciplinaires de Construction de Systèmes).
+
+Le framework TSCP organise les principes en 4 couches :
+- CM0 : Meta-métamodèle (plan 5×5) - Meta-metaclasses et Méta-traits
+- CM1 : Métamodèle (cube 3×3×3) - Metaclasses et Traits
+- CM2 : Modèle (cube 4×4×4) - Classes organisées dans un cube
+- CM3 : Systèmes réels (cube 5×5×5) - Instances concrètes
+
+Opérateurs :
+- ⊗ : Produit tensoriel (combinaison)
+- ∈ : Instance de
+- ⊂ : Sous-classe de / Dérive de
+
+Ton rôle : valider les principes, détecter les incohérences, proposer des améliorations, vérifier l'orthogonalité."""
+
+# Nombre maximal de tokens d'une réponse
+DEFAULT_MAX_TOKENS = 1000
+
+
+class Provider(ABC):
+    """
+    Fournisseur de complétions
+
+    Le client du SDK est créé au premier appel puis réutilisé (pool de
+    connexions HTTP de la session) ; il appartient à la boucle asyncio
+    qui l'a créé. Les sous-classes implémentent complete() (et stream()
+    si le fournisseur sait produire la réponse en flux).
+    """
+
+    name = 'provider'
+    default_model = None
+
+    def __init__(self, model=None, max_tokens=DEFAULT_MAX_TOKENS):
+        """
+        Args:
+            model: Modèle interrogé (défaut : default_model)
+            max_tokens: Nombre maximal de tokens de la réponse
+        """
+        self.model = model or self.default_model
+        self.max_tokens = max_tokens
+        self._client = None
+
+    def __repr__(self):
+        return f"{type(self).__name__}(model={self.model!r})"
+
+    @property
+    def client(self):
+        """Client du SDK (créé au premier accès)"""
+        if self._client is None:
+            self._client = self._create_client()
+        return self._client
+
+    def _create_client(self):
+        return None
+
+    @abstractmethod
+    async def complete(self, question, system=SYSTEM_PROMPT):
+        """
+        Envoie une question au modèle
+
+        Args:
+            question: Question de l'utilisateur
+            system: Prompt système
+
+        Returns:
+            Texte de la réponse
+        """
+
+    async def stream(self, question, system=SYSTEM_PROMPT):
+        """
+        Envoie une question et produit la réponse au fil de l'eau
+
+        Args:
+            question: Question de l'utilisateur
+            system: Prompt système
+
+        Yields:
+            Fragments de texte de la réponse, dans l'ordre
+        """
+        # Fournisseur sans flux : la réponse complète en un fragment
+        yield await self.complete(question, system)
+
+    async def aclose(self):
+        """Ferme le client et ses connexions"""
+        client, self._client = self._client, None
+        close = getattr(client, 'close', None)
+        if close is not None:
+            result = close()
+            if asyncio.iscoroutine(result):
+                await result
+
+
+def _import_sdk(module, package=None):
+    """Importe un SDK optionnel (message d'installation sinon)"""
+    import importlib
+
+    try:
+        return importlib.import_module(module)
+    except ImportError as error:
+        raise ImportError(
+            f"Module '{package or module}' non installé.\n\n"
+            f"Pour installer :\n    pip install {package or module}"
+        ) from error
+
+
+class AnthropicProvider(Provider):
+    """Claude via le client asynchrone du SDK anthropic"""
+
+    name = 'anthropic'
+    default_model = 'claude-sonnet-4-20250514'
+
+    def __init__(self, api_key, model=None, max_tokens=DEFAULT_MAX_TOKENS, base_url=None):
+        """
+        Args:
+            api_key: Clé API Anthropic
+            model: Modèle interrogé
+            max_tokens: Nombre maximal de tokens de la réponse
+            base_url: URL d'une API compatible (défaut : api.anthropic.com)
+        """
+        super().__init__(model, max_tokens)
+        self.api_key = api_key
+        self.base_url = base_url
+
+    def _create_client(self):
+        return _import_sdk('anthropic').AsyncAnthropic(api_key=self.api_key, base_url=self.base_url)
+
+    async def complete(self, question, system=SYSTEM_PROMPT):
+        message = await self.client.messages.create(
+            model=self.model,
+            max_tokens=self.max_tokens,
+            system=system,
+            messages=[{"role": "user", "content": question}]
+        )
+        return message.content[0].text
+
+    async def stream(self, question, system=SYSTEM_PROMPT):
+        async with self.client.messages.stream(
+            model=self.model,
+            max_tokens=self.max_tokens,
+            system=system,
+            messages=[{"role": "user", "content": question}]
+        ) as response:
+            async for text in response.text_stream:
+                yield text
+
+
+class OpenAIProvider(Provider):
+    """GPT via le client asynchrone du SDK openai (API >= 1.0)"""
+
+    name = 'openai'
+    default_model = 'gpt-4'
+
+    def __init__(self, api_key, model=None, max_tokens=DEFAULT_MAX_TOKENS, base_url=None):
+        """
+        Args:
+            api_key: Clé API OpenAI (propre au client, sans état global)
+            model: Modèle interrogé
+            max_tokens: Nombre maximal de tokens de la réponse
+            base_url: URL d'une API compatible (défaut : api.openai.com)
+        """
+        super().__init__(model, max_tokens)
+        self.api_key = api_key
+        self.base_url = base_url
+
+    def _create_client(self):
+        return _import_sdk('openai').AsyncOpenAI(api_key=self.api_key, base_url=self.base_url)
+
+    def _messages(self, question, system):
+        return [
+            {"role": "system", "content": system},
+            {"role": "user", "content": question}
+        ]
+
+    async def complete(self, question, system=SYSTEM_PROMPT):
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            max_tokens=self.max_tokens,
+            messages=self._messages(question, system)
+        )
+        return response.choices[0].message.content
+
+    async def stream(self, question, system=SYSTEM_PROMPT):
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            max_tokens=self.max_tokens,
+            messages=self._messages(question, system),
+            stream=True
+        )
+        async for chunk in response:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+
+class OllamaProvider(Provider):
+    """Modèle local servi par Ollama"""
+
+    name = 'ollama'
+    default_model = 'llama2'
+
+    def __init__(self, model=None, host=None, max_tokens=DEFAULT_MAX_TOKENS):
+        """
+        Args:
+            model: Modèle local
+            host: URL du serveur Ollama (défaut du SDK : localhost:11434)
+            max_tokens: Nombre maximal de tokens de la réponse
+        """
+        super().__init__(model, max_tokens)
+        self.host = host
+
+    def _create_client(self):
+        return _import_sdk('ollama').AsyncClient(host=self.host)
+
+    def _messages(self, question, system):
+        return [
+            {'role': 'system', 'content': system},
+            {'role': 'user', 'content': question}
+        ]
+
+    async def complete(self, question, system=SYSTEM_PROMPT):
+        response = await self.client.chat(
+            model=self.model,
+            messages=self._messages(question, system),
+            options={'num_predict': self.max_tokens}
+        )
+        return response['message']['content']
+
+    async def stream(self, question, system=SYSTEM_PROMPT):
+        parts = await self.client.chat(
+            model=self.model,
+            messages=self._messages(question, system),
+            options={'num_predict': self.max_tokens},
+            stream=True
+        )
+        async for part in parts:
+            if part['message']['content']:
+                yield part['message']['content']
+
+    async def aclose(self):
+        # AsyncClient garde son httpx.AsyncClient dans _client
+        client, self._client = self._client, None
+        inner = getattr(client, '_client', None)
+        if inner is not None:
+            await inner.aclose()
+
+
+class StubProvider(Provider):
+    """
+    Fournisseur local sans réseau, pour les tests et le mode hors ligne
+
+    Répond après un délai simulé, par un texte fixe, une fonction de la
+    question ou en levant une erreur ; en flux, la réponse est découpée
+    en mots émis à intervalle régulier.
+    """
+
+    name = 'stub'
+    default_model = 'stub'
+
+    def __init__(self, reply=None, delay=0.0, model=None, max_tokens=DEFAULT_MAX_TOKENS,
+                 token_delay=0.0):
+        """
+        Args:
+            reply: Réponse (str), fonction (question, system) -> str, ou
+                exception à lever ; défaut : écho de la question
+            delay: Latence simulée en secondes (avant le premier token)
+            model: Nom du modèle rapporté
+            max_tokens: Nombre maximal de tokens de la réponse
+            token_delay: Intervalle entre deux tokens du flux (secondes)
+        """
+        super().__init__(model, max_tokens)
+        self.reply = reply
+        self.delay = delay
+        self.token_delay = token_delay
+        self.calls = 0
+
+    async def complete(self, question, system=SYSTEM_PROMPT):
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+
+        if isinstance(self.reply, BaseException):
+            raise self.reply
+        if callable(self.reply):
+            return self.reply(question, system)
+        if self.reply is not None:
+            return self.reply
+        return f"[{self.model}] {question}"
+
+    async def stream(self, question, system=SYSTEM_PROMPT):
+        text = await self.complete(question, system)
+        for token in split_tokens(text):
+            yield token
+            if self.token_delay:
+                await asyncio.sleep(self.token_delay)
+
+
+def split_tokens(text):
+    """
+    Découpe un texte en pseudo-tokens (mots suivis de leurs espaces)
+
+    Args:
+        text: Texte complet
+
+    Returns:
+        Liste de fragments dont la concaténation redonne le texte
+    """
+    return re.findall(r'\S+\s*|\s+', text)
+
+
+# Fournisseurs par nom
+PROVIDERS = {
+    cls.name: cls
+    for cls in (AnthropicProvider, OpenAIProvider, OllamaProvider, StubProvider)
+}
+
+
+def create_provider(name, **options):
+    """
+    Crée un fournisseur par son nom
+
+    Args:
+        name: Clé de PROVIDERS ('anthropic', 'openai', 'ollama', 'stub')
+        options: Arguments du constructeur (api_key, model...)
+
+    Returns:
+        Instance de Provider
+    """
+    if name not in PROVIDERS:
+        raise ValueError(f"Fournisseur inconnu: {name}")
+    return PROVIDERS[name](**options)
@@ -0,0 +1,279 @@
+"""
+TranSysTor Assistant - Session asynchrone
+Boucle asyncio dédiée (hors du thread des widgets), fournisseurs gardés
+pour la session et envoi d'une question à plusieurs fournisseurs
+"""
+
+import asyncio
+import queue
+import threading
+import time
+from collections import namedtuple
+
+from transystor.assistant.cache import ResponseCache, response_key
+from transystor.assistant.providers import SYSTEM_PROMPT, create_provider
+
+# Délai maximal d'une requête (secondes)
+DEFAULT_TIMEOUT = 60.0
+
+# Réponse d'un fournisseur : texte ou erreur, durée en secondes, lue
+# depuis le cache ou non
+Answer = namedtuple('Answer', ['provider', 'text', 'error', 'elapsed', 'cached'],
+                    defaults=(False,))
+
+
+class AssistantSession:
+    """
+    Session de l'assistant
+
+    Les requêtes s'exécutent sur une boucle asyncio propre à la session,
+    dans un thread de fond : les callbacks des widgets ne sont jamais
+    bloqués et les clients asynchrones (liés à leur boucle) restent
+    réutilisables d'une question à l'autre.
+    """
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, cache=None):
+        """
+        Args:
+            timeout: Délai par défaut d'une requête (secondes)
+            cache: ResponseCache des réponses (None : pas de cache)
+        """
+        self.timeout = timeout
+        self.cache = cache
+        self._providers = {}
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self):
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever, name='transystor-assistant', daemon=True
+                )
+                self._thread.start()
+        return self._loop
+
+    def provider(self, name, **options):
+        """
+        Retourne le fournisseur de la session pour ces options (créé une
+        seule fois, avec son client)
+
+        Args:
+            name: Nom du fournisseur ('anthropic', 'openai', 'ollama', 'stub')
+            options: Options du fournisseur (api_key, model...)
+
+        Returns:
+            Instance de Provider
+        """
+        key = (name, tuple(sorted(options.items(), key=lambda item: item[0])))
+        with self._lock:
+            if key not in self._providers:
+                self._providers[key] = create_provider(name, **options)
+            return self._providers[key]
+
+    def submit(self, coroutine):
+        """
+        Exécute une coroutine sur la boucle de la session
+
+        Returns:
+            concurrent.futures.Future du résultat
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine, self._ensure_loop())
+
+    def cache_key(self, provider, question, system, model_hash):
+        """
+        Clé de la réponse dans le cache de la session
+
+        Returns:
+            Clé (voir response_key), ou None sans cache ou sans empreinte
+        """
+        if self.cache is None or model_hash is None:
+            return None
+        return response_key(provider.name, provider.model, system, question, model_hash)
+
+    async def _answer(self, provider, question, system, timeout, model_hash=None):
+        start = time.perf_counter()
+
+        key = self.cache_key(provider, question, system, model_hash)
+        if key is not None:
+            text = self.cache.get(key)
+            if text is not None:
+                return Answer(provider.name, text, None, time.perf_counter() - start, True)
+
+        try:
+            text = await asyncio.wait_for(provider.complete(question, system), timeout)
+            error = None
+            if key is not None:
+                self.cache.put(key, text, provider.name, provider.model)
+        except asyncio.TimeoutError:
+            text, error = None, f"Délai dépassé ({timeout:g}s)"
+        except ImportError as e:
+            # SDK absent : message d'installation
+            text, error = None, str(e)
+        except Exception as e:
+            text, error = None, f"Erreur: {e}"
+        return Answer(provider.name, text, error, time.perf_counter() - start)
+
+    def ask(self, provider, question, system=SYSTEM_PROMPT, timeout=None, model_hash=None):
+        """
+        Envoie une question sans bloquer
+
+        Args:
+            provider: Instance de Provider (voir provider())
+            question: Question de l'utilisateur
+            system: Prompt système
+            timeout: Délai maximal (défaut : celui de la session)
+            model_hash: Empreinte des principes ; si fournie (et la
+                session a un cache), la réponse est lue ou rangée en cache
+
+        Returns:
+            concurrent.futures.Future d'une Answer
+        """
+        return self.submit(self._answer(provider, question, system,
+                                        timeout or self.timeout, model_hash))
+
+    async def _fan_out(self, providers, question, system, timeout, model_hash):
+        return await asyncio.gather(*(
+            self._answer(provider, question, system, timeout, model_hash)
+            for provider in providers
+        ))
+
+    def fan_out(self, providers, question, system=SYSTEM_PROMPT, timeout=None,
+                model_hash=None):
+        """
+        Envoie une même question à plusieurs fournisseurs en parallèle
+
+        La durée totale est celle du fournisseur le plus lent (borné par
+        timeout) ; un échec n'interrompt pas les autres requêtes.
+
+        Args:
+            providers: Liste d'instances de Provider
+            question: Question (ex: validation d'un principe)
+            system: Prompt système
+            timeout: Délai maximal par fournisseur
+            model_hash: Empreinte des principes (voir ask)
+
+        Returns:
+            concurrent.futures.Future de la liste des Answer (même ordre)
+        """
+        return self.submit(self._fan_out(list(providers), question, system,
+                                         timeout or self.timeout, model_hash))
+
+    async def _stream(self, provider, question, system, on_token, timeout, model_hash):
+        start = time.perf_counter()
+
+        key = self.cache_key(provider, question, system, model_hash)
+        if key is not None:
+            text = self.cache.get(key)
+            if text is not None:
+                on_token(text)
+                return Answer(provider.name, text, None, time.perf_counter() - start, True)
+
+        parts = []
+
+        async def consume():
+            async for token in provider.stream(question, system):
+                parts.append(token)
+                on_token(token)
+
+        try:
+            await asyncio.wait_for(consume(), timeout)
+            error = None
+            if key is not None:
+                self.cache.put(key, ''.join(parts), provider.name, provider.model)
+        except asyncio.TimeoutError:
+            error = f"Délai dépassé ({timeout:g}s)"
+        except ImportError as e:
+            error = str(e)
+        except Exception as e:
+            error = f"Erreur: {e}"
+        return Answer(provider.name, ''.join(parts) if error is None else None, error,
+                      time.perf_counter() - start)
+
+    def stream(self, provider, question, on_token, system=SYSTEM_PROMPT, timeout=None,
+               model_hash=None):
+        """
+        Envoie une question et transmet la réponse token par token
+
+        on_token est appelé depuis le thread de l'assistant pour chaque
+        fragment reçu (une seule fois avec le texte complet pour une
+        réponse en cache). Annuler le Future (future.cancel()) interrompt
+        la génération en cours.
+
+        Args:
+            provider: Instance de Provider
+            question: Question de l'utilisateur
+            on_token: Fonction appelée avec chaque fragment de texte
+            system: Prompt système
+            timeout: Délai maximal de la génération complète
+            model_hash: Empreinte des principes (voir ask)
+
+        Returns:
+            concurrent.futures.Future de l'Answer complète
+        """
+        return self.submit(self._stream(provider, question, system, on_token,
+                                        timeout or self.timeout, model_hash))
+
+    def iter_tokens(self, provider, question, system=SYSTEM_PROMPT, timeout=None,
+                    model_hash=None):
+        """
+        Itère de façon synchrone sur les tokens d'une réponse (ex: pour
+        st.write_stream)
+
+        Fermer l'itérateur avant la fin (interruption du script, break)
+        annule la génération. Une erreur est produite comme dernier
+        fragment, préfixée par '❌'.
+
+        Yields:
+            Fragments de texte de la réponse
+        """
+        tokens = queue.Queue()
+        done = object()
+        future = self.stream(provider, question, tokens.put, system, timeout, model_hash)
+        future.add_done_callback(lambda _: tokens.put(done))
+
+        try:
+            while True:
+                token = tokens.get()
+                if token is done:
+                    break
+                yield token
+            if not future.cancelled() and future.result().error is not None:
+                yield f"\n\n❌ {future.result().error}"
+        finally:
+            future.cancel()
+
+    def close(self):
+        """Ferme les clients des fournisseurs puis arrête la boucle"""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            providers = list(self._providers.values())
+            self._loop, self._thread, self._providers = None, None, {}
+        if loop is None:
+            return
+
+        async def close_all():
+            await asyncio.gather(*(p.aclose() for p in providers), return_exceptions=True)
+
+        asyncio.run_coroutine_threadsafe(close_all(), loop).result(self.timeout)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+
+_default_session = None
+_default_lock = threading.Lock()
+
+
+def default_session():
+    """
+    Retourne la session partagée du processus (créée au premier appel,
+    avec le cache persistant des réponses)
+    """
+    global _default_session
+    with _default_lock:
+        if _default_session is None:
+            _default_session = AssistantSession(cache=ResponseCache())
+        return _default_session
@@ -0,0 +1,9 @@
+"""
+TranSysTor CLI - Exécution par python -m transystor.cli
+"""
+
+import sys
+
+from transystor.cli.main import main
+
+sys.exit(main())
@@ -0,0 +1,181 @@
+"""
+TranSysTor CLI - Audit du modèle
+Pose les questions prédéfinies (et celles d'un fichier YAML) à un ou
+plusieurs fournisseurs en parallèle et écrit le rapport
+
+Exemple :
+    python -m transystor.cli.audit -p anthropic -p openai \\
+        --questions audit.yaml --rate openai=2 -o rapport.md
+"""
+
+import argparse
+import logging
+import os
+import sys
+
+# Variables d'environnement des clés API
+API_KEY_VARIABLES = {
+    'anthropic': 'ANTHROPIC_API_KEY',
+    'openai': 'OPENAI_API_KEY'
+}
+
+
+def _rate(value):
+    name, sep, rate = value.partition('=')
+    try:
+        if not sep:
+            raise ValueError
+        rate = float(rate)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Format attendu fournisseur=requêtes/s: {value}")
+    if not rate > 0:
+        raise argparse.ArgumentTypeError(f"Débit strictement positif attendu: {value}")
+    return name, rate
+
+
+def _at_least(minimum):
+    """Type argparse : entier supérieur ou égal à minimum"""
+    def parse(value):
+        try:
+            number = int(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"Entier attendu: {value}")
+        if number < minimum:
+            raise argparse.ArgumentTypeError(f"Entier >= {minimum} attendu: {value}")
+        return number
+    return parse
+
+
+def build_parser(parser=None):
+    """
+    Déclare les options de l'audit
+
+    Args:
+        parser: ArgumentParser à compléter (défaut : nouveau parseur)
+
+    Returns:
+        ArgumentParser
+    """
+    if parser is None:
+        parser = argparse.ArgumentParser(
+            prog='transystor-audit',
+            description="Audit du modèle TSCP par les assistants IA"
+        )
+    parser.add_argument('-p', '--provider', action='append', dest='providers',
+                        help="Fournisseur (anthropic, openai, ollama, stub) ; répétable "
+                             "(défaut : stub)")
+    parser.add_argument('-q', '--questions', action='append', default=[], metavar='YAML',
+                        help="Fichier YAML de questions supplémentaires ; répétable")
+    parser.add_argument('--no-predefined', action='store_true',
+                        help="Ne pose pas les questions prédéfinies")
+    parser.add_argument('-o', '--output', help="Rapport (.json ou .md ; défaut : Markdown "
+                                               "sur la sortie standard)")
+    # Défauts de BatchRunner appliqués à l'exécution (assistant.batch et
+    # asyncio ne sont importés que par cette commande)
+    parser.add_argument('-j', '--concurrency', type=_at_least(1),
+                        help="Requêtes simultanées au plus (défaut : 4)")
+    parser.add_argument('--rate', action='append', type=_rate, default=[],
+                        metavar='FOURNISSEUR=N', help="Débit maximal d'un fournisseur "
+                                                      "(requêtes/s) ; répétable")
+    parser.add_argument('--retries', type=_at_least(0),
+                        help="Nouvelles tentatives après un échec temporaire (défaut : 2)")
+    parser.add_argument('--backoff', type=float,
+                        help="Attente avant la première nouvelle tentative (s, défaut : 1)")
+    parser.add_argument('--timeout', type=float, help="Délai maximal d'une question (s ; "
+                                                      "un délai dépassé n'est pas retenté)")
+    parser.add_argument('--model', help="Modèle interrogé (défaut : celui du fournisseur)")
+    parser.add_argument('--ollama-host', help="URL du serveur Ollama")
+    parser.add_argument('--no-context', action='store_true',
+                        help="N'ajoute pas le résumé du modèle au prompt")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Ignore le cache des réponses")
+    parser.set_defaults(func=run)
+    return parser
+
+
+def _provider_options(name, args):
+    options = {}
+    if name in API_KEY_VARIABLES:
+        options['api_key'] = os.environ.get(API_KEY_VARIABLES[name])
+    if name == 'ollama' and args.ollama_host:
+        options['host'] = args.ollama_host
+    if args.model:
+        options['model'] = args.model
+    return options
+
+
+def run(args):
+    """
+    Exécute l'audit
+
+    Args:
+        args: Options analysées (voir build_parser)
+
+    Returns:
+        Code de sortie (0 si toutes les questions ont une réponse)
+    """
+    from transystor.assistant.batch import BatchRunner, load_questions
+    from transystor.assistant.cache import ResponseCache
+    from transystor.assistant.session import AssistantSession
+    from transystor.transystor_chatbot import get_predefined_questions
+
+    questions = [] if args.no_predefined else get_predefined_questions()
+    for path in args.questions:
+        questions += load_questions(path)
+    if not questions:
+        print("Aucune question à poser", file=sys.stderr)
+        return 2
+
+    system, model_hash = _model_prompt(args)
+
+    session = AssistantSession(cache=None if args.no_cache else ResponseCache())
+    try:
+        providers = [session.provider(name, **_provider_options(name, args))
+                     for name in args.providers or ['stub']]
+        options = {name: getattr(args, name) for name in ('concurrency', 'retries', 'backoff')
+                   if getattr(args, name) is not None}
+        runner = BatchRunner(session, rate_limits=dict(args.rate), timeout=args.timeout,
+                             **options)
+        report = runner.run(providers, questions, system, model_hash)
+    finally:
+        session.close()
+
+    if args.output:
+        path = report.save(args.output)
+        print(f"Rapport écrit : {path} ({len(report.results)} réponses, "
+              f"{len(report.failures)} échec(s), {report.elapsed:.2f} s)", file=sys.stderr)
+    else:
+        sys.stdout.write(report.to_markdown())
+    return 1 if report.failures else 0
+
+
+def _model_prompt(args):
+    """
+    Prompt système (fonction de la question) et empreinte du modèle
+    chargé depuis le répertoire des modèles
+    """
+    from transystor.assistant.providers import SYSTEM_PROMPT
+
+    if args.no_context:
+        return SYSTEM_PROMPT, ''
+
+    from transystor.assistant.context import ContextBuilder
+    from transystor.core.hashing import principles_fingerprint
+    from transystor.transystor_core import load_all_models
+
+    principles = list(load_all_models(validate=False)['index'])
+    model_hash = principles_fingerprint(principles)
+    builder = ContextBuilder()
+    return (lambda question: builder.system_prompt(principles, question, revision=model_hash),
+            model_hash)
+
+
+def main(argv=None):
+    """Point d'entrée de la commande"""
+    logging.basicConfig(level=logging.WARNING, format='%(message)s')
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,250 @@
+"""
+TranSysTor CLI - Commande transystor
+Validation, export, statistiques et rendu des modèles sans Jupyter ni
+Streamlit ; chaque sous-commande n'importe que ce dont elle a besoin
+
+Exemples :
+    transystor validate
+    transystor export -f owl -f nt -o exports/
+    transystor stats --json
+    transystor render -o cubes.html
+    transystor audit -p anthropic -o rapport.md
+"""
+
+import argparse
+import json
+import logging
+import sys
+
+# Couches du framework (voir transystor_core.CUBE_CONFIGS)
+LAYERS = ('CM0', 'CM1', 'CM2', 'CM3')
+
+
+def _layers(value):
+    layers = [layer.strip().upper() for layer in value.split(',') if layer.strip()]
+    unknown = [layer for layer in layers if layer not in LAYERS]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"Couches inconnues: {', '.join(unknown)}")
+    return tuple(layers)
+
+
+def load_principles(args):
+    """
+    Charge les principes à traiter
+
+    Args:
+        args: Options analysées (input, layers)
+
+    Returns:
+        PrincipleStore des principes : ceux d'un fichier d'état (JSON ou
+        .npz de save_complete_state) si --input est donné, sinon tous les
+        éléments nommés des modèles de couche ; les colonnes sont
+        construites une fois pour l'orthogonalité, l'export et le rendu
+    """
+    from transystor.core.store import PrincipleStore
+
+    if args.input:
+        if args.input.endswith('.npz'):
+            from transystor.core.binary import load_binary
+            state = load_binary(args.input)
+        else:
+            with open(args.input, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        principles = state.get('principles', []) if isinstance(state, dict) else state
+        return PrincipleStore(p for p in principles if p.get('layer') in args.layers)
+
+    from transystor.transystor_core import load_all_models
+
+    return PrincipleStore(load_all_models(args.layers, validate=False)['index'])
+
+
+def cmd_validate(args):
+    """Valide chaque modèle de couche contre son schéma JSON"""
+    from transystor.transystor_core import load_model, validate_model
+
+    failures = 0
+    names = {}
+    for layer in args.layers:
+        model = load_model(layer)
+        try:
+            validate_model(model, layer)
+        except ValueError as e:
+            failures += 1
+            print(f"❌ {layer}: {e}")
+            continue
+
+        elements = [
+            element for value in model.values()
+            if isinstance(value, list) and all(isinstance(v, dict) for v in value)
+            for element in value if 'name' in element
+        ]
+        for element in elements:
+            if element['name'] in names:
+                failures += 1
+                print(f"❌ {layer}: '{element['name']}' déjà défini dans {names[element['name']]}")
+            names.setdefault(element['name'], layer)
+        print(f"✅ {layer}: {len(elements)} élément(s)")
+
+    return 1 if failures else 0
+
+
+def cmd_export(args):
+    """Exporte les principes dans un bundle horodaté"""
+    from transystor.transystor_export import export_all
+
+    principles = load_principles(args)
+    bundle = export_all(principles, args.formats or ('owl', 'shacl', 'rdfs'), args.name,
+                        export_dir=args.output)
+    for format_name, path in bundle['files'].items():
+        print(f"{format_name}: {path}")
+    print(f"Bundle : {bundle['path']} ({bundle['timings']['total']:.3f}s)")
+    return 0
+
+
+def cmd_stats(args):
+    """Affiche les statistiques des principes et leur orthogonalité"""
+    from transystor.core.index import PrincipleIndex
+    from transystor.math.orthogonality import orthogonality_score, principle_vectors
+
+    principles = load_principles(args)
+    index = PrincipleIndex(principles)
+    vectors = principle_vectors(principles)
+    stats = {
+        'principles': len(index),
+        'layers': {layer: count for layer, count in sorted(index.layer_counts().items(),
+                                                           key=lambda item: str(item[0]))},
+        'positioned': len(vectors)
+    }
+
+    if stats['positioned']:
+        stats['orthogonality'] = float(orthogonality_score(vectors))
+        if args.violations:
+            from transystor.math.collinearity import orthogonality_violations
+            stats['violations'] = orthogonality_violations(principles)
+
+    if args.json:
+        print(json.dumps(stats, indent=2, ensure_ascii=False))
+        return 0
+
+    print(f"Principes : {stats['principles']} ({stats['positioned']} positionné(s))")
+    for layer, count in stats['layers'].items():
+        print(f"  {layer}: {count}")
+    if 'orthogonality' in stats:
+        print(f"Orthogonalité : {stats['orthogonality']:.3f}")
+    for violation in stats.get('violations', []):
+        print(f"  ⚠️ {violation['source']} / {violation['target']} : "
+              f"{violation['orthogonality']:.3f}")
+    return 0
+
+
+def cmd_render(args):
+    """Rend la vue 3D des cubes imbriqués en HTML (ou image si kaleido)"""
+    from pathlib import Path
+
+    from transystor.core.store import PrincipleStore
+    from transystor.transystor_viz import create_nested_cubes_visualization
+
+    principles = PrincipleStore(p for p in load_principles(args) if 'position' in p)
+    fig = create_nested_cubes_visualization(
+        principles, {layer: layer in args.layers for layer in LAYERS},
+        exclusive_layer=args.exclusive, lod=True
+    )
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    if output.suffix.lower() in ('.html', '.htm'):
+        fig.write_html(str(output), include_plotlyjs='cdn' if args.cdn else True)
+    else:
+        fig.write_image(str(output))
+    print(f"Vue sauvegardée : {output} ({len(principles)} principes)")
+    return 0
+
+
+def build_parser():
+    """
+    Construit le parseur de la commande et de ses sous-commandes
+
+    Returns:
+        ArgumentParser
+    """
+    parser = argparse.ArgumentParser(
+        prog='transystor',
+        description="TranSysTor - Framework TSCP en ligne de commande"
+    )
+    parser.add_argument('--home', help="Répertoire de base (models/, exports/... ; "
+                                       "défaut : $TRANSYSTOR_HOME)")
+    parser.add_argument('--model-dir', help="Répertoire des modèles de couche")
+    parser.add_argument('-v', '--verbose', action='store_true', help="Journal détaillé")
+    subparsers = parser.add_subparsers(dest='command', metavar='COMMANDE')
+    subparsers.required = True
+
+    def add_command(name, func, help_text, principles=True):
+        command = subparsers.add_parser(name, help=help_text, description=help_text)
+        command.add_argument('-l', '--layers', type=_layers, default=LAYERS,
+                             help="Couches traitées, séparées par des virgules (défaut : toutes)")
+        if principles:
+            command.add_argument('-i', '--input',
+                                 help="Fichier d'état (.json ou .npz) au lieu des modèles")
+        command.set_defaults(func=func)
+        return command
+
+    add_command('validate', cmd_validate, "Valide les modèles contre les schémas JSON",
+                principles=False)
+
+    export = add_command('export', cmd_export, "Exporte en OWL, SHACL, RDFS, N-Triples...")
+    export.add_argument('-f', '--format', action='append', dest='formats',
+                        choices=('owl', 'shacl', 'rdfs', 'nt', 'nq'),
+                        help="Format exporté ; répétable (défaut : owl, shacl, rdfs)")
+    export.add_argument('-o', '--output', help="Répertoire parent du bundle "
+                                               "(défaut : exports/)")
+    export.add_argument('-n', '--name', default='tscp', help="Nom du modèle")
+
+    stats = add_command('stats', cmd_stats, "Statistiques et orthogonalité des principes")
+    stats.add_argument('--violations', action='store_true',
+                       help="Liste les paires trop proches (orthogonalité < 0.6)")
+    stats.add_argument('--json', action='store_true', help="Sortie JSON")
+
+    render = add_command('render', cmd_render, "Rend la vue 3D des cubes")
+    render.add_argument('-o', '--output', default='tscp_cubes.html',
+                        help="Fichier produit (.html, ou .png/.svg avec kaleido)")
+    render.add_argument('--exclusive', type=str.upper, choices=LAYERS,
+                        help="N'affiche que cette couche")
+    render.add_argument('--cdn', action='store_true',
+                        help="Charge plotly.js depuis un CDN (HTML plus léger)")
+
+    from transystor.cli import audit
+    audit.build_parser(subparsers.add_parser(
+        'audit', help="Audit du modèle par les assistants IA",
+        description="Pose les questions d'audit aux assistants IA en parallèle"
+    ))
+
+    return parser
+
+
+def main(argv=None):
+    """
+    Point d'entrée de la commande transystor
+
+    Args:
+        argv: Arguments (défaut : sys.argv[1:])
+
+    Returns:
+        Code de sortie
+    """
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format='%(message)s')
+
+    if args.home or args.model_dir:
+        from transystor.transystor_core import configure_paths
+        configure_paths(base_dir=args.home, model_dir=args.model_dir)
+
+    try:
+        return args.func(args)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,249 @@
+"""
+TranSysTor Core - Format binaire des modèles
+Sérialisation .npz colonnaire des modèles de couches (positions en
+tableaux, autres champs en tampons JSON UTF-8 avec offsets)
+"""
+
+import json
+import os
+from json.encoder import encode_basestring
+from pathlib import Path
+
+import numpy as np
+
+# Identification et version du conteneur binaire (distincte de la
+# version du modèle, 'version' : '0.2.0', conservée dans l'en-tête)
+FORMAT_NAME = 'tscp-npz'
+FORMAT_VERSION = 1
+DEFAULT_MODEL_VERSION = '0.2.0'
+
+# Marqueur des champs absents d'un enregistrement
+_MISSING = object()
+
+
+def _is_vec3(value):
+    return (isinstance(value, (list, tuple)) and len(value) == 3
+            and all(isinstance(c, (int, float)) and not isinstance(c, bool) for c in value))
+
+
+def _field_kind(values):
+    """Détermine l'encodage d'un champ : 'vec3' ou 'json'"""
+    if all(_is_vec3(v) for v in values):
+        return 'vec3'
+    return 'json'
+
+
+def _encode_json_column(values):
+    """
+    Encode une colonne en tableau JSON UTF-8 avec les offsets de chaque
+    élément : décodage complet en un seul json.loads, ou élément par
+    élément (data[offsets[i]:offsets[i + 1] - 1])
+
+    Returns:
+        Tuple (tampon uint8, offsets int64 (n+1,))
+    """
+    # encode_basestring (C) évite le coût de json.dumps pour les chaînes
+    encoded = [
+        (encode_basestring(v) if isinstance(v, str) else json.dumps(v, ensure_ascii=False)).encode('utf-8')
+        for v in values
+    ]
+    offsets = np.ones(len(encoded) + 1, dtype=np.int64)
+    # Chaque élément est suivi d'une virgule (ou du ']' final)
+    np.cumsum([len(b) + 1 for b in encoded], out=offsets[1:])
+    offsets[1:] += 1
+    data = b'[' + b','.join(encoded) + b']'
+    return np.frombuffer(data, dtype=np.uint8), offsets
+
+
+def _encode_collection(name, records, arrays):
+    """
+    Range une liste de dicts en colonnes dans arrays
+
+    Returns:
+        Description de la collection pour l'en-tête
+    """
+    fields = []
+    for record in records:
+        for key in record:
+            if key not in fields:
+                fields.append(key)
+
+    n = len(records)
+    columns = {}
+    for field in fields:
+        present = np.array([field in r for r in records], dtype=bool)
+        values = [r[field] for r in records if field in r]
+        kind = _field_kind(values)
+        prefix = f"{name}/{field}"
+
+        if not present.all():
+            arrays[f"{prefix}.present"] = present
+
+        if kind == 'vec3':
+            column = np.full((n, 3), np.nan)
+            column[present] = values
+            arrays[prefix] = column
+            # Composantes entières : restituées en int (même JSON qu'avant)
+            is_int = np.zeros((n, 3), dtype=bool)
+            is_int[present] = [[isinstance(c, int) for c in v] for v in values]
+            if is_int.any():
+                arrays[f"{prefix}.int"] = is_int
+        else:
+            # Une entrée par enregistrement (null si absent)
+            full = iter(values)
+            data, offsets = _encode_json_column([next(full) if p else None for p in present])
+            arrays[f"{prefix}.data"] = data
+            arrays[f"{prefix}.offsets"] = offsets
+
+        columns[field] = kind
+
+    return {'count': n, 'fields': columns}
+
+
+def encode_model(model):
+    """
+    Encode un modèle en tableaux NumPy
+
+    Les listes de dicts (principes, métaclasses...) sont rangées en
+    colonnes : positions [I, J, K] en tableaux (n, 3), autres champs en
+    tableaux JSON indexés ; les autres valeurs vont dans l'en-tête JSON.
+
+    Args:
+        model: Dict du modèle (format des fichiers models/tscp/*.json)
+
+    Returns:
+        Dict nom -> tableau, dont 'header' (JSON UTF-8)
+    """
+    arrays = {}
+    header = {
+        'format': FORMAT_NAME,
+        'format_version': FORMAT_VERSION,
+        'version': model.get('version', DEFAULT_MODEL_VERSION),
+        'keys': list(model),
+        'values': {},
+        'collections': {}
+    }
+
+    for key, value in model.items():
+        if isinstance(value, list) and value and all(isinstance(v, dict) for v in value):
+            header['collections'][key] = _encode_collection(key, value, arrays)
+        else:
+            header['values'][key] = value
+
+    arrays['header'] = np.frombuffer(json.dumps(header, ensure_ascii=False).encode('utf-8'),
+                                     dtype=np.uint8)
+    return arrays
+
+
+def _decode_column(arrays, prefix, kind):
+    """Décode une colonne en liste de valeurs (None si absente)"""
+    present = arrays.get(f"{prefix}.present")
+
+    if kind == 'vec3':
+        column = np.asarray(arrays[prefix])
+        values = column.tolist()
+        is_int = arrays.get(f"{prefix}.int")
+        if is_int is not None:
+            for row, col in zip(*np.nonzero(np.asarray(is_int))):
+                values[row][col] = int(values[row][col])
+    else:
+        values = json.loads(bytes(np.asarray(arrays[f"{prefix}.data"])))
+
+    if present is not None:
+        values = [v if p else _MISSING for v, p in zip(values, np.asarray(present).tolist())]
+    return values
+
+
+def read_header(arrays):
+    """Décode l'en-tête d'un conteneur et vérifie son format"""
+    header = json.loads(bytes(np.asarray(arrays['header'])).decode('utf-8'))
+    if header.get('format') != FORMAT_NAME:
+        raise ValueError(f"Format binaire inconnu: {header.get('format')}")
+    if header.get('format_version', 0) > FORMAT_VERSION:
+        raise ValueError(f"Version de format non supportée: {header['format_version']}")
+    return header
+
+
+def decode_model(arrays):
+    """
+    Reconstruit le dict d'un modèle depuis ses tableaux
+
+    Args:
+        arrays: Mapping nom -> tableau (ex: résultat de np.load)
+
+    Returns:
+        Dict du modèle, identique au JSON d'origine
+    """
+    header = read_header(arrays)
+    model = {}
+
+    for key in header['keys']:
+        if key in header['values']:
+            model[key] = header['values'][key]
+            continue
+
+        collection = header['collections'][key]
+        n = collection['count']
+        columns = {
+            field: _decode_column(arrays, f"{key}/{field}", kind)
+            for field, kind in collection['fields'].items()
+        }
+        fields = list(columns)
+        rows = zip(*columns.values()) if fields else ([] for _ in range(n))
+        if any(f"{key}/{field}.present" in arrays for field in fields):
+            model[key] = [
+                {field: value for field, value in zip(fields, row) if value is not _MISSING}
+                for row in rows
+            ]
+        else:
+            model[key] = [dict(zip(fields, row)) for row in rows]
+
+    return model
+
+
+def save_binary(model, path):
+    """
+    Sauvegarde un modèle au format .npz (non compressé : lecture limitée
+    par les E/S, tableaux projetables en mémoire)
+
+    Args:
+        model: Dict du modèle ou LazyModel
+        path: Chemin du fichier .npz
+
+    Returns:
+        Path du fichier écrit
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    # LazyModel (lazy.open_binary) : enregistrements décodés pour l'encodage
+    lazy = model if hasattr(model, 'detach') else None
+    if lazy is not None:
+        model = lazy.to_dict()
+
+    # Écriture atomique : un lecteur ne voit jamais de fichier partiel
+    tmp = path.with_name(f".{path.name}.tmp")
+    with open(tmp, 'wb') as f:
+        np.savez(f, **encode_model(model))
+
+    # Un LazyModel projeté garde son fichier ouvert (os.replace échoue
+    # alors sous Windows) : ses tableaux sont copiés avant le remplacement
+    if lazy is not None:
+        lazy.detach()
+    os.replace(tmp, path)
+    return path
+
+
+def load_binary(path):
+    """
+    Charge un modèle depuis un fichier .npz
+
+    Args:
+        path: Chemin du fichier .npz
+
+    Returns:
+        Dict du modèle
+    """
+    with np.load(path, allow_pickle=False) as arrays:
+        return decode_model(arrays)
+
@@ -0,0 +1,71 @@
+"""
+TranSysTor Core - Cache LRU
+Cache LRU borné partagé par la visualisation et l'assistant
+"""
+
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Cache LRU borné avec compteurs de succès/échecs"""
+
+    def __init__(self, maxsize=32):
+        """
+        Args:
+            maxsize: Nombre maximal d'entrées conservées
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, default=None):
+        """Retourne une entrée et la marque comme récemment utilisée"""
+        if key not in self._entries:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return self._entries[key]
+
+    def put(self, key, value):
+        """Ajoute une entrée et évince les moins récemment utilisées"""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def get_or_build(self, key, builder):
+        """
+        Retourne l'entrée en cache ou la construit
+
+        Args:
+            key: Clé hashable
+            builder: Fonction sans argument produisant la valeur
+
+        Returns:
+            Valeur en cache
+        """
+        if key in self._entries:
+            return self.get(key)
+        self.misses += 1
+        value = builder()
+        self.put(key, value)
+        return value
+
+    def clear(self):
+        """Vide le cache et remet les compteurs à zéro"""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        """Retourne les statistiques du cache"""
+        return {'size': len(self), 'maxsize': self.maxsize,
+                'hits': self.hits, 'misses': self.misses}
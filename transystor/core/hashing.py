@@ -0,0 +1,39 @@
+"""
+TranSysTor Core - Empreintes
+Empreintes de contenu stables pour les principes (clés de cache)
+"""
+
+import hashlib
+import json
+
+
+def principle_fingerprint(principle):
+    """
+    Calcule l'empreinte d'un principe
+
+    Args:
+        principle: Dict du principe
+
+    Returns:
+        Empreinte hexadécimale (SHA-1 du JSON canonique)
+    """
+    payload = json.dumps(dict(principle), sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def principles_fingerprint(principles):
+    """
+    Calcule l'empreinte d'une liste de principes (l'ordre compte)
+
+    Args:
+        principles: Liste des principes
+
+    Returns:
+        Empreinte hexadécimale
+    """
+    digest = hashlib.sha1()
+    for p in principles:
+        payload = json.dumps(dict(p), sort_keys=True, ensure_ascii=False, default=str)
+        digest.update(payload.encode('utf-8'))
+        digest.update(b'\n')
+    return digest.hexdigest()
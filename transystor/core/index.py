@@ -0,0 +1,214 @@
+"""
+TranSysTor Core - Index des principes
+Recherches O(1) par nom, couche, cellule [I, J, K] du réseau et type
+"""
+
+import logging
+import math
+
+logger = logging.getLogger(__name__)
+
+
+def cell_of(position):
+    """
+    Retourne la cellule entière [I, J, K] contenant une position
+
+    Les cellules sont centrées sur les coordonnées entières du réseau des
+    cubes (arrondi au plus proche, demi-entiers vers le haut).
+
+    Args:
+        position: Position [I, J, K]
+
+    Returns:
+        Tuple d'entiers (i, j, k)
+    """
+    return tuple(math.floor(c + 0.5) for c in position[:3])
+
+
+class PrincipleIndex:
+    """
+    Index persistant d'un ensemble de principes
+
+    Chaque mutation (add, remove, update) ne met à jour que les entrées
+    concernées ; les recherches par nom, couche, cellule et type sont en
+    O(1) au lieu de parcours linéaires de la liste.
+
+    Un nom déjà indexé n'est pas réindexé : la première définition reste
+    celle des recherches, les suivantes sont signalées (journal et
+    duplicates). En mode strict, un doublon lève KeyError.
+    """
+
+    def __init__(self, principles=(), strict=False):
+        """
+        Args:
+            principles: Liste initiale des principes
+            strict: Lève KeyError sur un nom en double (validation)
+        """
+        self.strict = strict
+        # Principes ignorés car leur nom était déjà indexé
+        self.duplicates = []
+        self._by_name = {}
+        self._by_layer = {}
+        self._by_cell = {}
+        self._by_type = {}
+        # Clés (couche, type, cellule) sous lesquelles chaque principe est rangé
+        self._keys = {}
+
+        for p in principles:
+            self.add(p)
+
+    def __len__(self):
+        return len(self._by_name)
+
+    def __contains__(self, name):
+        return name in self._by_name
+
+    def __iter__(self):
+        return iter(self._by_name.values())
+
+    @staticmethod
+    def _index_keys(principle):
+        cell = cell_of(principle['position']) if 'position' in principle else None
+        return principle.get('layer'), principle.get('type'), cell
+
+    @staticmethod
+    def _bucket_add(buckets, key, principle):
+        buckets.setdefault(key, {})[principle['name']] = principle
+
+    @staticmethod
+    def _bucket_remove(buckets, key, name):
+        bucket = buckets.get(key)
+        if bucket is not None:
+            bucket.pop(name, None)
+            if not bucket:
+                del buckets[key]
+
+    def add(self, principle):
+        """
+        Indexe un principe
+
+        Args:
+            principle: Dict du principe
+
+        Raises:
+            KeyError: En mode strict, si le nom est déjà indexé
+        """
+        name = principle['name']
+        if name in self._by_name:
+            if self.strict:
+                raise KeyError(f"Principe déjà indexé: {name}")
+            logger.warning(f"Principe en double ignoré par l'index: {name}")
+            self.duplicates.append(principle)
+            return
+
+        layer, principle_type, cell = self._keys[name] = self._index_keys(principle)
+
+        self._by_name[name] = principle
+        self._bucket_add(self._by_layer, layer, principle)
+        self._bucket_add(self._by_type, principle_type, principle)
+        if cell is not None:
+            self._bucket_add(self._by_cell, cell, principle)
+
+    def remove(self, name):
+        """
+        Retire un principe de l'index
+
+        Args:
+            name: Nom du principe
+
+        Returns:
+            Dict du principe retiré
+        """
+        principle = self._by_name.pop(name)
+        layer, principle_type, cell = self._keys.pop(name)
+
+        self._bucket_remove(self._by_layer, layer, name)
+        self._bucket_remove(self._by_type, principle_type, name)
+        if cell is not None:
+            self._bucket_remove(self._by_cell, cell, name)
+
+        return principle
+
+    def update(self, name, principle):
+        """
+        Remplace un principe (déplacement, édition ou renommage)
+
+        Args:
+            name: Nom actuel du principe
+            principle: Nouveau dict du principe
+        """
+        self.remove(name)
+        self.add(principle)
+
+    def sync(self, principles):
+        """
+        Aligne l'index sur une liste de principes en ne réindexant que les
+        principes ajoutés, modifiés ou retirés
+
+        Args:
+            principles: Liste courante des principes
+        """
+        # Premier principe de chaque nom, comme à la construction
+        current = {}
+        for p in principles:
+            current.setdefault(p['name'], p)
+
+        for name in [name for name in self._by_name if name not in current]:
+            self.remove(name)
+
+        for name, principle in current.items():
+            indexed = self._by_name.get(name)
+            if indexed is None:
+                self.add(principle)
+            elif indexed is not principle:
+                self.update(name, principle)
+            elif self._keys[name] != self._index_keys(principle):
+                # Dict modifié sur place : ses clés d'index ont changé
+                self.update(name, principle)
+
+    def get(self, name, default=None):
+        """Retourne un principe par son nom"""
+        return self._by_name.get(name, default)
+
+    def by_layer(self, layer):
+        """Retourne la liste des principes d'une couche"""
+        return list(self._by_layer.get(layer, {}).values())
+
+    def layer_counts(self):
+        """Retourne le dict couche -> nombre de principes"""
+        return {layer: len(bucket) for layer, bucket in self._by_layer.items()}
+
+    def at_cell(self, cell):
+        """
+        Retourne les principes d'une cellule du réseau
+
+        Args:
+            cell: Cellule (i, j, k) ou position [I, J, K]
+
+        Returns:
+            Liste des principes de la cellule
+        """
+        return list(self._by_cell.get(cell_of(cell), {}).values())
+
+    def by_type(self, principle_type):
+        """Retourne la liste des principes d'un type"""
+        return list(self._by_type.get(principle_type, {}).values())
+
+    def resolve(self, reference):
+        """
+        Résout une référence textuelle vers un principe
+
+        Les références des champs derives s'écrivent 'Nom ⊂ CMx' ; le nom
+        complet est essayé, puis la partie avant '⊂', puis le premier mot.
+
+        Args:
+            reference: Référence (ex: 'Interface ⊂ CM1')
+
+        Returns:
+            Dict du principe ou None
+        """
+        candidates = [reference, reference.split('⊂')[0].strip()] + reference.split()[:1]
+        for candidate in candidates:
+            if candidate in self._by_name:
+                return self._by_name[candidate]
+        return None
@@ -0,0 +1,366 @@
+"""
+TranSysTor Core - Journal des modifications
+Journal en ajout seul (add, move, edit, delete) avec compactage
+périodique en instantané, rejeu au démarrage et annulation
+"""
+
+import copy
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+
+# Import relatif ou absolu
+try:
+    from transystor.core.binary import load_binary, save_binary
+except ImportError:
+    from core.binary import load_binary, save_binary
+
+# Nombre d'entrées du journal au-delà duquel un instantané est écrit
+DEFAULT_COMPACT_EVERY = 1000
+
+# Entrées déjà intégrées à l'instantané conservées pour l'annulation
+DEFAULT_HISTORY_SIZE = 100
+
+
+class ModelJournal:
+    """
+    État des principes persisté par journal
+
+    Chaque modification est ajoutée au fichier <nom>_journal.jsonl sous
+    forme d'une ligne JSON (coût proportionnel à la modification, pas au
+    modèle). Toutes les compact_every entrées, l'état complet est écrit
+    dans <nom>_snapshot.npz et le journal est réduit à ses history_size
+    dernières entrées. Au chargement, l'instantané est relu puis les
+    entrées postérieures du journal rejouées.
+
+    Chaque entrée garde l'état antérieur de ce qu'elle modifie : undo()
+    ajoute l'opération inverse au journal.
+    """
+
+    def __init__(self, directory, name="tscp", compact_every=DEFAULT_COMPACT_EVERY,
+                 history_size=DEFAULT_HISTORY_SIZE, fsync=False):
+        """
+        Args:
+            directory: Répertoire du journal et de l'instantané
+            name: Préfixe des fichiers
+            compact_every: Nombre d'entrées avant compactage (None : jamais)
+            history_size: Entrées gardées au compactage pour undo()
+            fsync: Force l'écriture sur disque à chaque entrée
+        """
+        self.directory = Path(directory)
+        self.journal_path = self.directory / f"{name}_journal.jsonl"
+        self.snapshot_path = self.directory / f"{name}_snapshot.npz"
+        self.compact_every = compact_every
+        self.history_size = history_size
+        self.fsync = fsync
+
+        self.principles = []
+        self.settings = {}
+        self._rows = {}
+        self._seq = 0
+        self._pending = 0
+        # Entrées annulables (les plus récentes en fin de liste)
+        self._undo = []
+        # Lignes en attente d'écriture (None hors d'un lot)
+        self._batch = None
+
+        self.replay()
+
+    def replay(self):
+        """
+        Recharge l'état : instantané puis entrées postérieures du journal
+
+        Une dernière ligne tronquée (arrêt pendant une écriture) est
+        retirée du fichier.
+        """
+        self.principles, self.settings = [], {}
+        self._seq, self._pending, self._undo = 0, 0, []
+
+        if self.snapshot_path.exists():
+            snapshot = load_binary(self.snapshot_path)
+            self.principles = snapshot.get('principles', [])
+            self.settings = snapshot.get('settings', {})
+            self._seq = snapshot.get('seq', 0)
+        self._reindex()
+
+        snapshot_seq = self._seq
+        for entry in self.entries(repair=True):
+            if entry['seq'] > snapshot_seq:
+                self._apply(entry)
+                self._seq = entry['seq']
+                self._pending += 1
+            self._track_undo(entry)
+
+    def entries(self, repair=False):
+        """
+        Itère sur les entrées du journal
+
+        Args:
+            repair: Tronque le fichier après la dernière entrée complète
+
+        Yields:
+            Dicts des entrées, dans l'ordre d'écriture
+        """
+        if not self.journal_path.exists():
+            return
+
+        valid = 0
+        with open(self.journal_path, 'rb') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    break
+                if not line.endswith(b'\n'):
+                    break
+                valid += len(line)
+                yield entry
+
+        if repair and valid < self.journal_path.stat().st_size:
+            # Entrée tronquée : les écritures suivantes repartent de la
+            # dernière entrée complète
+            with open(self.journal_path, 'r+b') as f:
+                f.truncate(valid)
+
+    def _append(self, entry):
+        """Applique une entrée puis l'ajoute au journal"""
+        self._apply(entry)
+
+        self._seq += 1
+        entry = dict(entry, seq=self._seq)
+        line = json.dumps(entry, ensure_ascii=False) + '\n'
+
+        if self._batch is not None:
+            self._batch.append(line)
+        else:
+            self._write([line])
+        return entry
+
+    @contextmanager
+    def batch(self):
+        """
+        Regroupe les entrées d'un bloc en une seule écriture (et au plus
+        un compactage)
+        """
+        if self._batch is not None:
+            yield self
+            return
+
+        self._batch = []
+        try:
+            yield self
+        finally:
+            lines, self._batch = self._batch, None
+            if lines:
+                self._write(lines)
+
+    def _write(self, lines):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.journal_path, 'a', encoding='utf-8') as f:
+            f.writelines(lines)
+            if self.fsync:
+                f.flush()
+                os.fsync(f.fileno())
+
+        self._pending += len(lines)
+        if self.compact_every and self._pending >= self.compact_every:
+            self.compact()
+
+    def compact(self):
+        """
+        Écrit l'état courant en instantané et vide le journal
+
+        L'instantané porte le numéro de la dernière entrée intégrée : un
+        arrêt entre les deux écritures ne rejoue aucune entrée deux fois.
+        Les history_size dernières entrées restent dans le journal pour
+        undo() (elles ne sont pas rejouées).
+
+        Returns:
+            Path de l'instantané
+        """
+        save_binary({
+            'version': '0.2.0',
+            'seq': self._seq,
+            'settings': self.settings,
+            'principles': self.principles
+        }, self.snapshot_path)
+
+        kept = []
+        if self.history_size and self.journal_path.exists():
+            with open(self.journal_path, 'rb') as f:
+                kept = f.readlines()[-self.history_size:]
+
+        tmp = self.journal_path.with_name(f".{self.journal_path.name}.tmp")
+        with open(tmp, 'wb') as f:
+            f.writelines(kept)
+        os.replace(tmp, self.journal_path)
+
+        self._pending = 0
+        return self.snapshot_path
+
+    def _reindex(self):
+        self._rows = {p['name']: i for i, p in enumerate(self.principles)}
+
+    def _apply(self, entry):
+        """Applique une entrée à l'état en mémoire"""
+        op = entry['op']
+
+        if op == 'add':
+            index = entry.get('index', len(self.principles))
+            self.principles.insert(index, copy.deepcopy(entry['principle']))
+            if index == len(self.principles) - 1:
+                self._rows[entry['principle']['name']] = index
+            else:
+                self._reindex()
+        elif op == 'move':
+            principle = self.principles[self._rows[entry['name']]]
+            if entry['position'] is None:
+                principle.pop('position', None)
+            else:
+                principle['position'] = list(entry['position'])
+        elif op == 'edit':
+            row = self._rows.pop(entry['name'])
+            self.principles[row] = copy.deepcopy(entry['principle'])
+            self._rows[entry['principle']['name']] = row
+        elif op == 'delete':
+            row = self._rows[entry['name']]
+            del self.principles[row]
+            if row == len(self.principles):
+                del self._rows[entry['name']]
+            else:
+                self._reindex()
+        elif op == 'settings':
+            self.settings.update(copy.deepcopy(entry['settings']))
+        else:
+            raise ValueError(f"Opération de journal inconnue: {op}")
+
+    def _track_undo(self, entry):
+        if 'undo' in entry:
+            undone = entry['undo']
+            self._undo = [e for e in self._undo if e['seq'] != undone]
+        else:
+            self._undo.append(entry)
+
+    def __len__(self):
+        return len(self.principles)
+
+    def __contains__(self, name):
+        return name in self._rows
+
+    def get(self, name, default=None):
+        """Retourne un principe par son nom"""
+        row = self._rows.get(name)
+        return self.principles[row] if row is not None else default
+
+    def _record(self, entry):
+        entry = self._append(entry)
+        self._track_undo(entry)
+        return entry
+
+    def add(self, principle):
+        """Ajoute un principe"""
+        if principle['name'] in self._rows:
+            raise KeyError(f"Principe déjà présent: {principle['name']}")
+        return self._record({'op': 'add', 'principle': principle})
+
+    def move(self, name, position):
+        """Déplace un principe"""
+        before = copy.deepcopy(self.principles[self._rows[name]].get('position'))
+        return self._record({'op': 'move', 'name': name, 'position': list(position),
+                             'before': before})
+
+    def edit(self, name, principle):
+        """Remplace un principe (renommage possible)"""
+        if principle['name'] != name and principle['name'] in self._rows:
+            raise KeyError(f"Principe déjà présent: {principle['name']}")
+        before = copy.deepcopy(self.principles[self._rows[name]])
+        return self._record({'op': 'edit', 'name': name, 'principle': principle,
+                             'before': before})
+
+    def delete(self, name):
+        """Supprime un principe"""
+        row = self._rows[name]
+        return self._record({'op': 'delete', 'name': name, 'index': row,
+                             'before': copy.deepcopy(self.principles[row])})
+
+    def update_settings(self, settings):
+        """Enregistre des réglages de l'IDE (langue, couches visibles...)"""
+        before = {key: self.settings.get(key) for key in settings}
+        return self._record({'op': 'settings', 'settings': settings, 'before': before})
+
+    def sync(self, principles, settings=None):
+        """
+        Journalise les différences entre l'état courant et une liste de
+        principes (ajouts, déplacements, éditions, suppressions)
+
+        Args:
+            principles: Liste courante des principes
+            settings: Réglages de l'IDE à enregistrer s'ils ont changé
+
+        Returns:
+            Nombre d'entrées ajoutées
+        """
+        start = self._seq
+        current = {p['name']: p for p in principles}
+
+        with self.batch():
+            for name in [name for name in self._rows if name not in current]:
+                self.delete(name)
+
+            for name, principle in current.items():
+                known = self.get(name)
+                if known is None:
+                    self.add(principle)
+                elif known != principle:
+                    moved_only = (
+                        {k: v for k, v in known.items() if k != 'position'}
+                        == {k: v for k, v in principle.items() if k != 'position'}
+                        and 'position' in principle
+                    )
+                    if moved_only:
+                        self.move(name, principle['position'])
+                    else:
+                        self.edit(name, principle)
+
+            if settings:
+                changed = {k: v for k, v in settings.items() if self.settings.get(k) != v}
+                if changed:
+                    self.update_settings(changed)
+
+        return self._seq - start
+
+    def undo(self):
+        """
+        Annule la dernière modification non annulée
+
+        Returns:
+            Entrée inverse ajoutée au journal, ou None s'il n'y a rien à annuler
+        """
+        if not self._undo:
+            return None
+
+        entry = self._undo.pop()
+        op = entry['op']
+
+        if op == 'add':
+            name = entry['principle']['name']
+            inverse = {'op': 'delete', 'name': name, 'index': self._rows[name],
+                       'before': copy.deepcopy(self.get(name))}
+        elif op == 'move':
+            inverse = {'op': 'move', 'name': entry['name'], 'position': entry['before'],
+                       'before': entry['position']}
+        elif op == 'edit':
+            inverse = {'op': 'edit', 'name': entry['principle']['name'],
+                       'principle': entry['before'], 'before': entry['principle']}
+        elif op == 'delete':
+            inverse = {'op': 'add', 'principle': entry['before'], 'index': entry['index']}
+        else:
+            inverse = {'op': 'settings', 'settings': entry['before'], 'before': entry['settings']}
+
+        inverse['undo'] = entry['seq']
+        return self._append(inverse)
+
+    def history(self):
+        """Retourne les entrées du journal (historique récent)"""
+        return list(self.entries())
@@ -0,0 +1,324 @@
+"""
+TranSysTor Core - Chargement paresseux des modèles binaires
+Projection en mémoire (np.memmap) des conteneurs .npz : positions
+disponibles immédiatement, champs texte décodés à la demande
+"""
+
+import json
+import struct
+import zipfile
+from collections.abc import Mapping, Sequence
+
+import numpy as np
+
+# Import relatif ou absolu
+try:
+    from transystor.core.binary import read_header
+    from transystor.core.store import DEFAULT_COLOR
+except ImportError:
+    from core.binary import read_header
+    from core.store import DEFAULT_COLOR
+
+# En-tête local d'une entrée zip : signature + 26 octets, puis les
+# longueurs du nom et du champ extra (octets 26 à 30)
+_ZIP_LOCAL_HEADER = struct.Struct('<4s22xHH')
+
+
+def _member_arrays(path):
+    """
+    Projette en mémoire chaque tableau d'un conteneur .npz non compressé
+
+    Args:
+        path: Chemin du fichier .npz
+
+    Returns:
+        Dict nom -> np.memmap en lecture seule
+    """
+    arrays = {}
+
+    with zipfile.ZipFile(path) as archive, open(path, 'rb') as f:
+        for info in archive.infolist():
+            if not info.filename.endswith('.npy'):
+                continue
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"Entrée compressée, projection impossible: {info.filename}")
+
+            f.seek(info.header_offset)
+            _, name_length, extra_length = _ZIP_LOCAL_HEADER.unpack(f.read(_ZIP_LOCAL_HEADER.size))
+            f.seek(info.header_offset + _ZIP_LOCAL_HEADER.size + name_length + extra_length)
+
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran, dtype = np.lib.format.read_array_header_2_0(f)
+
+            name = info.filename[:-len('.npy')]
+            if not np.prod(shape, dtype=np.int64):
+                # np.memmap refuse les tableaux vides
+                arrays[name] = np.zeros(shape, dtype=dtype)
+                continue
+
+            arrays[name] = np.memmap(path, dtype=dtype, mode='r', offset=f.tell(),
+                                     shape=shape, order='F' if fortran else 'C')
+
+    return arrays
+
+
+class LazyModel(Mapping):
+    """
+    Modèle binaire projeté en mémoire
+
+    Se comporte comme le dict du modèle : les valeurs simples viennent de
+    l'en-tête, les listes d'enregistrements sont des LazyCollection.
+
+    La projection garde le fichier ouvert tant que le modèle vit ; sous
+    Windows, il ne peut alors être ni remplacé ni supprimé. close() (ou
+    un bloc with) libère la projection, detach() copie d'abord les
+    tableaux en mémoire pour que le modèle reste utilisable.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path: Chemin du fichier .npz (écrit par binary.save_binary)
+        """
+        self.path = path
+        self._arrays = _member_arrays(path)
+        self.header = read_header(self._arrays)
+        self._collections = {}
+
+    def __getitem__(self, key):
+        if key in self.header['values']:
+            return self.header['values'][key]
+        if key not in self.header['collections']:
+            raise KeyError(key)
+        if key not in self._collections:
+            self._collections[key] = LazyCollection(
+                self._arrays, key, self.header['collections'][key],
+                default_layer=self.header['values'].get('layer')
+            )
+        return self._collections[key]
+
+    def __iter__(self):
+        return iter(self.header['keys'])
+
+    def __len__(self):
+        return len(self.header['keys'])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _release(self, copy):
+        mappings = []
+        for name, array in self._arrays.items():
+            if isinstance(array, np.memmap):
+                mappings.append(array._mmap)
+                self._arrays[name] = np.array(array) if copy else None
+        array = None
+
+        # Les tableaux projetés ne sont plus référencés : la projection se
+        # ferme, sauf si une vue obtenue auparavant est encore utilisée
+        # (elle reste alors valide et garde le fichier ouvert)
+        for mapping in mappings:
+            try:
+                mapping.close()
+            except BufferError:
+                pass
+
+    def detach(self):
+        """
+        Copie les tableaux en mémoire et libère la projection : le modèle
+        reste utilisable et son fichier peut être réécrit
+        """
+        self._release(copy=True)
+
+    def close(self):
+        """Libère la projection (le modèle n'est plus utilisable)"""
+        self._release(copy=False)
+        self._arrays.clear()
+        self._collections.clear()
+
+    def to_dict(self):
+        """Matérialise le modèle complet (équivalent à binary.load_binary)"""
+        return {key: list(value) if isinstance(value, LazyCollection) else value
+                for key, value in self.items()}
+
+
+class LazyCollection(Sequence):
+    """
+    Liste d'enregistrements projetée en mémoire
+
+    Les positions sont une vue np.memmap (n, 3) (NaN si absente) ; chaque
+    enregistrement n'est décodé qu'à l'accès. Expose la même interface de
+    tranches par couche que PrincipleStore (positions_view, names_view,
+    colors_of, layer), utilisée par la visualisation et l'orthogonalité.
+    """
+
+    def __init__(self, arrays, name, description, default_layer=None):
+        """
+        Args:
+            arrays: Dict nom -> tableau du conteneur
+            name: Nom de la collection
+            description: Description de la collection dans l'en-tête
+            default_layer: Couche des enregistrements sans champ 'layer'
+        """
+        self._arrays = arrays
+        self._prefix = name
+        self._count = description['count']
+        self._fields = description['fields']
+        self._default_layer = default_layer
+        self._columns = {}
+        self._objects = {}
+        self._layer_rows = None
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [self.record(i) for i in range(*row.indices(self._count))]
+        if row < 0:
+            row += self._count
+        if not 0 <= row < self._count:
+            raise IndexError(row)
+        return self.record(row)
+
+    def _array(self, field, suffix=''):
+        return self._arrays.get(f"{self._prefix}/{field}{suffix}")
+
+    def record(self, row):
+        """
+        Décode un enregistrement
+
+        Args:
+            row: Indice de l'enregistrement
+
+        Returns:
+            Dict de l'enregistrement (identique au JSON d'origine)
+        """
+        record = {}
+        for field, kind in self._fields.items():
+            present = self._array(field, '.present')
+            if present is not None and not present[row]:
+                continue
+
+            if kind == 'vec3':
+                value = self._array(field)[row].tolist()
+                is_int = self._array(field, '.int')
+                if is_int is not None:
+                    value = [int(c) if flag else c for c, flag in zip(value, is_int[row])]
+            else:
+                offsets = self._array(field, '.offsets')
+                start, end = int(offsets[row]), int(offsets[row + 1]) - 1
+                value = json.loads(self._array(field, '.data')[start:end].tobytes())
+
+            record[field] = value
+        return record
+
+    def column(self, field):
+        """
+        Retourne une colonne entière
+
+        Args:
+            field: Nom du champ
+
+        Returns:
+            Vue np.memmap (n, 3) pour les positions, sinon liste des
+            valeurs (None si absente) décodée en une fois puis gardée
+        """
+        if field not in self._fields:
+            return [None] * self._count
+        if self._fields[field] == 'vec3':
+            return self._array(field)
+
+        if field not in self._columns:
+            self._columns[field] = json.loads(self._array(field, '.data').tobytes())
+        return self._columns[field]
+
+    @property
+    def positions(self):
+        """Positions (n, 3) projetées en mémoire, NaN si absentes"""
+        if self._fields.get('position') == 'vec3':
+            return self._array('position')
+        return np.full((self._count, 3), np.nan)
+
+    def _object_column(self, field, default=None):
+        """Colonne décodée sous forme de tableau d'objets (gardé)"""
+        if field not in self._objects:
+            values = np.empty(self._count, dtype=object)
+            values[:] = [default if v is None else v for v in self.column(field)]
+            self._objects[field] = values
+        return self._objects[field]
+
+    @property
+    def names(self):
+        """Noms des enregistrements (tableau d'objets)"""
+        return self._object_column('name')
+
+    def _rows_of(self, layer):
+        """Lignes d'une couche (tranche si elles sont contiguës)"""
+        if self._layer_rows is None:
+            layers = self._object_column('layer', self._default_layer)
+            self._layer_rows = {}
+            for value in dict.fromkeys(layers.tolist()):
+                rows = np.flatnonzero(layers == value)
+                if rows[-1] - rows[0] + 1 == len(rows):
+                    rows = slice(int(rows[0]), int(rows[-1]) + 1)
+                self._layer_rows[value] = rows
+        return self._layer_rows.get(layer, slice(0, 0))
+
+    def count(self, layer):
+        """Retourne le nombre d'enregistrements d'une couche"""
+        return len(self._row_indices(layer))
+
+    def _row_indices(self, layer):
+        rows = self._rows_of(layer)
+        return range(self._count)[rows] if isinstance(rows, slice) else rows
+
+    def positions_view(self, layer):
+        """Positions d'une couche (sans copie si ses lignes sont contiguës)"""
+        return self.positions[self._rows_of(layer)]
+
+    def names_view(self, layer):
+        """Noms d'une couche"""
+        return self.names[self._rows_of(layer)]
+
+    def colors_of(self, layer, default=DEFAULT_COLOR):
+        """Couleurs d'une couche (default si absente)"""
+        colors = self._object_column('color')[self._rows_of(layer)]
+        return np.where(np.equal(colors, None), default, colors)
+
+    def layer(self, layer):
+        """Retourne une séquence paresseuse des enregistrements d'une couche"""
+        return LazyRows(self, self._row_indices(layer))
+
+
+class LazyRows(Sequence):
+    """Séquence paresseuse d'un sous-ensemble de lignes d'une LazyCollection"""
+
+    def __init__(self, collection, rows):
+        self._collection = collection
+        self._rows = rows
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __getitem__(self, index):
+        return self._collection.record(int(self._rows[index]))
+
+
+def open_binary(path):
+    """
+    Ouvre un modèle binaire sans le décoder
+
+    Args:
+        path: Chemin du fichier .npz
+
+    Returns:
+        LazyModel
+    """
+    return LazyModel(path)
@@ -0,0 +1,308 @@
+"""
+TranSysTor Core - Stockage colonnaire des principes
+Positions, couches, noms et couleurs en tableaux NumPy compacts
+"""
+
+import sys
+from collections.abc import Sequence
+
+import numpy as np
+
+# Couches connues, dans l'ordre de rangement du stockage
+LAYERS = ('CM0', 'CM1', 'CM2', 'CM3')
+LAYER_CODES = {layer: code for code, layer in enumerate(LAYERS)}
+
+# Champs stockés en colonnes (les autres sont conservés de façon creuse)
+COLUMN_FIELDS = ('name', 'layer', 'position', 'color')
+
+DEFAULT_COLOR = '#000000'
+
+
+def _int_flags(position):
+    """Coordonnées entières d'une position (restituées en int)"""
+    return [isinstance(c, int) and not isinstance(c, bool) for c in position[:3]]
+
+
+class PrincipleStore:
+    """
+    Stockage colonnaire d'un ensemble de principes
+
+    Les lignes sont rangées par couche (ordre stable à l'intérieur d'une
+    couche) : positions_view(layer) est ainsi une simple tranche, sans
+    copie. L'itération et l'indexation suivent l'ordre d'insertion et
+    produisent les dicts d'origine (positions entières comprises) : le
+    stockage remplace une liste de principes (viz, export, orthogonalité).
+    """
+
+    def __init__(self, principles=()):
+        """
+        Args:
+            principles: Liste de dicts de principes
+        """
+        principles = list(principles)
+        codes = np.array([self._layer_code(p.get('layer', 'CM1')) for p in principles],
+                         dtype=np.int8)
+        order = np.argsort(codes, kind='stable')
+
+        self._palette = []
+        self._palette_codes = {}
+        self._extras = {}
+
+        self.layers = codes[order]
+        self.positions = np.full((len(principles), 3), np.nan)
+        self.names = np.empty(len(principles), dtype=object)
+        self.colors = np.empty(len(principles), dtype=np.uint32)
+        self.integral = np.zeros((len(principles), 3), dtype=bool)
+        # Identifiant stable de chaque ligne, croissant dans l'ordre d'insertion
+        self.ids = order.astype(np.int64)
+        self._next_id = len(principles)
+        self._sequence = None
+
+        for row, index in enumerate(order):
+            p = principles[index]
+            self._fill_row(row, p)
+
+        self._update_offsets()
+
+    @staticmethod
+    def _layer_code(layer):
+        if layer not in LAYER_CODES:
+            raise ValueError(f"Couche inconnue: {layer}")
+        return LAYER_CODES[layer]
+
+    def _color_code(self, color):
+        """Retourne le code d'une couleur (palette internée, None si absente)"""
+        if color is not None:
+            color = sys.intern(str(color))
+        if color not in self._palette_codes:
+            self._palette_codes[color] = len(self._palette)
+            self._palette.append(color)
+        return self._palette_codes[color]
+
+    def _fill_row(self, row, p):
+        if 'position' in p:
+            self.positions[row] = p['position'][:3]
+            self.integral[row] = _int_flags(p['position'])
+        self.names[row] = sys.intern(str(p['name']))
+        self.colors[row] = self._color_code(p.get('color'))
+
+        # Champs optionnels : stockage creux indexé par identifiant stable
+        extras = {key: value for key, value in p.items() if key not in COLUMN_FIELDS}
+        if extras:
+            self._extras[int(self.ids[row])] = extras
+        else:
+            self._extras.pop(int(self.ids[row]), None)
+
+    def _update_offsets(self):
+        # Début de chaque couche (les lignes sont triées par code)
+        self._offsets = np.searchsorted(self.layers, np.arange(len(LAYERS) + 1))
+
+    @classmethod
+    def from_principles(cls, principles):
+        """Construit un stockage depuis une liste de principes"""
+        return cls(principles)
+
+    @property
+    def palette(self):
+        """Couleurs distinctes (indexées par les codes de colors ; None : absente)"""
+        return tuple(self._palette)
+
+    @property
+    def sequence(self):
+        """Lignes dans l'ordre d'insertion des principes"""
+        if self._sequence is None:
+            self._sequence = np.argsort(self.ids, kind='stable')
+        return self._sequence
+
+    def __len__(self):
+        return len(self.names)
+
+    def __iter__(self):
+        for row in self.sequence:
+            yield self.record(row)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.record(row) for row in self.sequence[index]]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self.record(self.sequence[index])
+
+    def record(self, row):
+        """
+        Reconstruit le dict d'un principe
+
+        Args:
+            row: Indice de ligne
+
+        Returns:
+            Dict au format des listes de principes
+        """
+        name = self.names[row]
+        record = {'name': name, 'layer': LAYERS[self.layers[row]]}
+
+        position = self.positions[row]
+        if not np.isnan(position).any():
+            record['position'] = [int(c) if flag else c
+                                  for c, flag in zip(position.tolist(), self.integral[row])]
+
+        color = self._palette[self.colors[row]]
+        if color is not None:
+            record['color'] = color
+        record.update(self._extras.get(int(self.ids[row]), {}))
+        return record
+
+    def to_list(self):
+        """Retourne la liste des principes (ordre d'insertion) sous forme de dicts"""
+        return list(self)
+
+    def layer_slice(self, layer):
+        """Retourne la tranche de lignes d'une couche"""
+        code = self._layer_code(layer)
+        return slice(int(self._offsets[code]), int(self._offsets[code + 1]))
+
+    def layer_index(self):
+        """Retourne le dict couche -> tranche de lignes"""
+        return {layer: self.layer_slice(layer) for layer in LAYERS}
+
+    def count(self, layer):
+        """Retourne le nombre de principes d'une couche"""
+        sl = self.layer_slice(layer)
+        return sl.stop - sl.start
+
+    def positions_view(self, layer):
+        """
+        Retourne les positions d'une couche sans copie
+
+        Args:
+            layer: Nom de la couche
+
+        Returns:
+            Vue (k, 3) sur le tableau des positions
+        """
+        return self.positions[self.layer_slice(layer)]
+
+    def names_view(self, layer):
+        """Retourne les noms d'une couche sans copie"""
+        return self.names[self.layer_slice(layer)]
+
+    def colors_of(self, layer, default=DEFAULT_COLOR):
+        """Retourne les couleurs d'une couche (default si absente)"""
+        palette = np.array([default if c is None else c for c in self._palette],
+                           dtype=object)
+        return palette[self.colors[self.layer_slice(layer)]]
+
+    def iter_layer(self, layer):
+        """Itère sur les dicts des principes d'une couche"""
+        sl = self.layer_slice(layer)
+        for row in range(sl.start, sl.stop):
+            yield self.record(row)
+
+    def layer(self, layer):
+        """Retourne une séquence paresseuse des principes d'une couche"""
+        return LayerView(self, self.layer_slice(layer))
+
+    def find(self, name):
+        """
+        Retourne la ligne d'un principe (recherche linéaire)
+
+        Args:
+            name: Nom du principe
+
+        Returns:
+            Indice de ligne
+        """
+        rows = np.flatnonzero(self.names == name)
+        if not len(rows):
+            raise KeyError(name)
+        return int(rows[0])
+
+    def append(self, principle):
+        """
+        Ajoute un principe en fin de sa couche
+
+        Args:
+            principle: Dict du principe
+
+        Returns:
+            Indice de ligne du principe ajouté
+        """
+        self._next_id += 1
+        return self._insert(principle, self._next_id - 1)
+
+    def _insert(self, principle, ident):
+        code = self._layer_code(principle.get('layer', 'CM1'))
+        row = int(self._offsets[code + 1])
+
+        self.layers = np.insert(self.layers, row, code)
+        self.positions = np.insert(self.positions, row, np.nan, axis=0)
+        self.names = np.insert(self.names, row, None)
+        self.colors = np.insert(self.colors, row, 0)
+        self.integral = np.insert(self.integral, row, False, axis=0)
+        self.ids = np.insert(self.ids, row, ident)
+        self._sequence = None
+
+        self._fill_row(row, principle)
+        self._update_offsets()
+        return row
+
+    def remove(self, row):
+        """
+        Retire un principe
+
+        Args:
+            row: Indice de ligne
+        """
+        self._extras.pop(int(self.ids[row]), None)
+
+        self.layers = np.delete(self.layers, row)
+        self.positions = np.delete(self.positions, row, axis=0)
+        self.names = np.delete(self.names, row)
+        self.colors = np.delete(self.colors, row)
+        self.integral = np.delete(self.integral, row, axis=0)
+        self.ids = np.delete(self.ids, row)
+        self._sequence = None
+        self._update_offsets()
+
+    def set_position(self, row, position):
+        """Déplace un principe (même couche)"""
+        self.positions[row] = position[:3]
+        self.integral[row] = _int_flags(position)
+
+    def update(self, row, principle):
+        """
+        Remplace un principe (sa couche peut changer ; sa place dans
+        l'ordre d'insertion est conservée)
+
+        Args:
+            row: Indice de ligne
+            principle: Nouveau dict du principe
+
+        Returns:
+            Nouvel indice de ligne
+        """
+        if self._layer_code(principle.get('layer', 'CM1')) == self.layers[row]:
+            self.positions[row] = np.nan
+            self.integral[row] = False
+            self._fill_row(row, principle)
+            return row
+
+        ident = int(self.ids[row])
+        self.remove(row)
+        return self._insert(principle, ident)
+
+
+class LayerView(Sequence):
+    """Séquence paresseuse des dicts d'une tranche de PrincipleStore"""
+
+    def __init__(self, store, rows):
+        self._store = store
+        self._rows = range(rows.start, rows.stop)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __getitem__(self, index):
+        return self._store.record(self._rows[index])
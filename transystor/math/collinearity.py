@@ -0,0 +1,218 @@
+"""
+TranSysTor Math - Index de colinéarité
+Requêtes de proximité angulaire entre principes (k plus proches, paires
+au-delà d'un seuil) sans matrice dense (n, n)
+"""
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from transystor.math.orthogonality import EPSILON, named_vectors, normalize_vectors
+
+# Seuil de la contrainte SHACL tscp:OrthogonalityShape
+SHACL_MIN_ORTHOGONALITY = 0.6
+
+# Marge sur le rayon de recherche (erreurs d'arrondi)
+_RADIUS_SLACK = 1e-9
+
+
+class CollinearityIndex:
+    """
+    Index angulaire sur les positions des principes
+
+    Les vecteurs normalisés u et leurs opposés -u sont rangés dans un
+    cKDTree : |cos(u, v)| >= s équivaut à une distance de corde
+    min(|u - v|, |u + v|) <= sqrt(2 - 2s), ce qui ramène les requêtes
+    de colinéarité à des requêtes de voisinage.
+    """
+
+    def __init__(self, principles):
+        """
+        Args:
+            principles: Liste des principes ou PrincipleStore (seuls ceux
+                ayant une position sont indexés)
+        """
+        self.names, vectors = named_vectors(principles)
+        self._rows = {name: i for i, name in enumerate(self.names)}
+
+        self.unit_vectors = normalize_vectors(vectors)
+
+        # Les vecteurs nuls sont orthogonaux à tout : hors de l'arbre
+        norms = np.linalg.norm(vectors, axis=1) if len(vectors) else np.zeros(0)
+        self._tree_rows = np.flatnonzero(norms > 0)
+        sphere = vectors[self._tree_rows] / norms[self._tree_rows, None]
+        self._tree = cKDTree(np.vstack([sphere, -sphere])) if len(sphere) else None
+
+    def __len__(self):
+        return len(self.names)
+
+    def _query_vector(self, target):
+        """Retourne (ligne, vecteur unitaire exact) pour un nom ou un vecteur"""
+        if isinstance(target, str):
+            row = self._rows[target]
+            vector = self.unit_vectors[row]
+        else:
+            row = None
+            vector = np.asarray(target, dtype=float)
+        norm = np.linalg.norm(vector)
+        return row, (vector / norm if norm > 0 else None)
+
+    def _cosines(self, rows_a, rows_b):
+        """Calcule |cos| entre paires de lignes (mêmes valeurs que la matrice)"""
+        return np.abs(np.einsum('ij,ij->i', self.unit_vectors[rows_a],
+                                self.unit_vectors[rows_b]))
+
+    def most_collinear(self, target, k=5):
+        """
+        Retourne les k principes les plus colinéaires à une cible
+
+        Args:
+            target: Nom d'un principe indexé ou vecteur [I, J, K]
+            k: Nombre de voisins
+
+        Returns:
+            Liste de tuples (nom, |cos|) triée par |cos| décroissant
+        """
+        row, query = self._query_vector(target)
+        if query is None or self._tree is None or k <= 0:
+            return []
+
+        m = len(self._tree_rows)
+        # Un même principe peut apparaître deux fois (u et -u)
+        k_query = min(2 * m, 2 * (k + 1))
+        _, hits = self._tree.query(query, k=k_query)
+        hits = np.atleast_1d(hits)
+        hits = hits[hits < 2 * m]
+
+        seen = set()
+        neighbours = []
+        for hit in self._tree_rows[hits % m]:
+            if hit == row or hit in seen:
+                continue
+            seen.add(hit)
+            neighbours.append(hit)
+            if len(neighbours) == k:
+                break
+
+        if not neighbours:
+            return []
+
+        neighbours = np.array(neighbours)
+        if row is None:
+            unit = query / (1 + EPSILON / np.linalg.norm(target))
+            cosines = np.abs(self.unit_vectors[neighbours] @ unit)
+        else:
+            cosines = self._cosines(np.full(len(neighbours), row), neighbours)
+
+        order = np.argsort(-cosines, kind='stable')
+        return [(self.names[neighbours[i]], float(cosines[i])) for i in order]
+
+    def nearest_scores(self):
+        """
+        Calcule pour chaque principe l'orthogonalité à son voisin le plus
+        colinéaire (1 - max |cos|), en une requête groupée sur l'arbre
+
+        Returns:
+            Tableau (n,) des scores (1.0 sans voisin ou pour un vecteur nul)
+        """
+        scores = np.ones(len(self.names))
+        m = len(self._tree_rows)
+        if m < 2:
+            return scores
+
+        sphere = self._tree.data[:m]
+        # Le point lui-même (ou un doublon) figure parmi les premiers voisins
+        _, hits = self._tree.query(sphere, k=min(3, 2 * m))
+        rows = self._tree_rows[hits % m]
+        own = self._tree_rows[:, None]
+        first_other = np.argmax(rows != own, axis=1)
+        neighbours = rows[np.arange(m), first_other]
+
+        cosines = self._cosines(self._tree_rows, neighbours)
+        scores[self._tree_rows] = 1 - cosines
+        return scores
+
+    def pairs_above(self, threshold):
+        """
+        Retourne toutes les paires dont |cos| dépasse un seuil
+
+        Args:
+            threshold: Seuil sur |cos| (entre 0 et 1)
+
+        Returns:
+            Tuple (lignes i, lignes j, |cos|) de tableaux NumPy, i < j
+        """
+        empty = (np.zeros(0, dtype=int), np.zeros(0, dtype=int), np.zeros(0))
+        if self._tree is None:
+            return empty
+
+        m = len(self._tree_rows)
+        radius = np.sqrt(max(0.0, 2 - 2 * threshold)) + _RADIUS_SLACK
+        pairs = self._tree.query_pairs(radius, output_type='ndarray')
+        if not len(pairs):
+            return empty
+
+        a = self._tree_rows[pairs[:, 0] % m]
+        b = self._tree_rows[pairs[:, 1] % m]
+        keep = a != b
+        rows = np.unique(np.stack([np.minimum(a, b), np.maximum(a, b)], axis=1)[keep], axis=0)
+        if not len(rows):
+            return empty
+
+        cosines = self._cosines(rows[:, 0], rows[:, 1])
+        above = cosines > threshold
+        return rows[above, 0], rows[above, 1], cosines[above]
+
+    def violations(self, min_orthogonality=SHACL_MIN_ORTHOGONALITY):
+        """
+        Liste creuse des paires trop proches (orthogonalité 1 - |cos|
+        inférieure au seuil), au format consommé par OrthogonalityShape
+
+        Args:
+            min_orthogonality: Orthogonalité minimale exigée
+
+        Returns:
+            Liste de dicts {source, target, cosine, orthogonality}
+        """
+        rows_i, rows_j, cosines = self.pairs_above(1 - min_orthogonality)
+        order = np.argsort(-cosines, kind='stable')
+
+        return [
+            {
+                'source': self.names[rows_i[n]],
+                'target': self.names[rows_j[n]],
+                'cosine': float(cosines[n]),
+                'orthogonality': float(1 - cosines[n])
+            }
+            for n in order
+        ]
+
+
+def orthogonality_violations(principles, min_orthogonality=SHACL_MIN_ORTHOGONALITY):
+    """
+    Calcule les violations d'orthogonalité d'un ensemble de principes
+
+    Args:
+        principles: Liste des principes
+        min_orthogonality: Orthogonalité minimale exigée
+
+    Returns:
+        Liste de dicts {source, target, cosine, orthogonality}
+    """
+    return CollinearityIndex(principles).violations(min_orthogonality)
+
+
+def principle_orthogonality_scores(principles):
+    """
+    Calcule le score d'orthogonalité de chaque principe (1 - |cos| avec
+    son voisin le plus colinéaire), valeur attendue par la contrainte
+    SHACL tscp:OrthogonalityShape
+
+    Args:
+        principles: Liste des principes ou PrincipleStore
+
+    Returns:
+        Dict nom -> score
+    """
+    index = CollinearityIndex(principles)
+    return dict(zip(index.names, index.nearest_scores().tolist()))
@@ -0,0 +1,336 @@
+"""
+TranSysTor Math - Orthogonalité
+Moteur vectorisé de calcul d'orthogonalité entre principes
+"""
+
+import numpy as np
+
+# Terme de régularisation des normes (vecteurs nuls)
+EPSILON = 1e-6
+
+# Nombre de lignes traitées par bloc pour borner la mémoire temporaire
+DEFAULT_CHUNK_SIZE = 2048
+
+
+def _as_vectors(positions):
+    """Tableau (n, d) des positions ; (0, 3) sans position"""
+    vectors = np.array(positions, dtype=float)
+    return vectors if len(vectors) else np.empty((0, 3))
+
+
+def named_vectors(principles):
+    """
+    Extrait les noms et positions des principes ayant une position
+
+    Args:
+        principles: Liste des principes ou PrincipleStore
+
+    Returns:
+        Tuple (liste des noms, tableau NumPy float64 (n, 3) des positions)
+    """
+    positions = getattr(principles, 'positions', None)
+    if isinstance(positions, np.ndarray):
+        # PrincipleStore : colonnes déjà en place, sans parcours des dicts,
+        # remises dans l'ordre d'insertion (même résultat qu'avec la liste)
+        names = principles.names
+        order = getattr(principles, 'sequence', None)
+        if order is not None:
+            names, positions = names[order], positions[order]
+        rows = ~np.isnan(positions).any(axis=1)
+        return list(names[rows]), positions[rows]
+
+    indexed = [p for p in principles if 'position' in p]
+    return [p['name'] for p in indexed], _as_vectors([p['position'] for p in indexed])
+
+
+def principle_vectors(principles):
+    """
+    Extrait les positions des principes sous forme de tableau (n, 3)
+
+    Args:
+        principles: Liste des principes ou PrincipleStore
+
+    Returns:
+        Tableau NumPy float64 des positions
+    """
+    positions = getattr(principles, 'positions', None)
+    if isinstance(positions, np.ndarray):
+        # PrincipleStore : lignes remises dans l'ordre d'insertion
+        order = getattr(principles, 'sequence', None)
+        if order is not None:
+            positions = positions[order]
+        return positions[~np.isnan(positions).any(axis=1)]
+
+    return _as_vectors([p['position'] for p in principles if 'position' in p])
+
+
+def normalize_vectors(vectors):
+    """
+    Normalise chaque vecteur une seule fois
+
+    Args:
+        vectors: Tableau (n, d) de vecteurs
+
+    Returns:
+        Tableau (n, d) des vecteurs normalisés
+    """
+    vectors = np.asarray(vectors, dtype=float)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / (norms + EPSILON)
+
+
+def iter_cosine_blocks(unit_vectors, chunk_size=DEFAULT_CHUNK_SIZE, out=None):
+    """
+    Parcourt la matrice |cos| par blocs de lignes
+
+    Args:
+        unit_vectors: Tableau (n, d) de vecteurs normalisés
+        chunk_size: Nombre de lignes par bloc
+        out: Matrice (n, n) optionnelle dans laquelle écrire les blocs
+
+    Yields:
+        Tuples (start, stop, bloc) où bloc vaut |cos| pour les lignes
+        start..stop, diagonale mise à zéro
+    """
+    n = len(unit_vectors)
+    chunk_size = max(1, int(chunk_size))
+
+    for start in range(0, n, chunk_size):
+        stop = min(start + chunk_size, n)
+        block = out[start:stop] if out is not None else None
+        block = np.matmul(unit_vectors[start:stop], unit_vectors.T, out=block)
+        np.abs(block, out=block)
+        rows = np.arange(stop - start)
+        block[rows, rows + start] = 0.0
+        yield start, stop, block
+
+
+def orthogonality_matrix(vectors, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Calcule la matrice complète des |cos| entre vecteurs
+
+    Args:
+        vectors: Tableau (n, d) de vecteurs
+        chunk_size: Nombre de lignes par bloc
+
+    Returns:
+        Matrice (n, n), diagonale nulle
+    """
+    unit = normalize_vectors(vectors)
+    n = len(unit)
+    matrix = np.empty((n, n))
+
+    for _ in iter_cosine_blocks(unit, chunk_size, out=matrix):
+        pass
+
+    return matrix
+
+
+def orthogonality_score(vectors, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Calcule le score global sans matérialiser la matrice (n, n)
+
+    Args:
+        vectors: Tableau (n, d) de vecteurs
+        chunk_size: Nombre de lignes par bloc
+
+    Returns:
+        Score (1.0 = parfaitement orthogonal, 0.0 = colinéaire)
+    """
+    unit = normalize_vectors(vectors)
+    if len(unit) < 2:
+        return 1.0
+
+    total = 0.0
+    count = 0
+    for _, _, block in iter_cosine_blocks(unit, chunk_size):
+        # |cos| >= 0 : la somme des valeurs > 0 est la somme du bloc
+        total += block.sum()
+        count += int(np.count_nonzero(block))
+
+    return 1 - total / count if count else 1.0
+
+
+def compute_orthogonality(principles, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Calcule la métrique d'orthogonalité des principes
+
+    Args:
+        principles: Liste des principes
+        chunk_size: Nombre de lignes par bloc
+
+    Returns:
+        Tuple (score, matrice)
+    """
+    vectors = principle_vectors(principles)
+
+    if len(vectors) < 2:
+        return 1.0, np.array([[]])
+
+    unit = normalize_vectors(vectors)
+    n = len(unit)
+    ortho_matrix = np.empty((n, n))
+
+    total = 0.0
+    count = 0
+    for _, _, block in iter_cosine_blocks(unit, chunk_size, out=ortho_matrix):
+        # |cos| >= 0 : la somme des valeurs > 0 est la somme du bloc
+        total += block.sum()
+        count += int(np.count_nonzero(block))
+
+    ortho_score = 1 - total / count if count else 1.0
+
+    return ortho_score, ortho_matrix
+
+
+class OrthogonalityTracker:
+    """
+    Maintien incrémental du score d'orthogonalité
+
+    Conserve les vecteurs normalisés ainsi que la somme et le nombre des
+    |cos| non nuls de la matrice : ajouter, déplacer ou retirer un
+    principe ne modifie qu'une ligne et une colonne, soit une mise à jour
+    de rang 1 en O(n) au lieu d'un recalcul O(n²).
+    """
+
+    def __init__(self, principles=(), dim=3):
+        """
+        Args:
+            principles: Liste initiale des principes ou PrincipleStore
+            dim: Dimension des positions
+        """
+        self.dim = dim
+        self.reset(principles)
+
+    def reset(self, principles=()):
+        """
+        Reconstruit l'état complet (recalcul par blocs)
+
+        Args:
+            principles: Liste des principes
+        """
+        self._names, vectors = named_vectors(principles)
+        self._rows = {name: i for i, name in enumerate(self._names)}
+
+        unit = normalize_vectors(vectors.reshape(len(self._names), self.dim))
+        self._unit = np.empty((max(16, 2 * len(unit)), self.dim))
+        self._unit[:len(unit)] = unit
+
+        self._total = 0.0
+        self._count = 0
+        for _, _, block in iter_cosine_blocks(unit):
+            self._total += block.sum()
+            self._count += int(np.count_nonzero(block))
+
+    def __len__(self):
+        return len(self._names)
+
+    def __contains__(self, name):
+        return name in self._rows
+
+    @property
+    def score(self):
+        """Score global (mêmes valeurs que compute_orthogonality)"""
+        if len(self._names) < 2 or self._count <= 0:
+            return 1.0
+        return 1 - max(self._total, 0.0) / self._count
+
+    def _row_cosines(self, vector, row=None):
+        """Calcule |cos| entre un vecteur unitaire et toutes les lignes"""
+        cosines = np.abs(self._unit[:len(self._names)] @ vector)
+        if row is not None:
+            cosines[row] = 0.0
+        return cosines
+
+    def _apply(self, cosines, sign):
+        # Matrice symétrique : la ligne et la colonne comptent chacune
+        self._total += sign * 2 * cosines.sum()
+        self._count += sign * 2 * int(np.count_nonzero(cosines))
+
+    def add(self, name, position):
+        """
+        Ajoute un principe
+
+        Args:
+            name: Nom du principe
+            position: Position [I, J, K]
+        """
+        if name in self._rows:
+            raise KeyError(f"Principe déjà suivi: {name}")
+
+        vector = normalize_vectors(np.asarray(position, dtype=float).reshape(1, self.dim))[0]
+        self._apply(self._row_cosines(vector), +1)
+
+        n = len(self._names)
+        if n == len(self._unit):
+            self._unit = np.concatenate([self._unit, np.empty_like(self._unit)])
+        self._unit[n] = vector
+        self._rows[name] = n
+        self._names.append(name)
+
+    def move(self, name, position):
+        """
+        Déplace un principe
+
+        Args:
+            name: Nom du principe
+            position: Nouvelle position [I, J, K]
+        """
+        row = self._rows[name]
+        self._apply(self._row_cosines(self._unit[row], row), -1)
+
+        vector = normalize_vectors(np.asarray(position, dtype=float).reshape(1, self.dim))[0]
+        self._unit[row] = vector
+        self._apply(self._row_cosines(vector, row), +1)
+
+    def remove(self, name):
+        """
+        Retire un principe
+
+        Args:
+            name: Nom du principe
+        """
+        row = self._rows.pop(name)
+        self._apply(self._row_cosines(self._unit[row], row), -1)
+
+        # La dernière ligne prend la place de la ligne retirée
+        last = len(self._names) - 1
+        if row != last:
+            moved = self._names[last]
+            self._unit[row] = self._unit[last]
+            self._names[row] = moved
+            self._rows[moved] = row
+        self._names.pop()
+
+    def sync(self, principles):
+        """
+        Aligne le suivi sur une liste de principes en n'appliquant que les
+        ajouts, déplacements et suppressions effectifs (reconstruction
+        complète si une large part des principes a changé)
+
+        Args:
+            principles: Liste courante des principes
+        """
+        names, vectors = named_vectors(principles)
+        unit = normalize_vectors(vectors.reshape(len(names), self.dim))
+
+        current = dict(zip(names, range(len(names))))
+        removed = [name for name in self._names if name not in current]
+        added = [name for name in names if name not in self._rows]
+
+        kept = [name for name in names if name in self._rows]
+        kept_rows = np.array([current[name] for name in kept], dtype=int)
+        tracked_rows = np.array([self._rows[name] for name in kept], dtype=int)
+        changed = ~np.all(unit[kept_rows] == self._unit[tracked_rows], axis=1)
+        moved = [kept[i] for i in np.flatnonzero(changed)]
+
+        if len(removed) + len(added) + len(moved) > max(16, len(names) // 8):
+            self.reset(principles)
+            return
+
+        for name in removed:
+            self.remove(name)
+        for name in moved:
+            self.move(name, vectors[current[name]])
+        for name in added:
+            self.add(name, vectors[current[name]])
@@ -3,13 +3,23 @@ TranSysTor Chatbot Module
 Assistant IA pour validation et critique
 """
 
+# Fournisseur de la session par libellé du menu
+PROVIDER_LABELS = {
+    'Anthropic (Claude)': 'anthropic',
+    'OpenAI (GPT)': 'openai',
+    'Local (Ollama)': 'ollama',
+    'Local (test)': 'stub'
+}
 
-def create_chatbot_interface(state):
+
+def create_chatbot_interface(state, principles=None):
     """
     Crée l'interface du chatbot
     
     Args:
         state: Instance de IDEState
+        principles: Liste des principes (son empreinte fait partie de la
+            clé du cache des réponses)
     
     Returns:
         Tuple (provider_widget, api_key_widget, chat_input, chat_button, chat_output)
@@ -19,7 +29,7 @@ def create_chatbot_interface(state):
     
     # Widgets
     chatbot_provider = widgets.Dropdown(
-        options=['Anthropic (Claude)', 'OpenAI (GPT)', 'Local (Ollama)', 'Désactivé'],
+        options=list(PROVIDER_LABELS) + ['Désactivé'],
         value='Désactivé',
         description='Provider:',
         style={'description_width': 'initial'}
@@ -47,12 +57,20 @@ def create_chatbot_interface(state):
     
     chat_output = widgets.Output()
     
+    # Génération en cours (le bouton Envoyer devient Annuler)
+    generation = {'future': None}
+    
+    def set_sending(sending):
+        chat_button.description = 'Annuler' if sending else 'Envoyer'
+        chat_button.icon = 'stop' if sending else 'paper-plane'
+        chat_button.button_style = 'warning' if sending else 'info'
+    
     # Callbacks
     def on_provider_change(change):
         if change['new'] in ['Anthropic (Claude)', 'OpenAI (GPT)']:
             api_key_input.disabled = False
             chat_button.disabled = False
-        elif change['new'] == 'Local (Ollama)':
+        elif change['new'] in ['Local (Ollama)', 'Local (test)']:
             api_key_input.disabled = True
             chat_button.disabled = False
         else:
@@ -64,6 +82,11 @@ def create_chatbot_interface(state):
     chatbot_provider.observe(on_provider_change, names='value')
     
     def on_chat_send(b):
+        running = generation['future']
+        if running is not None and not running.done():
+            running.cancel()
+            return
+        
         with chat_output:
             clear_output(wait=True)
             
@@ -75,87 +98,238 @@ def create_chatbot_interface(state):
             print(f"💬 Vous: {question}\n")
             print("🤖 Assistant:\n")
             
-            provider = chatbot_provider.value
-            
-            if provider == 'Anthropic (Claude)':
-                response = send_to_anthropic(question, api_key_input.value, state)
-                print(response)
-            
-            elif provider == 'OpenAI (GPT)':
-                response = send_to_openai(question, api_key_input.value, state)
-                print(response)
-            
-            elif provider == 'Local (Ollama)':
-                response = send_to_ollama(question, state)
-                print(response)
-            
-            else:
+            provider_name = PROVIDER_LABELS.get(chatbot_provider.value)
+            if provider_name is None:
                 print("Chatbot désactivé")
+                return
+            
+            if provider_name in ('anthropic', 'openai') and not api_key_input.value:
+                print(f"❌ Veuillez configurer votre clé API {chatbot_provider.value.split()[0]}")
+                return
+        
+        # Les tokens arrivent sur la boucle de l'assistant et s'affichent
+        # au fil de l'eau : le callback rend la main immédiatement
+        set_sending(True)
+        future = stream_async(provider_name, question, chat_output.append_stdout,
+                              api_key_input.value, state, principles=principles)
+        generation['future'] = future
+        
+        def on_answer(future):
+            set_sending(False)
+            if future.cancelled():
+                chat_output.append_stdout("\n\n⏹ Génération interrompue\n")
+                return
+            answer = future.result()
+            if answer.error is not None:
+                chat_output.append_stdout(f"\n{_format_answer(answer)}\n")
+            if answer.cached:
+                chat_output.append_stdout("\n\n⚡ Réponse en cache")
+            chat_output.append_stdout(f"\n\n{cache_status()}\n")
+        
+        future.add_done_callback(on_answer)
     
     chat_button.on_click(on_chat_send)
     
     return chatbot_provider, api_key_input, chat_input, chat_button, chat_output
 
 
-def send_to_anthropic(question, api_key, state):
+def _session():
+    try:
+        from transystor.assistant.session import default_session
+    except ImportError:
+        from assistant.session import default_session
+    return default_session()
+
+
+def _model_hash(principles):
+    """Empreinte des principes pour la clé du cache des réponses"""
+    if principles is None:
+        return ''
+    try:
+        from transystor.core.hashing import principles_fingerprint
+    except ImportError:
+        from core.hashing import principles_fingerprint
+    return principles_fingerprint(principles)
+
+
+# Constructeur des résumés du modèle (créé à la première question)
+_CONTEXT = None
+
+
+def _context_builder():
+    global _CONTEXT
+    if _CONTEXT is None:
+        try:
+            from transystor.assistant.context import ContextBuilder
+        except ImportError:
+            from assistant.context import ContextBuilder
+        _CONTEXT = ContextBuilder()
+    return _CONTEXT
+
+
+def _request(question, principles):
     """
-    Envoie une question à l'API Anthropic
+    Prompt système (avec le résumé du modèle) et empreinte des principes
+    d'une question ; l'empreinte sert aussi de révision au cache des résumés
+    """
+    model_hash = _model_hash(principles)
+    system = _context_builder().system_prompt(principles, question, revision=model_hash)
+    return system, model_hash
+
+
+def model_context(question, principles, budget=None):
+    """
+    Résume le modèle courant pour une question (texte joint au prompt
+    système de l'assistant)
     
     Args:
         question: Question de l'utilisateur
-        api_key: Clé API
+        principles: Liste des principes courante
+        budget: Budget du résumé en tokens estimés (défaut : 1500)
+    
+    Returns:
+        Texte du résumé (principes les plus pertinents d'abord)
+    """
+    return _context_builder().build(principles, question, budget, _model_hash(principles))
+
+
+def _format_answer(answer):
+    """Texte affiché pour une Answer (réponse ou message d'erreur)"""
+    if answer.error is not None:
+        return f"❌ {answer.error}"
+    return answer.text
+
+
+def session_provider(provider_name, api_key=None, state=None):
+    """
+    Retourne le fournisseur de la session (client réutilisé d'une
+    question à l'autre)
+    
+    Args:
+        provider_name: 'anthropic', 'openai', 'ollama' ou 'stub'
+        api_key: Clé API (Anthropic, OpenAI)
+        state: Instance de IDEState (modèle Claude configuré)
+    
+    Returns:
+        Instance de Provider
+    """
+    options = {}
+    if provider_name in ('anthropic', 'openai'):
+        options['api_key'] = api_key
+    if provider_name == 'anthropic' and state is not None:
+        options['model'] = state.chatbot_config['model']
+    return _session().provider(provider_name, **options)
+
+
+def ask_async(provider_name, question, api_key=None, state=None, timeout=None,
+              principles=None):
+    """
+    Envoie une question sans bloquer l'appelant
+    
+    Le prompt système est complété par un résumé des principes les plus
+    pertinents pour la question (voir model_context). Une question déjà
+    posée au même fournisseur et au même modèle, pour le même ensemble
+    de principes, est servie par le cache des réponses.
+    
+    Args:
+        provider_name: 'anthropic', 'openai', 'ollama' ou 'stub'
+        question: Question de l'utilisateur
+        api_key: Clé API (Anthropic, OpenAI)
         state: Instance de IDEState
+        timeout: Délai maximal en secondes
+        principles: Liste des principes courante
     
     Returns:
-        Réponse du modèle
+        concurrent.futures.Future d'une Answer
     """
-    if not api_key:
-        return "❌ Veuillez configurer votre clé API Anthropic"
+    provider = session_provider(provider_name, api_key, state)
+    system, model_hash = _request(question, principles)
+    return _session().ask(provider, question, system, timeout, model_hash)
+
+
+def stream_async(provider_name, question, on_token, api_key=None, state=None, timeout=None,
+                 principles=None):
+    """
+    Envoie une question et transmet la réponse token par token, sans
+    bloquer l'appelant
     
-    try:
-        import anthropic
-        
-        client = anthropic.Anthropic(api_key=api_key)
-        
-        system_prompt = """Tu es un expert du framework TSCP (Principes Transdisciplinaires de Construction de Systèmes).
+    Args:
+        provider_name: 'anthropic', 'openai', 'ollama' ou 'stub'
+        question: Question de l'utilisateur
+        on_token: Fonction appelée avec chaque fragment (depuis le thread
+            de l'assistant)
+        api_key: Clé API (Anthropic, OpenAI)
+        state: Instance de IDEState
+        timeout: Délai maximal en secondes
+        principles: Liste des principes courante
+    
+    Returns:
+        concurrent.futures.Future de l'Answer complète (cancel() arrête
+        la génération)
+    """
+    provider = session_provider(provider_name, api_key, state)
+    system, model_hash = _request(question, principles)
+    return _session().stream(provider, question, on_token, system, timeout, model_hash)
 
-Le framework TSCP organise les principes en 4 couches :
-- CM0 : Meta-métamodèle (plan 5×5) - Meta-metaclasses et Méta-traits
-- CM1 : Métamodèle (cube 3×3×3) - Metaclasses et Traits
-- CM2 : Modèle (cube 4×4×4) - Classes organisées dans un cube
-- CM3 : Systèmes réels (cube 5×5×5) - Instances concrètes
 
-Opérateurs :
-- ⊗ : Produit tensoriel (combinaison)
-- ∈ : Instance de
-- ⊂ : Sous-classe de / Dérive de
+def stream_tokens(provider_name, question, api_key=None, state=None, timeout=None,
+                  principles=None):
+    """
+    Itère sur les tokens d'une réponse (ex: st.write_stream) ; fermer
+    l'itérateur avant la fin annule la génération
+    
+    Args:
+        provider_name: 'anthropic', 'openai', 'ollama' ou 'stub'
+        question: Question de l'utilisateur
+        api_key: Clé API (Anthropic, OpenAI)
+        state: Instance de IDEState
+        timeout: Délai maximal en secondes
+        principles: Liste des principes courante
+    
+    Returns:
+        Itérateur des fragments de texte
+    """
+    provider = session_provider(provider_name, api_key, state)
+    system, model_hash = _request(question, principles)
+    return _session().iter_tokens(provider, question, system, timeout, model_hash)
 
-Ton rôle : valider les principes, détecter les incohérences, proposer des améliorations, vérifier l'orthogonalité."""
-        
-        message = client.messages.create(
-            model=state.chatbot_config['model'],
-            max_tokens=1000,
-            system=system_prompt,
-            messages=[
-                {"role": "user", "content": question}
-            ]
-        )
-        
-        return message.content[0].text
-        
-    except ImportError:
-        return """❌ Module 'anthropic' non installé.
 
-Pour installer :
-    pip install anthropic
+def cache_status():
+    """
+    Résume les statistiques du cache des réponses de la session
+    
+    Returns:
+        Texte affichable (succès, échecs, réponses conservées)
+    """
+    cache = _session().cache
+    if cache is None:
+        return "📦 Cache désactivé"
+    stats = cache.stats()
+    return (f"📦 Cache: {stats['hits']} succès / {stats['misses']} échec(s), "
+            f"{stats['size']} réponse(s) conservée(s)")
 
-Puis relancez cette cellule."""
+
+def send_to_anthropic(question, api_key, state, on_token=None):
+    """
+    Envoie une question à l'API Anthropic
     
-    except Exception as e:
-        return f"❌ Erreur: {str(e)}"
+    Args:
+        question: Question de l'utilisateur
+        api_key: Clé API
+        state: Instance de IDEState
+        on_token: Fonction appelée avec chaque fragment de la réponse
+            (réponse en flux) ; None pour la réponse complète
+    
+    Returns:
+        Réponse du modèle
+    """
+    if not api_key:
+        return "❌ Veuillez configurer votre clé API Anthropic"
+    
+    return _send('anthropic', question, api_key, state, on_token)
 
 
-def send_to_openai(question, api_key, state):
+def send_to_openai(question, api_key, state, on_token=None):
     """
     Envoie une question à l'API OpenAI
     
@@ -163,6 +337,8 @@ def send_to_openai(question, api_key, state):
         question: Question de l'utilisateur
         api_key: Clé API
         state: Instance de IDEState
+        on_token: Fonction appelée avec chaque fragment de la réponse
+            (réponse en flux) ; None pour la réponse complète
     
     Returns:
         Réponse du modèle
@@ -170,64 +346,30 @@ def send_to_openai(question, api_key, state):
     if not api_key:
         return "❌ Veuillez configurer votre clé API OpenAI"
     
-    try:
-        import openai
-        
-        openai.api_key = api_key
-        
-        response = openai.ChatCompletion.create(
-            model="gpt-4",
-            messages=[
-                {"role": "system", "content": "Tu es un expert du framework TSCP."},
-                {"role": "user", "content": question}
-            ]
-        )
-        
-        return response.choices[0].message.content
-        
-    except ImportError:
-        return """❌ Module 'openai' non installé.
+    return _send('openai', question, api_key, state, on_token)
 
-Pour installer :
-    pip install openai
 
-Puis relancez cette cellule."""
-    
-    except Exception as e:
-        return f"❌ Erreur: {str(e)}"
+def _send(provider_name, question, api_key, state, on_token):
+    """Envoie une question et attend la réponse (en flux si on_token)"""
+    if on_token is None:
+        return _format_answer(ask_async(provider_name, question, api_key, state).result())
+    return _format_answer(stream_async(provider_name, question, on_token, api_key, state).result())
 
 
-def send_to_ollama(question, state):
+def send_to_ollama(question, state, on_token=None):
     """
     Envoie une question à Ollama local
     
     Args:
         question: Question de l'utilisateur
         state: Instance de IDEState
+        on_token: Fonction appelée avec chaque fragment de la réponse
+            (réponse en flux) ; None pour la réponse complète
     
     Returns:
         Réponse du modèle
     """
-    try:
-        import ollama
-        
-        response = ollama.chat(model='llama2', messages=[
-            {'role': 'system', 'content': 'Tu es un expert du framework TSCP.'},
-            {'role': 'user', 'content': question}
-        ])
-        
-        return response['message']['content']
-        
-    except ImportError:
-        return """❌ Module 'ollama' non installé.
-
-Pour installer :
-    pip install ollama
-
-Assurez-vous également que le serveur Ollama est lancé localement."""
-    
-    except Exception as e:
-        return f"❌ Erreur: {str(e)}"
+    return _send('ollama', question, None, state, on_token)
 
 
 def get_predefined_questions():
@@ -245,6 +387,3 @@ def get_predefined_questions():
         ("Validation isotopie", "Est-ce que 'Symétrie/Asymétrie' forme une isotopie valide ? Justifie."),
         ("Restructuration suggérée", "Analyse la structure actuelle du cube CM2 et propose des améliorations."),
     ]
-
-
-print("✅ Module TranSysTor Chatbot chargé")
\ No newline at end of file
@@ -3,13 +3,80 @@ TranSysTor Core Module
 Configuration, état global et traductions
 """
 
+import logging
+import os
 from pathlib import Path
 from datetime import datetime
 
-# Chemins
-MODEL_DIR = Path('../models/tscp')
-SCHEMA_DIR = Path('../models/schemas')
-EXPORT_DIR = Path('../exports')
+logger = logging.getLogger(__name__)
+
+# Chemins relatifs au répertoire de base, résolus à l'usage (voir get_path)
+DEFAULT_PATHS = {
+    'models': Path('models/tscp'),
+    'schemas': Path('models/schemas'),
+    'exports': Path('exports'),
+    'cache': Path('.cache')
+}
+
+# Constantes de chemins du module, résolues par __getattr__
+_PATH_ATTRIBUTES = {
+    'MODEL_DIR': 'models',
+    'SCHEMA_DIR': 'schemas',
+    'EXPORT_DIR': 'exports'
+}
+
+# Chemins fixés par configure_paths (le répertoire de base sous 'base')
+_configured_paths = {}
+
+
+def configure_paths(base_dir=None, model_dir=None, schema_dir=None, export_dir=None,
+                    cache_dir=None):
+    """
+    Configure les répertoires du framework
+    
+    Les chemins non fournis gardent leur valeur précédente ; les chemins
+    par défaut sont relatifs au répertoire de base.
+    
+    Args:
+        base_dir: Répertoire de base (défaut : $TRANSYSTOR_HOME, sinon la
+            racine du dépôt)
+        model_dir: Répertoire des modèles (défaut <base>/models/tscp)
+        schema_dir: Répertoire des schémas (défaut <base>/models/schemas)
+        export_dir: Répertoire des exports (défaut <base>/exports)
+        cache_dir: Répertoire des caches (défaut <base>/.cache)
+    """
+    for kind, path in (('base', base_dir), ('models', model_dir),
+                       ('schemas', schema_dir), ('exports', export_dir),
+                       ('cache', cache_dir)):
+        if path is not None:
+            _configured_paths[kind] = Path(path)
+
+
+def get_path(kind):
+    """
+    Résout un répertoire du framework
+    
+    Args:
+        kind: 'models', 'schemas', 'exports' ou 'cache'
+    
+    Returns:
+        Path du répertoire (non créé)
+    """
+    if kind in _configured_paths:
+        return _configured_paths[kind]
+    
+    base_dir = _configured_paths.get('base') or os.environ.get('TRANSYSTOR_HOME')
+    if not base_dir:
+        base_dir = Path(__file__).resolve().parent.parent
+    return Path(base_dir) / DEFAULT_PATHS[kind]
+
+
+def __getattr__(name):
+    # MODEL_DIR, SCHEMA_DIR, EXPORT_DIR : résolus à chaque accès
+    if name in _PATH_ATTRIBUTES:
+        return get_path(_PATH_ATTRIBUTES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # État global de l'application
 class IDEState:
@@ -179,63 +246,360 @@ CUBE_CONFIGS = {
 }
 
 
-def load_model(layer_name):
+def _binary_module():
+    """Import paresseux du format binaire (NumPy n'est chargé qu'à l'usage)"""
+    try:
+        from transystor.core import binary
+    except ImportError:
+        from core import binary
+    return binary
+
+
+def math_module(name):
     """
-    Charge un modèle JSON depuis le répertoire models/tscp
+    Import paresseux d'un module de transystor.math
+    
+    En import absolu (transystor/ dans sys.path, comme dans les
+    notebooks), le paquet math est masqué par le module math de la
+    bibliothèque standard : la racine du dépôt est alors ajoutée en fin de
+    sys.path pour l'importer par le paquet transystor (les modules de
+    calcul ne dépendent que de NumPy et SciPy).
     
     Args:
-        layer_name: Nom de la couche (CM0, CM1, CM2, CM3)
+        name: Nom du module (ex: 'orthogonality', 'collinearity')
+    
+    Returns:
+        Module importé
+    """
+    import importlib
+    import sys
+    
+    module = f"transystor.math.{name}"
+    try:
+        return importlib.import_module(module)
+    except ImportError:
+        root = str(Path(__file__).resolve().parent.parent)
+        if root not in sys.path:
+            sys.path.append(root)
+        return importlib.import_module(module)
+
+
+def _read_model(layer_name, mmap=False, model_dir=None):
+    """
+    Lit le modèle d'une couche sans journaliser (voir load_model)
     
     Returns:
-        Dict contenant le modèle chargé
+        Tuple (modèle, niveau de log, message de chargement)
     """
     import json
     
-    file_path = MODEL_DIR / f"{layer_name.lower()}.json"
+    model_dir = Path(model_dir or get_path('models'))
+    file_path = model_dir / f"{layer_name.lower()}.json"
+    binary_path = model_dir / f"{layer_name.lower()}.npz"
+    
+    if binary_path.exists() and (
+        not file_path.exists() or binary_path.stat().st_mtime >= file_path.stat().st_mtime
+    ):
+        if mmap:
+            try:
+                from transystor.core.lazy import open_binary
+            except ImportError:
+                from core.lazy import open_binary
+            return (open_binary(binary_path), logging.INFO,
+                    f"Modèle {layer_name} projeté en mémoire")
+        
+        data = _binary_module().load_binary(binary_path)
+        return data, logging.INFO, f"Modèle {layer_name} chargé (binaire)"
     
     if not file_path.exists():
-        print(f"⚠️  Fichier {file_path} non trouvé. Création d'un modèle vide.")
-        return {"layer": layer_name, "version": "0.2.0"}
+        return ({"layer": layer_name, "version": "0.2.0"}, logging.WARNING,
+                f"Fichier {file_path} non trouvé. Création d'un modèle vide.")
     
     with open(file_path, 'r', encoding='utf-8') as f:
         data = json.load(f)
     
-    print(f"✅ Modèle {layer_name} chargé")
+    return data, logging.INFO, f"Modèle {layer_name} chargé"
+
+
+def load_model(layer_name, mmap=False):
+    """
+    Charge un modèle depuis le répertoire models/tscp
+    
+    Le fichier binaire .npz est préféré au JSON s'il existe et n'est pas
+    plus ancien que lui.
+    
+    Args:
+        layer_name: Nom de la couche (CM0, CM1, CM2, CM3)
+        mmap: Projette le modèle binaire en mémoire sans le décoder
+            (positions en np.memmap, enregistrements décodés à l'accès) ;
+            sans fichier binaire, le JSON est chargé normalement
+    
+    Returns:
+        Dict contenant le modèle chargé (LazyModel en mode mmap)
+    """
+    data, level, message = _read_model(layer_name, mmap)
+    logger.log(level, message)
     return data
 
 
-def save_model(model_data, layer_name):
+# Validateurs compilés, par chemin et date de modification du schéma
+_VALIDATORS = {}
+
+
+def _schema_registry(schema_dir):
+    """
+    Registre des schémas d'un répertoire, pour résoudre les $ref entre
+    fichiers (ex: cm0.schema.json -> layer.schema.json)
+    
+    Returns:
+        Dict $id (et nom de fichier) -> schéma
+    """
+    import json
+    
+    schemas = {}
+    for path in sorted(Path(schema_dir).glob('*.schema.json')):
+        with open(path, 'r', encoding='utf-8') as f:
+            schema = json.load(f)
+        schemas[path.name] = schema
+        if '$id' in schema:
+            schemas[schema['$id']] = schema
+    return schemas
+
+
+def schema_validator(layer_name, schema_dir=None):
+    """
+    Retourne le validateur jsonschema compilé d'une couche
+    
+    Le schéma <couche>.schema.json est utilisé s'il existe, sinon le
+    schéma commun layer.schema.json. Le validateur est gardé en cache
+    tant que le fichier du schéma n'est pas modifié.
+    
+    Args:
+        layer_name: Nom de la couche (CM0, CM1, CM2, CM3)
+        schema_dir: Répertoire des schémas (get_path('schemas') par défaut)
+    
+    Returns:
+        Validateur jsonschema, ou None si aucun schéma n'est défini
+    """
+    schema_dir = Path(schema_dir or get_path('schemas'))
+    schema_path = schema_dir / f"{layer_name.lower()}.schema.json"
+    if not schema_path.exists():
+        schema_path = schema_dir / "layer.schema.json"
+    if not schema_path.exists():
+        return None
+    
+    key = (str(schema_path.resolve()), schema_path.stat().st_mtime_ns)
+    if key not in _VALIDATORS:
+        from jsonschema.validators import validator_for
+        
+        schemas = _schema_registry(schema_dir)
+        schema = schemas[schema_path.name]
+        cls = validator_for(schema)
+        cls.check_schema(schema)
+        
+        try:
+            from referencing import Registry, Resource
+            from referencing.jsonschema import DRAFT202012
+        except ImportError:
+            # jsonschema < 4.18 : résolution par RefResolver
+            from jsonschema import RefResolver
+            validator = cls(schema, resolver=RefResolver.from_schema(schema, store=schemas))
+        else:
+            registry = Registry().with_resources(
+                (uri, Resource.from_contents(contents, default_specification=DRAFT202012))
+                for uri, contents in schemas.items()
+            )
+            validator = cls(schema, registry=registry)
+        
+        _VALIDATORS[key] = validator
+    return _VALIDATORS[key]
+
+
+def validate_model(model, layer_name, schema_dir=None):
+    """
+    Valide le modèle d'une couche contre son schéma
+    
+    Args:
+        model: Dict du modèle
+        layer_name: Nom de la couche
+        schema_dir: Répertoire des schémas (get_path('schemas') par défaut)
+    
+    Raises:
+        ValueError: Si le modèle ne respecte pas le schéma (première
+            erreur la plus pertinente)
+    """
+    validator = schema_validator(layer_name, schema_dir)
+    if validator is None:
+        return
+    
+    from jsonschema.exceptions import best_match
+    
+    error = best_match(validator.iter_errors(model))
+    if error is not None:
+        location = '/'.join(str(part) for part in error.absolute_path) or '/'
+        raise ValueError(f"Modèle {layer_name} invalide ({location}): {error.message}")
+
+
+def _load_layer(layer_name, validate, model_dir, schema_dir):
+    """
+    Lit et valide une couche (exécuté dans le pool de load_all_models)
+    
+    Returns:
+        Tuple (modèle, niveau de log, message de chargement)
+    """
+    data, level, message = _read_model(layer_name, model_dir=model_dir)
+    if validate:
+        validate_model(data, layer_name, schema_dir)
+    return data, level, message
+
+
+def load_all_models(layers=tuple(CUBE_CONFIGS), validate=True, executor='thread',
+                    max_workers=None):
+    """
+    Charge et valide les modèles de toutes les couches en parallèle
+    
+    Chaque couche est lue, décodée et validée par son propre worker : le
+    démarrage coûte environ le temps de la couche la plus lente. Pour de
+    gros modèles sur une machine multicœur, executor='process' parallélise
+    aussi la validation (liée au CPU).
+    
+    Les validateurs sont compilés une fois avant le lancement du pool et
+    partagés par les threads. Avec executor='process', chaque worker
+    compile les siens, sauf démarrage par fork (le cache du processus
+    parent est alors hérité).
+    
+    Args:
+        layers: Noms des couches à charger (CM0 à CM3 par défaut)
+        validate: Valide chaque modèle contre models/schemas
+        executor: 'thread' ou 'process'
+        max_workers: Taille du pool (défaut : un worker par couche)
+    
+    Returns:
+        Dict {'layers': couche -> modèle, 'index': PrincipleIndex de tous
+        les éléments nommés des couches}
+    
+    Raises:
+        ValueError: Si un modèle est invalide ou si un nom est défini
+            dans deux couches
+    """
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+    
+    try:
+        from transystor.core.index import PrincipleIndex
+    except ImportError:
+        from core.index import PrincipleIndex
+    
+    if executor not in ('thread', 'process'):
+        raise ValueError(f"Exécuteur inconnu: {executor}")
+    
+    model_dir, schema_dir = get_path('models'), get_path('schemas')
+    if validate:
+        for layer_name in layers:
+            schema_validator(layer_name, schema_dir)
+    
+    pool_class = ProcessPoolExecutor if executor == 'process' else ThreadPoolExecutor
+    with pool_class(max_workers=max_workers or len(layers) or 1) as pool:
+        futures = [
+            pool.submit(_load_layer, layer_name, validate, model_dir, schema_dir)
+            for layer_name in layers
+        ]
+        loaded = [future.result() for future in futures]
+    
+    models = {}
+    index = PrincipleIndex(strict=True)
+    defined_in = {}
+    for layer_name, (data, level, message) in zip(layers, loaded):
+        logger.log(level, message)
+        models[layer_name] = data
+        
+        for value in data.values():
+            if not (isinstance(value, list) and all(isinstance(v, dict) for v in value)):
+                continue
+            for element in value:
+                if 'name' not in element:
+                    continue
+                name = element['name']
+                if name in defined_in:
+                    raise ValueError(f"Nom défini dans {defined_in[name]} et {layer_name}: {name}")
+                defined_in[name] = layer_name
+                # Les éléments sans couche (ex: CM0) sont rangés sous la leur
+                index.add(element if 'layer' in element else dict(element, layer=layer_name))
+    
+    return {'layers': models, 'index': index}
+
+
+def save_model(model_data, layer_name, binary=False):
     """
     Sauvegarde un modèle dans models/tscp/
     
     Args:
         model_data: Données du modèle
         layer_name: Nom de la couche
+        binary: Sauvegarde au format binaire .npz (repris en priorité
+            par load_model) au lieu du JSON
     """
     import json
     
-    MODEL_DIR.mkdir(parents=True, exist_ok=True)
-    file_path = MODEL_DIR / f"{layer_name.lower()}.json"
+    model_dir = get_path('models')
+    model_dir.mkdir(parents=True, exist_ok=True)
+    
+    if binary:
+        file_path = _binary_module().save_binary(model_data, model_dir / f"{layer_name.lower()}.npz")
+        logger.info(f"Modèle {layer_name} sauvegardé dans {file_path}")
+        return
+    
+    file_path = model_dir / f"{layer_name.lower()}.json"
     
     with open(file_path, 'w', encoding='utf-8') as f:
         json.dump(model_data, f, indent=2, ensure_ascii=False)
     
-    print(f"✅ Modèle {layer_name} sauvegardé dans {file_path}")
+    logger.info(f"Modèle {layer_name} sauvegardé dans {file_path}")
 
 
-def save_complete_state(state, principles_data):
+def open_journal(name="tscp", **options):
+    """
+    Ouvre (ou crée) le journal des modifications dans models/tscp/
+    
+    Args:
+        name: Préfixe des fichiers du journal
+        options: Options de ModelJournal (compact_every, history_size...)
+    
+    Returns:
+        ModelJournal dont l'état est rejoué depuis le disque
+    """
+    try:
+        from transystor.core.journal import ModelJournal
+    except ImportError:
+        from core.journal import ModelJournal
+    return ModelJournal(get_path('models'), name, **options)
+
+
+def save_complete_state(state, principles_data, binary=False, journal=None):
     """
     Sauvegarde l'état complet de l'IDE
     
     Args:
         state: Instance de IDEState
         principles_data: Liste des principes
+        binary: Sauvegarde au format binaire .npz au lieu du JSON
+        journal: ModelJournal (voir open_journal) : seules les
+            modifications depuis la sauvegarde précédente sont ajoutées
+            au journal au lieu d'écrire un nouveau fichier complet
     
     Returns:
         Path du fichier sauvegardé
     """
     import json
     
+    if journal is not None:
+        count = journal.sync(principles_data, settings={
+            'language': state.language,
+            'visible_layers': state.visible_layers,
+            'exclusive_layer': state.exclusive_layer
+        })
+        logger.info(f"État journalisé ({count} modifications): {journal.journal_path}")
+        return journal.journal_path
+    
     model_state = {
         'version': '0.2.0',
         'timestamp': datetime.now().isoformat(),
@@ -246,19 +610,20 @@ def save_complete_state(state, principles_data):
         'exclusive_layer': state.exclusive_layer
     }
     
-    filename = f"tscp_complete_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-    filepath = MODEL_DIR / filename
+    model_dir = get_path('models')
+    model_dir.mkdir(parents=True, exist_ok=True)
     
-    MODEL_DIR.mkdir(parents=True, exist_ok=True)
+    if binary:
+        filename = f"tscp_complete_{datetime.now().strftime('%Y%m%d_%H%M%S')}.npz"
+        filepath = _binary_module().save_binary(model_state, model_dir / filename)
+        logger.info(f"État complet sauvegardé: {filepath}")
+        return filepath
+    
+    filename = f"tscp_complete_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    filepath = model_dir / filename
     
     with open(filepath, 'w', encoding='utf-8') as f:
         json.dump(model_state, f, indent=2, ensure_ascii=False)
     
-    print(f"✅ État complet sauvegardé: {filepath}")
+    logger.info(f"État complet sauvegardé: {filepath}")
     return filepath
-
-
-# Initialisation
-print("✅ Module TranSysTor Core chargé")
-print(f"📂 Répertoire modèles: {MODEL_DIR.absolute()}")
-print(f"📂 Répertoire exports: {EXPORT_DIR.absolute()}")
\ No newline at end of file
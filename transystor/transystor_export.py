@@ -1,163 +1,419 @@
 """
 TranSysTor Export Module
-Export sémantique : OWL, RDFS, SHACL
+Export sémantique : OWL, RDFS, SHACL, N-Triples/N-Quads
 """
 
+import gzip
+import hashlib
+import io
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
 # Import relatif ou absolu
 try:
-    from transystor.transystor_core import EXPORT_DIR
+    from transystor.transystor_core import get_path, math_module
+    from transystor.core.index import PrincipleIndex
 except ImportError:
-    from transystor_core import EXPORT_DIR
+    from transystor_core import get_path, math_module
+    from core.index import PrincipleIndex
 
+logger = logging.getLogger(__name__)
 
-def export_to_owl(principles_data, model_name="TSCP"):
+# Taille du tampon d'écriture des exports en flux (octets)
+STREAM_BUFFER_SIZE = 1 << 16
+
+
+# Classe OWL/RDFS de chaque couche
+LAYER_CLASSES = {
+    'CM0': 'CM0_MetaMetaClass',
+    'CM1': 'CM1_MetaClass',
+    'CM2': 'CM2_Class',
+    'CM3': 'CM3_Instance'
+}
+
+
+def safe_name(name):
+    """Convertit un nom de principe en nom local Turtle"""
+    return name.replace(' ', '_').replace("'", '')
+
+
+def principle_records(principles_data):
     """
-    Génère une ontologie OWL du modèle
+    Normalise les principes pour l'ensemble des exports (OWL, SHACL,
+    RDFS) : noms sûrs, classe de couche, cibles de derives résolues et
+    score d'orthogonalité précalculé par principe
     
     Args:
-        principles_data: Liste des principes
-        model_name: Nom du modèle
+        principles_data: Liste des principes ou PrincipleStore (scores
+            calculés sur sa colonne de positions)
     
-    Returns:
-        Contenu OWL en format Turtle
+    Yields:
+        Dicts normalisés, un par principe
     """
+    # NumPy et SciPy ne sont chargés qu'au premier export
+    principle_orthogonality_scores = math_module('collinearity').principle_orthogonality_scores
     
-    owl_content = f"""@prefix : <http://transystor.org/ontology/{model_name.lower()}#> .
-@prefix owl: <http://www.w3.org/2002/07/owl#> .
-@prefix rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#> .
-@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
-@prefix xsd: <http://www.w3.org/2001/XMLSchema#> .
+    # Index pour résoudre les cibles de derives
+    index = PrincipleIndex(principles_data)
+    scores = principle_orthogonality_scores(principles_data)
+    
+    for p in principles_data:
+        layer = p.get('layer', 'CM1')
+        
+        derives = []
+        for derive in p.get('derives') or []:
+            target = index.resolve(derive)
+            if target is not None:
+                derives.append(safe_name(target['name']))
+            else:
+                derives.append(derive.split()[0].replace(' ', '_'))
+        
+        yield {
+            'name': p['name'],
+            'safe_name': safe_name(p['name']),
+            'layer': layer,
+            'layer_class': LAYER_CLASSES.get(layer, 'CM1_MetaClass'),
+            'position': p.get('position', []),
+            'color': p.get('color', '#000000'),
+            'description': p.get('description'),
+            'derives': derives,
+            'combination': p.get('combination'),
+            'orthogonality_score': scores.get(p['name'])
+        }
 
-:{model_name} rdf:type owl:Ontology ;
-    rdfs:label "{model_name} Ontology"@en ;
-    rdfs:label "Ontologie {model_name}"@fr ;
-    rdfs:comment "Framework TSCP - Principes Transdisciplinaires de Construction de Systèmes"@fr ;
-    rdfs:comment "TSCP Framework - Transdisciplinary Principles for System Construction"@en ;
-    owl:versionInfo "0.2.0" ;
-    owl:versionIRI <http://transystor.org/ontology/{model_name.lower()}/0.2.0> .
 
-# ============================================================================
-# Classes pour les couches
-# ============================================================================
+# Préfixes de l'ontologie OWL (':' est l'espace du modèle)
+OWL_PREFIXES = {
+    'owl': 'http://www.w3.org/2002/07/owl#',
+    'rdf': 'http://www.w3.org/1999/02/22-rdf-syntax-ns#',
+    'rdfs': 'http://www.w3.org/2000/01/rdf-schema#',
+    'xsd': 'http://www.w3.org/2001/XMLSchema#'
+}
 
-:CM0_MetaMetaClass rdf:type owl:Class ;
-    rdfs:label "Meta-Metaclasse"@fr, "Meta-Metaclass"@en ;
-    rdfs:comment "Couche CM0 - Meta-métamodèle"@fr ;
-    rdfs:comment "Layer CM0 - Meta-metamodel"@en .
+# Schéma OWL : sections (titre, [(sujet, [(prédicat, [objets])])]) en
+# termes Turtle, partagé par les sérialisations Turtle et N-Triples
+OWL_SCHEMA = (
+    ("Classes pour les couches", [
+        (':CM0_MetaMetaClass', [
+            ('rdf:type', ['owl:Class']),
+            ('rdfs:label', ['"Meta-Metaclasse"@fr', '"Meta-Metaclass"@en']),
+            ('rdfs:comment', ['"Couche CM0 - Meta-métamodèle"@fr']),
+            ('rdfs:comment', ['"Layer CM0 - Meta-metamodel"@en'])
+        ]),
+        (':CM1_MetaClass', [
+            ('rdf:type', ['owl:Class']),
+            ('rdfs:label', ['"Metaclasse"@fr', '"Metaclass"@en']),
+            ('rdfs:comment', ['"Couche CM1 - Métamodèle (Cube 3×3×3)"@fr']),
+            ('rdfs:comment', ['"Layer CM1 - Metamodel (Cube 3×3×3)"@en'])
+        ]),
+        (':CM2_Class', [
+            ('rdf:type', ['owl:Class']),
+            ('rdfs:label', ['"Classe"@fr', '"Class"@en']),
+            ('rdfs:comment', ['"Couche CM2 - Modèle (Cube 4×4×4)"@fr']),
+            ('rdfs:comment', ['"Layer CM2 - Model (Cube 4×4×4)"@en'])
+        ]),
+        (':CM3_Instance', [
+            ('rdf:type', ['owl:Class']),
+            ('rdfs:label', ['"Instance"@fr', '"Instance"@en']),
+            ('rdfs:comment', ['"Couche CM3 - Systèmes réels (Cube 5×5×5)"@fr']),
+            ('rdfs:comment', ['"Layer CM3 - Real systems (Cube 5×5×5)"@en'])
+        ])
+    ]),
+    ("Propriétés de données", [
+        (':hasPosition', [
+            ('rdf:type', ['owl:DatatypeProperty']),
+            ('rdfs:domain', ['owl:Thing']),
+            ('rdfs:range', ['xsd:string']),
+            ('rdfs:label', ['"a pour position"@fr', '"has position"@en']),
+            ('rdfs:comment', ['"Position [I, J, K] dans le cube"@fr'])
+        ]),
+        (':hasDescription', [
+            ('rdf:type', ['owl:DatatypeProperty']),
+            ('rdfs:domain', ['owl:Thing']),
+            ('rdfs:range', ['xsd:string']),
+            ('rdfs:label', ['"a pour description"@fr', '"has description"@en'])
+        ]),
+        (':hasColor', [
+            ('rdf:type', ['owl:DatatypeProperty']),
+            ('rdfs:domain', ['owl:Thing']),
+            ('rdfs:range', ['xsd:string']),
+            ('rdfs:label', ['"a pour couleur"@fr', '"has color"@en'])
+        ]),
+        (':orthogonalityScore', [
+            ('rdf:type', ['owl:DatatypeProperty']),
+            ('rdfs:domain', ['owl:Thing']),
+            ('rdfs:range', ['xsd:decimal']),
+            ('rdfs:label', ['"score d\'orthogonalité"@fr', '"orthogonality score"@en']),
+            ('rdfs:comment', ['"1 - |cos| avec le principe le plus colinéaire"@fr'])
+        ])
+    ]),
+    ("Propriétés d'objets", [
+        (':belongsToLayer', [
+            ('rdf:type', ['owl:ObjectProperty']),
+            ('rdfs:domain', ['owl:Thing']),
+            ('rdfs:label', ['"appartient à la couche"@fr', '"belongs to layer"@en'])
+        ]),
+        (':tensorProduct', [
+            ('rdf:type', ['owl:ObjectProperty']),
+            ('rdfs:label', ['"produit tensoriel"@fr', '"tensor product"@en']),
+            ('rdfs:comment', ['"Combinaison de principes (opérateur ⊗)"@fr']),
+            ('rdfs:comment', ['"Combination of principles (operator ⊗)"@en'])
+        ]),
+        (':derivesFrom', [
+            ('rdf:type', ['owl:ObjectProperty']),
+            ('rdfs:label', ['"dérive de"@fr', '"derives from"@en']),
+            ('rdfs:comment', ['"Héritage ou sous-classe (⊂)"@fr'])
+        ]),
+        (':hasRelation', [
+            ('rdf:type', ['owl:ObjectProperty']),
+            ('rdfs:label', ['"a pour relation"@fr', '"has relation"@en'])
+        ])
+    ])
+)
 
-:CM1_MetaClass rdf:type owl:Class ;
-    rdfs:label "Metaclasse"@fr, "Metaclass"@en ;
-    rdfs:comment "Couche CM1 - Métamodèle (Cube 3×3×3)"@fr ;
-    rdfs:comment "Layer CM1 - Metamodel (Cube 3×3×3)"@en .
+_SECTION_RULE = "# " + "=" * 76
 
-:CM2_Class rdf:type owl:Class ;
-    rdfs:label "Classe"@fr, "Class"@en ;
-    rdfs:comment "Couche CM2 - Modèle (Cube 4×4×4)"@fr ;
-    rdfs:comment "Layer CM2 - Model (Cube 4×4×4)"@en .
 
-:CM3_Instance rdf:type owl:Class ;
-    rdfs:label "Instance"@fr, "Instance"@en ;
-    rdfs:comment "Couche CM3 - Systèmes réels (Cube 5×5×5)"@fr ;
-    rdfs:comment "Layer CM3 - Real systems (Cube 5×5×5)"@en .
+def _literal(text, lang=None):
+    """Retourne un littéral Turtle (échappement compatible N-Triples)"""
+    text = str(text).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n').replace('\r', '\\r')
+    return f'"{text}"@{lang}' if lang else f'"{text}"'
 
-# ============================================================================
-# Propriétés de données
-# ============================================================================
 
-:hasPosition rdf:type owl:DatatypeProperty ;
-    rdfs:domain owl:Thing ;
-    rdfs:range xsd:string ;
-    rdfs:label "a pour position"@fr, "has position"@en ;
-    rdfs:comment "Position [I, J, K] dans le cube"@fr .
+def owl_namespace(model_name="TSCP"):
+    """Retourne l'IRI de l'espace de noms ':' d'un modèle"""
+    return f"http://transystor.org/ontology/{model_name.lower()}#"
 
-:hasDescription rdf:type owl:DatatypeProperty ;
-    rdfs:domain owl:Thing ;
-    rdfs:range xsd:string ;
-    rdfs:label "a pour description"@fr, "has description"@en .
 
-:hasColor rdf:type owl:DatatypeProperty ;
-    rdfs:domain owl:Thing ;
-    rdfs:range xsd:string ;
-    rdfs:label "a pour couleur"@fr, "has color"@en .
+def ontology_statements(model_name="TSCP"):
+    """
+    Retourne la déclaration d'ontologie du modèle
+    
+    Returns:
+        Tuple (sujet, [(prédicat, [objets])]) en termes Turtle
+    """
+    return (f':{model_name}', [
+        ('rdf:type', ['owl:Ontology']),
+        ('rdfs:label', [_literal(f"{model_name} Ontology", 'en')]),
+        ('rdfs:label', [_literal(f"Ontologie {model_name}", 'fr')]),
+        ('rdfs:comment', [_literal("Framework TSCP - Principes Transdisciplinaires de Construction de Systèmes", 'fr')]),
+        ('rdfs:comment', [_literal("TSCP Framework - Transdisciplinary Principles for System Construction", 'en')]),
+        ('owl:versionInfo', ['"0.2.0"']),
+        ('owl:versionIRI', [f'<http://transystor.org/ontology/{model_name.lower()}/0.2.0>'])
+    ])
 
-# ============================================================================
-# Propriétés d'objets
-# ============================================================================
 
-:belongsToLayer rdf:type owl:ObjectProperty ;
-    rdfs:domain owl:Thing ;
-    rdfs:label "appartient à la couche"@fr, "belongs to layer"@en .
+def principle_statements(record):
+    """
+    Traduit un principe normalisé en triplets OWL
+    
+    Correspondance unique principe -> triplets, utilisée par les
+    sérialisations Turtle (iter_owl) et N-Triples/N-Quads (iter_ntriples)
+    
+    Args:
+        record: Principe normalisé par principle_records
+    
+    Returns:
+        Tuple (sujet, [(prédicat, [objets])]) en termes Turtle
+    """
+    statements = [
+        ('rdf:type', [f":{record['layer_class']}"]),
+        ('rdfs:label', [_literal(record['name'], 'fr')]),
+        (':hasPosition', [_literal(record['position'])]),
+        (':hasColor', [_literal(record['color'])]),
+        (':belongsToLayer', [f":{record['layer']}"])
+    ]
+    
+    if record['description'] is not None:
+        statements.append((':hasDescription', [_literal(record['description'], 'fr')]))
+    
+    for derive_safe in record['derives']:
+        statements.append((':derivesFrom', [f":{derive_safe}"]))
+    
+    if record['combination'] is not None:
+        statements.append(('rdfs:comment', [_literal(f"Combinaison: {record['combination']}", 'fr')]))
+    
+    if record['orthogonality_score'] is not None:
+        statements.append((':orthogonalityScore', [f"{record['orthogonality_score']:.6f}"]))
+    
+    return f":{record['safe_name']}", statements
+
 
-:tensorProduct rdf:type owl:ObjectProperty ;
-    rdfs:label "produit tensoriel"@fr, "tensor product"@en ;
-    rdfs:comment "Combinaison de principes (opérateur ⊗)"@fr ;
-    rdfs:comment "Combination of principles (operator ⊗)"@en .
+def owl_header(model_name="TSCP"):
+    """Retourne l'en-tête Turtle (préfixes, ontologie, schéma) d'un modèle"""
+    header = [f"@prefix : <{owl_namespace(model_name)}> .\n"]
+    header += [f"@prefix {prefix}: <{iri}> .\n" for prefix, iri in OWL_PREFIXES.items()]
+    header.append("\n")
+    
+    subject, statements = ontology_statements(model_name)
+    header.append(f"{subject} " + " ;\n    ".join(
+        f"{predicate} {', '.join(objects)}" for predicate, objects in statements
+    ) + " .\n")
+    
+    for title, subjects in OWL_SCHEMA:
+        header.append(f"\n{_SECTION_RULE}\n# {title}\n{_SECTION_RULE}\n")
+        for subject, statements in subjects:
+            header.append(f"\n{subject} " + " ;\n    ".join(
+                f"{predicate} {', '.join(objects)}" for predicate, objects in statements
+            ) + " .\n")
+    
+    header.append(f"\n{_SECTION_RULE}\n# Principes\n{_SECTION_RULE}\n\n")
+    return ''.join(header)
 
-:derivesFrom rdf:type owl:ObjectProperty ;
-    rdfs:label "dérive de"@fr, "derives from"@en ;
-    rdfs:comment "Héritage ou sous-classe (⊂)"@fr .
 
-:hasRelation rdf:type owl:ObjectProperty ;
-    rdfs:label "a pour relation"@fr, "has relation"@en .
+def owl_block(record):
+    """Retourne le bloc Turtle d'un principe normalisé"""
+    subject, statements = principle_statements(record)
+    return f"\n{subject} " + "".join(
+        f"{predicate} {', '.join(objects)} ;\n    " for predicate, objects in statements
+    ) + ".\n"
 
-# ============================================================================
-# Principes
-# ============================================================================
 
-"""
+def iter_owl(principles_data, model_name="TSCP", records=None):
+    """
+    Génère une ontologie OWL du modèle par morceaux
     
-    # Ajouter chaque principe
-    for p in principles_data:
-        safe_name = p['name'].replace(' ', '_').replace("'", '')
-        layer = p.get('layer', 'CM1')
-        
-        layer_class_map = {
-            'CM0': ':CM0_MetaMetaClass',
-            'CM1': ':CM1_MetaClass',
-            'CM2': ':CM2_Class',
-            'CM3': ':CM3_Instance'
-        }
-        
-        layer_class = layer_class_map.get(layer, ':CM1_MetaClass')
-        
-        owl_content += f"\n:{safe_name} rdf:type {layer_class} ;\n"
-        owl_content += f'    rdfs:label "{p["name"]}"@fr ;\n'
-        owl_content += f'    :hasPosition "{p.get("position", [])}" ;\n'
-        owl_content += f'    :hasColor "{p.get("color", "#000000")}" ;\n'
-        owl_content += f'    :belongsToLayer :{layer} ;\n'
-        
-        if 'description' in p:
-            desc = p['description'].replace('"', '\\"')
-            owl_content += f'    :hasDescription "{desc}"@fr ;\n'
-        
-        if 'derives' in p and p['derives']:
-            for derive in p['derives']:
-                derive_safe = derive.split()[0].replace(' ', '_')
-                owl_content += f'    :derivesFrom :{derive_safe} ;\n'
-        
-        if 'combination' in p:
-            owl_content += f'    rdfs:comment "Combinaison: {p["combination"]}"@fr ;\n'
-        
-        owl_content += "    .\n"
+    Args:
+        principles_data: Liste des principes
+        model_name: Nom du modèle
+        records: Principes déjà normalisés par principle_records (partagés
+            entre formats), sinon calculés ici
+    
+    Yields:
+        Morceaux du contenu OWL en format Turtle (en-tête puis un bloc
+        par principe)
+    """
+    yield owl_header(model_name)
     
-    return owl_content
+    if records is None:
+        records = principle_records(principles_data)
+    
+    # Un bloc par principe
+    for r in records:
+        yield owl_block(r)
 
 
-def export_to_shacl(principles_data):
+def _nt_term(term, namespace):
     """
-    Génère des contraintes SHACL pour validation
+    Convertit un terme Turtle de la correspondance OWL en terme N-Triples
+    
+    Args:
+        term: Terme Turtle (':local', 'prefix:local', '<iri>', littéral
+            ou nombre décimal)
+        namespace: IRI de l'espace ':'
+    
+    Returns:
+        Terme N-Triples
+    """
+    if term.startswith(('"', '<')):
+        return term
+    if term[0].isdigit() or term[0] in '+-.':
+        return f'"{term}"^^<{OWL_PREFIXES["xsd"]}decimal>'
+    
+    prefix, local = term.split(':', 1)
+    base = OWL_PREFIXES[prefix] if prefix else namespace
+    return f"<{base}{_iri_escape(local)}>"
+
+
+def _iri_escape(local):
+    # Caractères interdits dans un IRIREF N-Triples
+    return ''.join(f"%{ord(c):02X}" if c in ' <>"{}|^`\\' else c for c in local)
+
+
+def _nt_lines(subject, statements, namespace, graph=None):
+    subject = _nt_term(subject, namespace)
+    end = f" <{graph}> .\n" if graph else " .\n"
+    return ''.join(
+        f"{subject} {_nt_term(predicate, namespace)} {_nt_term(obj, namespace)}{end}"
+        for predicate, objects in statements
+        for obj in objects
+    )
+
+
+def iter_ntriples(principles_data, model_name="TSCP", records=None, graph=None):
+    """
+    Génère l'ontologie OWL en N-Triples (ou N-Quads) par morceaux
+    
+    Mêmes triplets que iter_owl, un par ligne et sans préfixes : le
+    fichier peut être découpé à n'importe quelle fin de ligne et chargé
+    en parallèle par un triple store.
+    
+    Args:
+        principles_data: Liste des principes
+        model_name: Nom du modèle
+        records: Principes déjà normalisés par principle_records
+        graph: IRI du graphe nommé (produit du N-Quads si fourni)
+    
+    Yields:
+        Morceaux de lignes (schéma puis un bloc par principe)
+    """
+    namespace = owl_namespace(model_name)
+    
+    header = [_nt_lines(*ontology_statements(model_name), namespace, graph)]
+    for _, subjects in OWL_SCHEMA:
+        for subject, statements in subjects:
+            header.append(_nt_lines(subject, statements, namespace, graph))
+    yield ''.join(header)
+    
+    if records is None:
+        records = principle_records(principles_data)
+    
+    for r in records:
+        yield _nt_lines(*principle_statements(r), namespace, graph)
+
+
+def iter_nquads(principles_data, model_name="TSCP", records=None, graph=None):
+    """
+    Génère l'ontologie OWL en N-Quads par morceaux
     
     Args:
         principles_data: Liste des principes
+        model_name: Nom du modèle
+        records: Principes déjà normalisés par principle_records
+        graph: IRI du graphe nommé (défaut : IRI de version de l'ontologie)
+    
+    Yields:
+        Morceaux de lignes N-Quads
+    """
+    graph = graph or f"http://transystor.org/ontology/{model_name.lower()}/0.2.0"
+    return iter_ntriples(principles_data, model_name, records=records, graph=graph)
+
+
+def export_to_owl(principles_data, model_name="TSCP"):
+    """
+    Génère une ontologie OWL du modèle
+    
+    Args:
+        principles_data: Liste des principes
+        model_name: Nom du modèle
     
     Returns:
-        Contenu SHACL en format Turtle
+        Contenu OWL en format Turtle
     """
+    return ''.join(iter_owl(principles_data, model_name))
+
+
+def iter_shacl(principles_data, records=None):
+    """
+    Génère des contraintes SHACL et les données de validation par morceaux
     
-    shacl_content = """@prefix sh: <http://www.w3.org/ns/shacl#> .
+    Args:
+        principles_data: Liste des principes
+        records: Principes déjà normalisés par principle_records
+    
+    Yields:
+        Morceaux du contenu SHACL en format Turtle (formes puis un bloc
+        de données par principe)
+    """
+    
+    yield """@prefix sh: <http://www.w3.org/ns/shacl#> .
 @prefix tscp: <http://transystor.org/ontology/tscp#> .
 @prefix xsd: <http://www.w3.org/2001/XMLSchema#> .
 @prefix rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#> .
@@ -238,25 +494,58 @@ tscp:DescriptionShape a sh:NodeShape ;
         sh:minLength 10 ;
         sh:message "Chaque principe doit avoir une description d'au moins 10 caractères"@fr ;
     ] .
+
+# ============================================================================
+# Données de validation (scores d'orthogonalité précalculés)
+# ============================================================================
 """
     
-    return shacl_content
+    if records is None:
+        records = principle_records(principles_data)
+    
+    for r in records:
+        block = [
+            f"\ntscp:{r['safe_name']} rdf:type tscp:{r['layer_class']} ;\n",
+            f"    tscp:hasPosition {_literal(r['position'])} ;\n"
+        ]
+        if r['description'] is not None:
+            # Littéral sans langue : DescriptionShape attend un xsd:string
+            block.append(f"    tscp:hasDescription {_literal(r['description'])} ;\n")
+        if r['orthogonality_score'] is not None:
+            block.append(f"    tscp:orthogonalityScore {r['orthogonality_score']:.6f} ;\n")
+        block.append(f"    tscp:belongsToLayer tscp:{r['layer']} .\n")
+        yield ''.join(block)
 
 
-def export_to_rdfs(principles_data):
+def export_to_shacl(principles_data):
     """
-    Génère un schéma RDFS simplifié
+    Génère des contraintes SHACL pour validation
     
     Args:
         principles_data: Liste des principes
     
     Returns:
-        Contenu RDFS en format Turtle
+        Contenu SHACL en format Turtle
     """
+    return ''.join(iter_shacl(principles_data))
+
+
+def iter_rdfs(principles_data, records=None):
+    """
+    Génère un schéma RDFS et les principes typés par morceaux
     
-    rdfs_content = """@prefix rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#> .
+    Args:
+        principles_data: Liste des principes
+        records: Principes déjà normalisés par principle_records
+    
+    Yields:
+        Morceaux du contenu RDFS en format Turtle
+    """
+    
+    yield """@prefix rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#> .
 @prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
 @prefix tscp: <http://transystor.org/ontology/tscp#> .
+@prefix xsd: <http://www.w3.org/2001/XMLSchema#> .
 
 # Classes de base
 tscp:Principle rdf:type rdfs:Class ;
@@ -275,9 +564,40 @@ tscp:hasPosition rdf:type rdf:Property ;
 
 tscp:belongsToLayer rdf:type rdf:Property ;
     rdfs:domain tscp:Principle .
+
+tscp:orthogonalityScore rdf:type rdf:Property ;
+    rdfs:domain tscp:Principle ;
+    rdfs:range xsd:decimal .
+
+# Principes
 """
     
-    return rdfs_content
+    if records is None:
+        records = principle_records(principles_data)
+    
+    for r in records:
+        block = [
+            f"\ntscp:{r['safe_name']} rdf:type tscp:{r['layer_class']} ;\n",
+            f"    rdfs:label {_literal(r['name'], 'fr')} ;\n",
+            f"    tscp:hasPosition {_literal(r['position'])} ;\n"
+        ]
+        if r['orthogonality_score'] is not None:
+            block.append(f"    tscp:orthogonalityScore {r['orthogonality_score']:.6f} ;\n")
+        block.append(f"    tscp:belongsToLayer tscp:{r['layer']} .\n")
+        yield ''.join(block)
+
+
+def export_to_rdfs(principles_data):
+    """
+    Génère un schéma RDFS simplifié
+    
+    Args:
+        principles_data: Liste des principes
+    
+    Returns:
+        Contenu RDFS en format Turtle
+    """
+    return ''.join(iter_rdfs(principles_data))
 
 
 def save_export(content, format_name, model_name="tscp"):
@@ -292,17 +612,514 @@ def save_export(content, format_name, model_name="tscp"):
     Returns:
         Path du fichier sauvegardé
     """
-    EXPORT_DIR.mkdir(parents=True, exist_ok=True)
+    export_dir = get_path('exports')
+    export_dir.mkdir(parents=True, exist_ok=True)
     
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     filename = f"{model_name}_{format_name}_{timestamp}.ttl"
-    filepath = EXPORT_DIR / filename
+    filepath = export_dir / filename
     
     with open(filepath, 'w', encoding='utf-8') as f:
         f.write(content)
     
-    print(f"✅ Export {format_name.upper()} sauvegardé: {filepath}")
+    logger.info(f"Export {format_name.upper()} sauvegardé: {filepath}")
     return filepath
 
 
-print("✅ Module TranSysTor Export chargé")
\ No newline at end of file
+# Extensions des fichiers par format et par compression
+EXPORT_EXTENSIONS = {'owl': 'ttl', 'shacl': 'ttl', 'rdfs': 'ttl', 'nt': 'nt', 'nq': 'nq'}
+COMPRESSION_EXTENSIONS = {None: '', 'gzip': '.gz', 'zstd': '.zst'}
+
+
+def open_compressed(filepath, compression=None):
+    """
+    Ouvre un fichier binaire en écriture, compressé ou non
+    
+    Args:
+        filepath: Chemin du fichier
+        compression: None, 'gzip' ou 'zstd' (module zstandard requis)
+    
+    Returns:
+        Flux binaire à utiliser comme gestionnaire de contexte
+    """
+    if compression is None:
+        return open(filepath, 'wb', buffering=STREAM_BUFFER_SIZE)
+    if compression == 'gzip':
+        return gzip.open(filepath, 'wb', compresslevel=6)
+    if compression == 'zstd':
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("Compression zstd indisponible : pip install zstandard")
+        return zstandard.ZstdCompressor().stream_writer(open(filepath, 'wb'), closefd=True)
+    raise ValueError(f"Compression inconnue: {compression}")
+
+
+def write_export(chunks, sink, buffer_size=STREAM_BUFFER_SIZE):
+    """
+    Écrit un export morceau par morceau dans un fichier ou un flux io
+    
+    Args:
+        chunks: Itérable de morceaux de texte (ex: iter_owl(...))
+        sink: Chemin de fichier, flux texte ou flux binaire
+        buffer_size: Taille du tampon d'écriture
+    
+    Returns:
+        Nombre de caractères écrits
+    """
+    written = 0
+    
+    if isinstance(sink, (str, Path)):
+        with open(sink, 'w', encoding='utf-8', buffering=buffer_size) as f:
+            for chunk in chunks:
+                written += f.write(chunk)
+        return written
+    
+    if isinstance(sink, io.TextIOBase):
+        for chunk in chunks:
+            written += sink.write(chunk)
+        return written
+    
+    # Flux binaire : encodage UTF-8 à travers un tampon
+    buffered = sink if isinstance(sink, io.BufferedIOBase) else io.BufferedWriter(sink, buffer_size)
+    writer = io.TextIOWrapper(buffered, encoding='utf-8')
+    try:
+        for chunk in chunks:
+            written += writer.write(chunk)
+        writer.flush()
+    finally:
+        writer.detach()
+    return written
+
+
+def save_export_stream(chunks, format_name, model_name="tscp"):
+    """
+    Sauvegarde un export en flux dans le répertoire exports/
+    
+    Args:
+        chunks: Itérable de morceaux de texte
+        format_name: Format (owl, shacl, rdfs)
+        model_name: Nom du modèle
+    
+    Returns:
+        Path du fichier sauvegardé
+    """
+    export_dir = get_path('exports')
+    export_dir.mkdir(parents=True, exist_ok=True)
+    
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    filename = f"{model_name}_{format_name}_{timestamp}.ttl"
+    filepath = export_dir / filename
+    
+    write_export(chunks, filepath)
+    
+    logger.info(f"Export {format_name.upper()} sauvegardé: {filepath}")
+    return filepath
+
+
+def save_triples(principles_data, format_name='nt', model_name="tscp", compression=None,
+                 records=None):
+    """
+    Sauvegarde l'ontologie en N-Triples ou N-Quads, éventuellement compressée
+    
+    Args:
+        principles_data: Liste des principes
+        format_name: 'nt' (N-Triples) ou 'nq' (N-Quads)
+        model_name: Nom du modèle
+        compression: None, 'gzip' ou 'zstd'
+        records: Principes déjà normalisés par principle_records
+    
+    Returns:
+        Path du fichier sauvegardé
+    """
+    if format_name not in ('nt', 'nq'):
+        raise ValueError(f"Format inconnu: {format_name}")
+    if compression not in COMPRESSION_EXTENSIONS:
+        raise ValueError(f"Compression inconnue: {compression}")
+    
+    export_dir = get_path('exports')
+    export_dir.mkdir(parents=True, exist_ok=True)
+    
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    filename = f"{model_name}_{format_name}_{timestamp}.{format_name}{COMPRESSION_EXTENSIONS[compression]}"
+    filepath = export_dir / filename
+    
+    render = iter_nquads if format_name == 'nq' else iter_ntriples
+    with open_compressed(filepath, compression) as f:
+        for chunk in render(principles_data, model_name, records=records):
+            f.write(chunk.encode('utf-8'))
+    
+    logger.info(f"Export {format_name.upper()} sauvegardé: {filepath}")
+    return filepath
+
+
+# Générateurs par format (consomment les principes normalisés)
+EXPORT_FORMATS = {
+    'owl': lambda records, model_name: iter_owl(None, model_name, records=records),
+    'shacl': lambda records, model_name: iter_shacl(None, records=records),
+    'rdfs': lambda records, model_name: iter_rdfs(None, records=records),
+    'nt': lambda records, model_name: iter_ntriples(None, model_name, records=records),
+    'nq': lambda records, model_name: iter_nquads(None, model_name, records=records)
+}
+
+
+def _render_format(format_name, records, model_name, filepath):
+    """
+    Rend un format dans un fichier (exécuté dans le pool)
+    
+    Returns:
+        Tuple (format, durée en secondes)
+    """
+    start = time.perf_counter()
+    # Le générateur est retrouvé par son nom : seul ce nom traverse pickle
+    render = EXPORT_FORMATS[format_name]
+    write_export(render(records, model_name), filepath)
+    return format_name, time.perf_counter() - start
+
+
+def _unique_path(directory, stem, extension=''):
+    """
+    Retourne un chemin libre dans un répertoire : deux exports dans la
+    même seconde reçoivent un suffixe (_1, _2...) au lieu de s'écraser
+    """
+    path = directory / f"{stem}{extension}"
+    suffix = 1
+    while path.exists():
+        path = directory / f"{stem}_{suffix}{extension}"
+        suffix += 1
+    return path
+
+
+def export_all(principles_data, formats=('owl', 'shacl', 'rdfs'), model_name="tscp",
+               executor='thread', max_workers=None, export_dir=None):
+    """
+    Exporte plusieurs formats en une passe dans un répertoire horodaté
+    
+    Les principes sont normalisés une seule fois puis chaque format est
+    rendu en parallèle dans un répertoire temporaire, renommé en une
+    opération atomique : un bundle est complet ou absent.
+    
+    Args:
+        principles_data: Liste des principes ou PrincipleStore
+        formats: Formats à exporter (clés de EXPORT_FORMATS)
+        model_name: Nom du modèle
+        executor: 'thread' ou 'process'
+        max_workers: Taille du pool (défaut : un worker par format)
+        export_dir: Répertoire parent (défaut get_path('exports'))
+    
+    Returns:
+        Dict {'path', 'files': {format: Path}, 'timings': {format: s}}
+    """
+    unknown = [f for f in formats if f not in EXPORT_FORMATS]
+    if unknown:
+        raise ValueError(f"Formats inconnus: {', '.join(unknown)}")
+    if executor not in ('thread', 'process'):
+        raise ValueError(f"Exécuteur inconnu: {executor}")
+    
+    export_dir = Path(export_dir) if export_dir is not None else get_path('exports')
+    export_dir.mkdir(parents=True, exist_ok=True)
+    
+    timings = {}
+    start = time.perf_counter()
+    records = list(principle_records(principles_data))
+    timings['normalize'] = time.perf_counter() - start
+    
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    staging = Path(tempfile.mkdtemp(prefix=f".{model_name}_{timestamp}_", dir=export_dir))
+    
+    pool_class = ProcessPoolExecutor if executor == 'process' else ThreadPoolExecutor
+    filenames = {f: f"{model_name}_{f}.{EXPORT_EXTENSIONS[f]}" for f in formats}
+    
+    try:
+        with pool_class(max_workers=max_workers or len(formats) or 1) as pool:
+            futures = [
+                pool.submit(_render_format, f, records, model_name, staging / filenames[f])
+                for f in formats
+            ]
+            for future in futures:
+                format_name, elapsed = future.result()
+                timings[format_name] = elapsed
+        
+        bundle = _unique_path(export_dir, f"{model_name}_{timestamp}")
+        os.replace(staging, bundle)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    
+    timings['total'] = time.perf_counter() - start
+    
+    for format_name in formats:
+        logger.info(f"Export {format_name.upper()} : {timings[format_name]:.3f}s")
+    logger.info(f"Bundle sauvegardé: {bundle}")
+    
+    return {
+        'path': bundle,
+        'files': {f: bundle / filenames[f] for f in formats},
+        'timings': timings
+    }
+
+
+
+# Version de la correspondance principe -> triplets : un changement
+# invalide les manifestes et caches d'export incrémental existants
+EXPORT_MAPPING_VERSION = 1
+
+
+def _atomic_write(filepath, data):
+    """Écrit des octets via un fichier temporaire renommé"""
+    tmp = filepath.with_name(f".{filepath.name}.tmp")
+    with open(tmp, 'wb', buffering=STREAM_BUFFER_SIZE) as f:
+        f.write(data)
+    os.replace(tmp, filepath)
+
+
+class ExportCache:
+    """
+    Cache d'export incrémental adressé par contenu
+    
+    Les principes normalisés sont ajoutés à un fichier pack (une ligne
+    JSON par empreinte nouvelle) ; le manifeste du dernier export associe
+    chaque sujet à son empreinte, à sa ligne dans le pack et à la position
+    (en octets) de son bloc dans le dernier fichier Turtle complet.
+    """
+    
+    def __init__(self, export_dir=None, model_name="tscp"):
+        """
+        Args:
+            export_dir: Répertoire des exports (défaut get_path('exports'))
+            model_name: Nom du modèle
+        """
+        self.export_dir = Path(export_dir) if export_dir is not None else get_path('exports')
+        self.model_name = model_name
+        self.cache_dir = self.export_dir / '.cache'
+        self.manifest_path = self.cache_dir / f"{model_name}_owl.manifest.json"
+        self.pack_path = self.cache_dir / f"{model_name}_owl.pack"
+    
+    def get(self, offset):
+        """Relit le principe normalisé rangé à une position du pack"""
+        with open(self.pack_path, 'rb') as f:
+            f.seek(offset)
+            return json.loads(f.readline())
+    
+    def put_many(self, records, reset=False):
+        """
+        Ajoute des principes normalisés au pack
+        
+        Args:
+            records: Principes normalisés
+            reset: Réécrit le pack au lieu de le compléter (compactage)
+        
+        Returns:
+            Liste des positions de chaque principe dans le pack
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        offsets = []
+        
+        with open(self.pack_path, 'wb' if reset else 'ab', buffering=STREAM_BUFFER_SIZE) as f:
+            position = f.tell()
+            for record in records:
+                line = json.dumps(record, ensure_ascii=False).encode('utf-8') + b'\n'
+                offsets.append(position)
+                f.write(line)
+                position += len(line)
+        
+        return offsets
+    
+    def load_manifest(self):
+        """
+        Charge le manifeste du dernier export
+        
+        Returns:
+            Dict du manifeste, ou None s'il est absent ou d'une autre
+            version de correspondance
+        """
+        try:
+            with open(self.manifest_path, encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        
+        if manifest.get('mapping_version') != EXPORT_MAPPING_VERSION or not self.pack_path.exists():
+            return None
+        return manifest
+    
+    def save_manifest(self, file_name, blocks, pack_entries):
+        """
+        Enregistre le manifeste de l'export courant
+        
+        Args:
+            file_name: Dernier fichier Turtle complet
+            blocks: Liste [sujet, empreinte, pack, début, fin] (début et
+                fin None si le bloc n'est pas dans ce fichier)
+            pack_entries: Nombre de lignes du pack
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        manifest = {
+            'mapping_version': EXPORT_MAPPING_VERSION,
+            'model_name': self.model_name,
+            'file': file_name,
+            'pack_entries': pack_entries,
+            'blocks': blocks
+        }
+        _atomic_write(self.manifest_path, json.dumps(manifest, ensure_ascii=False).encode('utf-8'))
+
+
+def record_fingerprint(record):
+    """
+    Calcule l'empreinte d'un principe normalisé
+    
+    Les clés de principle_records sont dans un ordre fixe : le repr des
+    paires suffit (bien plus rapide qu'un JSON canonique sur de grands
+    modèles).
+    """
+    return hashlib.sha1(repr(tuple(record.items())).encode('utf-8')).hexdigest()
+
+
+def _block_triples(record, namespace):
+    """Retourne l'ensemble des lignes N-Triples d'un principe normalisé"""
+    return set(_nt_lines(*principle_statements(record), namespace).splitlines())
+
+
+def export_incremental(principles_data, model_name="tscp", mode='patch', export_dir=None,
+                       cache=None):
+    """
+    Exporte l'ontologie OWL en ne rendant que les principes modifiés
+    
+    Les principes normalisés sont comparés par empreinte au manifeste du
+    dernier export. En mode 'patch', un nouveau fichier Turtle complet est
+    assemblé en recopiant les blocs inchangés du fichier précédent. En
+    mode 'diff', seuls les triplets ajoutés et retirés sont écrits (format
+    RDF Patch : lignes A/D en N-Triples). Sans export précédent, le mode
+    'diff' produit un fichier complet.
+    
+    Coût : la normalisation (principle_records) reste complète à chaque
+    appel, car déplacer un principe peut changer le score d'orthogonalité
+    de tout principe dont il est (ou devient) le plus colinéaire ; elle
+    coûte O(n log n) (index de colinéarité) plus O(n) pour les empreintes.
+    Le gain porte sur le rendu Turtle et l'écriture du pack, limités aux
+    principes modifiés.
+    
+    Args:
+        principles_data: Liste des principes
+        model_name: Nom du modèle
+        mode: 'patch' ou 'diff'
+        export_dir: Répertoire des exports (défaut get_path('exports'))
+        cache: ExportCache à utiliser (sinon créé pour export_dir)
+    
+    Returns:
+        Dict {'path', 'mode', 'added', 'modified', 'removed', 'unchanged'}
+    
+    Raises:
+        ValueError: Mode inconnu, ou deux principes ayant le même sujet
+            Turtle (nom en double, ou noms distincts comme 'A B' et 'A_B')
+    """
+    if mode not in ('patch', 'diff'):
+        raise ValueError(f"Mode inconnu: {mode}")
+    
+    cache = cache or ExportCache(export_dir, model_name)
+    cache.export_dir.mkdir(parents=True, exist_ok=True)
+    
+    records = list(principle_records(principles_data))
+    subjects = [f":{r['safe_name']}" for r in records]
+    
+    # Le manifeste est indexé par sujet : une collision mêlerait deux blocs
+    owners = {}
+    for subject, record in zip(subjects, records):
+        if subject in owners:
+            raise ValueError(
+                f"Sujet {subject} partagé par '{owners[subject]}' et '{record['name']}'"
+            )
+        owners[subject] = record['name']
+    fingerprints = [record_fingerprint(r) for r in records]
+    
+    manifest = cache.load_manifest()
+    previous = {}
+    if manifest is not None:
+        previous = {block[0]: block[1:] for block in manifest['blocks']}
+    
+    # Seuls les principes nouveaux ou modifiés sont rendus et mis en cache
+    changed = [i for i, (subject, fp) in enumerate(zip(subjects, fingerprints))
+               if previous.get(subject, (None,))[0] != fp]
+    current = set(subjects)
+    removed = [subject for subject in previous if subject not in current]
+    added = [subjects[i] for i in changed if subjects[i] not in previous]
+    modified = [subjects[i] for i in changed if subjects[i] in previous]
+    
+    pack_entries = manifest['pack_entries'] if manifest is not None else 0
+    # Pack trop chargé d'entrées mortes : réécrit avec les seuls principes vivants
+    compact = mode == 'patch' and pack_entries + len(changed) > 2 * len(records) + 1024
+    
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    
+    if mode == 'diff' and manifest is not None:
+        namespace = owl_namespace(model_name)
+        deleted, inserted = [], []
+        
+        for subject in removed:
+            deleted.extend(sorted(_block_triples(cache.get(previous[subject][1]), namespace)))
+        for i in changed:
+            new = _block_triples(records[i], namespace)
+            old = set()
+            if subjects[i] in previous:
+                old = _block_triples(cache.get(previous[subjects[i]][1]), namespace)
+            deleted.extend(sorted(old - new))
+            inserted.extend(sorted(new - old))
+        
+        lines = ["TX ."] + [f"D {t}" for t in deleted] + [f"A {t}" for t in inserted] + ["TC ."]
+        filepath = _unique_path(cache.export_dir, f"{model_name}_owl_diff_{timestamp}", '.rdfp')
+        _atomic_write(filepath, ('\n'.join(lines) + '\n').encode('utf-8'))
+        
+        packed = dict(zip(changed, cache.put_many([records[i] for i in changed])))
+        
+        # Le fichier complet de référence reste le précédent
+        blocks = [
+            [subject, fp, packed[i], None, None] if i in packed else [subject] + previous[subject]
+            for i, (subject, fp) in enumerate(zip(subjects, fingerprints))
+        ]
+        cache.save_manifest(manifest['file'], blocks, pack_entries + len(changed))
+    else:
+        old = b''
+        if manifest is not None:
+            try:
+                old = (cache.export_dir / manifest['file']).read_bytes()
+            except FileNotFoundError:
+                # Fichier précédent supprimé : tous les blocs sont rendus
+                previous = {subject: block[:2] + [None, None] for subject, block in previous.items()}
+        
+        if compact:
+            packed = dict(enumerate(cache.put_many(records, reset=True)))
+            pack_entries = len(records)
+        else:
+            packed = dict(zip(changed, cache.put_many([records[i] for i in changed])))
+            pack_entries += len(changed)
+        
+        parts = [owl_header(model_name).encode('utf-8')]
+        position = len(parts[0])
+        blocks = []
+        
+        changed_rows = set(changed)
+        for i, (subject, fp) in enumerate(zip(subjects, fingerprints)):
+            if i in changed_rows or previous[subject][2] is None:
+                block = owl_block(records[i]).encode('utf-8')
+            else:
+                _, _, start, end = previous[subject]
+                block = old[start:end]
+            pack_offset = packed[i] if i in packed else previous[subject][1]
+            parts.append(block)
+            blocks.append([subject, fp, pack_offset, position, position + len(block)])
+            position += len(block)
+        
+        filepath = _unique_path(cache.export_dir, f"{model_name}_owl_{timestamp}", '.ttl')
+        _atomic_write(filepath, b''.join(parts))
+        cache.save_manifest(filepath.name, blocks, pack_entries)
+    
+    logger.info(f"Export incrémental ({len(changed)} modifiés, {len(removed)} retirés): {filepath}")
+    
+    return {
+        'path': filepath,
+        'mode': mode if manifest is not None else 'patch',
+        'added': added,
+        'modified': modified,
+        'removed': removed,
+        'unchanged': len(records) - len(changed)
+    }
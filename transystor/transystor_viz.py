@@ -3,85 +3,90 @@ TranSysTor Visualization Module
 Fonctions de visualisation 3D des cubes imbriqués
 """
 
-import plotly.graph_objects as go
-import numpy as np
-from transystor_core import CUBE_CONFIGS, t
+# Import relatif ou absolu
+try:
+    from transystor.transystor_core import CUBE_CONFIGS, math_module, t
+except ImportError:
+    from transystor_core import CUBE_CONFIGS, math_module, t
+
+
+def _hover_text(p):
+    """Construit le texte de survol HTML d'un principe"""
+    pos = p['position']
+    
+    hover_text = f"<b>{p['name']}</b><br>"
+    hover_text += f"Couche: {p['layer']}<br>"
+    hover_text += f"Position: [{pos[0]:.1f}, {pos[1]:.1f}, {pos[2]:.1f}]<br>"
+    hover_text += f"Type: {p.get('type', 'N/A')}<br><br>"
+    hover_text += p.get('description', '')
+    
+    if 'combination' in p:
+        hover_text += f"<br><br>⊗ {p['combination']}"
+    
+    return hover_text
 
 
 def create_nested_cubes_visualization(principles, show_layers, exclusive_layer=None, 
-                                     show_grid=True, show_axes=True, state=None):
+                                     show_grid=True, show_axes=True, state=None,
+                                     batched=False, lod=False, lod_thresholds=None):
     """
     Crée une visualisation 3D interactive complète des cubes imbriqués.
     
     Args:
-        principles: Liste des principes à afficher
+        principles: Liste des principes à afficher (ou PrincipleStore)
         show_layers: Dict indiquant quelles couches afficher
         exclusive_layer: Si défini, affiche uniquement cette couche
         show_grid: Afficher les grilles internes
         show_axes: Afficher les axes IJK
         state: Instance de IDEState pour traductions
+        batched: Regroupe les principes en une trace par couche
+            (O(couches) traces au lieu de O(principes))
+        lod: Adapte le niveau de détail au nombre de principes par couche
+            (étiquettes, survol, voxels) ; implique batched
+        lod_thresholds: Seuils de niveaux de détail (défaut LOD_THRESHOLDS)
     
     Returns:
         Figure Plotly
     """
+    # Plotly et NumPy ne sont chargés qu'au premier rendu
+    import plotly.graph_objects as go
+    
+    # Import relatif ou absolu
+    try:
+        from transystor.core.store import LAYERS
+        from transystor.visualization.geometry import layer_geometry
+        from transystor.visualization.lod import layer_traces
+    except ImportError:
+        from core.store import LAYERS
+        from visualization.geometry import layer_geometry
+        from visualization.lod import layer_traces
     
     fig = go.Figure()
     
     # 1. Plan CM0 (grille 5x5 horizontale)
     if show_layers.get('CM0', False) and (not exclusive_layer or exclusive_layer == 'CM0'):
-        z_plane = CUBE_CONFIGS['CM0']['z']
+        lines = layer_geometry(CUBE_CONFIGS['CM0']).lines
         
-        for i in range(6):
-            # Lignes horizontales
-            fig.add_trace(go.Scatter3d(
-                x=[0, 5], y=[i, i], z=[z_plane, z_plane],
-                mode='lines',
-                line=dict(color='gray', width=2),
-                opacity=0.3,
-                showlegend=False,
-                hoverinfo='skip'
-            ))
-            # Lignes verticales
-            fig.add_trace(go.Scatter3d(
-                x=[i, i], y=[0, 5], z=[z_plane, z_plane],
-                mode='lines',
-                line=dict(color='gray', width=2),
-                opacity=0.3,
-                showlegend=False,
-                hoverinfo='skip'
-            ))
+        fig.add_trace(go.Scatter3d(
+            x=lines[:, 0], y=lines[:, 1], z=lines[:, 2],
+            mode='lines',
+            line=dict(color='gray', width=2),
+            opacity=0.3,
+            showlegend=False,
+            hoverinfo='skip'
+        ))
     
     # 2. Fonction pour dessiner un cube transparent
-    def draw_cube(size, center, color, layer_name, show):
+    def draw_cube(config, layer_name, show):
         if not show or (exclusive_layer and exclusive_layer != layer_name):
             return
         
-        half = size / 2
-        cx, cy, cz = center
-        
-        # Sommets
-        v = [
-            [cx-half, cy-half, cz-half], [cx+half, cy-half, cz-half],
-            [cx+half, cy+half, cz-half], [cx-half, cy+half, cz-half],
-            [cx-half, cy-half, cz+half], [cx+half, cy-half, cz+half],
-            [cx+half, cy+half, cz+half], [cx-half, cy+half, cz+half]
-        ]
-        
-        # Arêtes
-        edges = [
-            [0,1],[1,2],[2,3],[3,0],  # Face inf
-            [4,5],[5,6],[6,7],[7,4],  # Face sup
-            [0,4],[1,5],[2,6],[3,7]   # Verticales
-        ]
-        
-        lines = []
-        for e in edges:
-            lines.extend([v[e[0]], v[e[1]], [None, None, None]])
-        
-        x, y, z = zip(*lines)
+        size, color = config['size'], config['color']
+        geometry = layer_geometry(config)
+        edges = geometry.edge_lines
         
         fig.add_trace(go.Scatter3d(
-            x=x, y=y, z=z,
+            x=edges[:, 0], y=edges[:, 1], z=edges[:, 2],
             mode='lines',
             line=dict(color=color, width=3),
             opacity=0.6,
@@ -89,44 +94,54 @@ def create_nested_cubes_visualization(principles, show_layers, exclusive_layer=N
             hoverinfo='name'
         ))
         
-        # Grille interne
+        # Grille interne (réseau complet // à I, J et K)
         if show_grid and size >= 3:
-            for i in range(int(size)+1):
-                offset_x = cx - half + i
-                offset_y = cy - half + i
-                offset_z = cz - half + i
-                
-                # Lignes // à X
-                if i <= size:
-                    fig.add_trace(go.Scatter3d(
-                        x=[cx-half, cx+half], y=[offset_y, offset_y], z=[cz-half, cz-half],
-                        mode='lines', line=dict(color=color, width=0.5),
-                        opacity=0.15, showlegend=False, hoverinfo='skip'
-                    ))
+            lattice = geometry.lattice_lines
+            fig.add_trace(go.Scatter3d(
+                x=lattice[:, 0], y=lattice[:, 1], z=lattice[:, 2],
+                mode='lines', line=dict(color=color, width=0.5),
+                opacity=0.15, showlegend=False, hoverinfo='skip'
+            ))
     
     # Dessiner les cubes
     for layer in ['CM1', 'CM2', 'CM3']:
-        config = CUBE_CONFIGS[layer]
-        draw_cube(config['size'], config['center'], config['color'], 
-                 layer, show_layers.get(layer, False))
+        draw_cube(CUBE_CONFIGS[layer], layer, show_layers.get(layer, False))
     
     # 3. Principes
+    by_layer = {}
+    store = principles if hasattr(principles, 'positions_view') else None
+    
+    if store is not None and (batched or lod):
+        # PrincipleStore : tranches par couche, sans parcourir les dicts
+        for layer in LAYERS:
+            if exclusive_layer and layer != exclusive_layer:
+                continue
+            if not exclusive_layer and not show_layers.get(layer, False):
+                continue
+            if not store.count(layer):
+                continue
+            traces = layer_traces(
+                layer, store.layer(layer), CUBE_CONFIGS[layer]['color'], _hover_text,
+                level=None if lod else 'full', thresholds=lod_thresholds,
+                positions=store.positions_view(layer), names=store.names_view(layer),
+                colors=store.colors_of(layer, CUBE_CONFIGS[layer]['color'])
+            )
+            for trace in traces:
+                fig.add_trace(trace)
+        principles = ()
+    
     for p in principles:
         if exclusive_layer and p['layer'] != exclusive_layer:
             continue
         if not exclusive_layer and not show_layers.get(p['layer'], False):
             continue
         
-        pos = p['position']
-        
-        hover_text = f"<b>{p['name']}</b><br>"
-        hover_text += f"Couche: {p['layer']}<br>"
-        hover_text += f"Position: [{pos[0]:.1f}, {pos[1]:.1f}, {pos[2]:.1f}]<br>"
-        hover_text += f"Type: {p.get('type', 'N/A')}<br><br>"
-        hover_text += p.get('description', '')
+        if batched or lod:
+            by_layer.setdefault(p['layer'], []).append(p)
+            continue
         
-        if 'combination' in p:
-            hover_text += f"<br><br>⊗ {p['combination']}"
+        pos = p['position']
+        hover_text = _hover_text(p)
         
         fig.add_trace(go.Scatter3d(
             x=[pos[0]], y=[pos[1]], z=[pos[2]],
@@ -145,6 +160,15 @@ def create_nested_cubes_visualization(principles, show_layers, exclusive_layer=N
             hoverinfo='text'
         ))
     
+    # Une seule trace de marqueurs par couche (attributs par point)
+    for layer, layer_principles in by_layer.items():
+        traces = layer_traces(
+            layer, layer_principles, CUBE_CONFIGS[layer]['color'], _hover_text,
+            level=None if lod else 'full', thresholds=lod_thresholds
+        )
+        for trace in traces:
+            fig.add_trace(trace)
+    
     # 4. Axes IJK
     if show_axes:
         # Axe I (rouge)
@@ -216,24 +240,4 @@ def compute_orthogonality(principles):
     Returns:
         Tuple (score, matrice)
     """
-    vectors = np.array([p['position'] for p in principles if 'position' in p])
-    
-    if len(vectors) < 2:
-        return 1.0, np.array([[]])
-    
-    n = len(vectors)
-    ortho_matrix = np.zeros((n, n))
-    
-    for i in range(n):
-        for j in range(n):
-            if i != j:
-                v1 = vectors[i] / (np.linalg.norm(vectors[i]) + 1e-6)
-                v2 = vectors[j] / (np.linalg.norm(vectors[j]) + 1e-6)
-                ortho_matrix[i, j] = abs(np.dot(v1, v2))
-    
-    ortho_score = 1 - np.mean(ortho_matrix[ortho_matrix > 0]) if ortho_matrix.any() else 1.0
-    
-    return ortho_score, ortho_matrix
-
-
-print("✅ Module TranSysTor Visualization chargé")
\ No newline at end of file
+    return math_module('orthogonality').compute_orthogonality(principles)
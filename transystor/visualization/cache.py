@@ -0,0 +1,69 @@
+"""
+TranSysTor Visualization - Cache de figures
+Cache LRU des figures Plotly et de leurs parties statiques
+"""
+
+from transystor.core.cache import LRUCache
+from transystor.core.hashing import principles_fingerprint
+
+
+class FigureCache:
+    """
+    Cache des figures de la vue 3D
+
+    Les figures complètes sont indexées par l'empreinte des principes et
+    les options de vue ; les parties (géométrie statique des cubes, axes,
+    plan CM0, traces des principes) sont mises en cache séparément pour
+    être réutilisées quand une seule option change.
+    """
+
+    def __init__(self, max_figures=16, max_parts=64):
+        """
+        Args:
+            max_figures: Nombre maximal de figures complètes
+            max_parts: Nombre maximal de parties de figures
+        """
+        self.figures = LRUCache(max_figures)
+        self.parts = LRUCache(max_parts)
+
+    @staticmethod
+    def figure_key(principles, visible_layers, exclusive_layer, show_grid, show_axes, language):
+        """
+        Construit la clé d'une figure
+
+        Args:
+            principles: Liste des principes
+            visible_layers: Dict des couches visibles
+            exclusive_layer: Couche exclusive ou None
+            show_grid: Grille affichée
+            show_axes: Axes affichés
+            language: Langue de l'interface
+
+        Returns:
+            Tuple (empreinte, couches visibles, couche exclusive, grille, axes, langue)
+        """
+        return (
+            principles_fingerprint(principles),
+            tuple(sorted(visible_layers.items())),
+            exclusive_layer,
+            bool(show_grid),
+            bool(show_axes),
+            language
+        )
+
+    def part(self, key, builder):
+        """Retourne une liste de traces mise en cache"""
+        return self.parts.get_or_build(key, builder)
+
+    def figure(self, key, builder):
+        """Retourne une figure complète mise en cache"""
+        return self.figures.get_or_build(key, builder)
+
+    def clear(self):
+        """Vide les deux niveaux de cache"""
+        self.figures.clear()
+        self.parts.clear()
+
+    def stats(self):
+        """Retourne les statistiques des deux niveaux de cache"""
+        return {'figures': self.figures.stats(), 'parts': self.parts.stats()}
@@ -0,0 +1,152 @@
+"""
+TranSysTor Visualization - Géométrie statique
+Sommets, arêtes, faces et grilles des couches de CUBE_CONFIGS, calculés
+une seule fois sous forme de tableaux NumPy
+"""
+
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+# Arêtes d'un cube (indices de sommets)
+CUBE_EDGES = np.array([
+    [0, 1], [1, 2], [2, 3], [3, 0],  # Face inf
+    [4, 5], [5, 6], [6, 7], [7, 4],  # Face sup
+    [0, 4], [1, 5], [2, 6], [3, 7]   # Verticales
+])
+
+# Faces triangulées d'un cube (Mesh3d i, j, k)
+CUBE_FACES = np.array([
+    [0, 0, 4, 4, 0, 2, 1, 1, 5, 5, 1, 3, 2, 2, 6, 6, 4, 0, 3, 3, 7, 7, 5, 1],
+    [1, 3, 5, 7, 4, 6, 2, 0, 6, 4, 5, 7, 3, 1, 7, 5, 6, 2, 0, 2, 4, 6, 7, 3],
+    [2, 2, 6, 6, 5, 5, 3, 3, 7, 7, 6, 6, 1, 1, 5, 5, 7, 7, 2, 2, 6, 6, 4, 4]
+]).T
+
+CubeGeometry = namedtuple('CubeGeometry', ['vertices', 'edges', 'faces', 'edge_lines', 'lattice_lines'])
+PlaneGeometry = namedtuple('PlaneGeometry', ['lines'])
+
+
+def segments_to_lines(starts, ends):
+    """
+    Convertit des segments en un tampon de points séparés par NaN
+
+    Args:
+        starts: Tableau (m, 3) des origines
+        ends: Tableau (m, 3) des extrémités
+
+    Returns:
+        Tableau (3m, 3) utilisable par une seule trace Scatter3d
+    """
+    starts = np.asarray(starts, dtype=float)
+    ends = np.asarray(ends, dtype=float)
+    gaps = np.full_like(starts, np.nan)
+    return np.stack([starts, ends, gaps], axis=1).reshape(-1, 3)
+
+
+def lattice_segments(lows, highs, steps):
+    """
+    Calcule toutes les lignes d'un réseau 3D régulier (// à I, J et K)
+
+    Args:
+        lows: Coordonnées minimales [x, y, z]
+        highs: Coordonnées maximales [x, y, z]
+        steps: Nombre de cellules par axe
+
+    Returns:
+        Tuple (origines, extrémités) de tableaux (m, 3)
+    """
+    ticks = [np.linspace(lo, hi, n + 1) for lo, hi, n in zip(lows, highs, steps)]
+    starts, ends = [], []
+
+    for axis in range(3):
+        others = [a for a in range(3) if a != axis]
+        grid_b, grid_c = np.meshgrid(ticks[others[0]], ticks[others[1]], indexing='ij')
+
+        start = np.empty((grid_b.size, 3))
+        start[:, others[0]] = grid_b.ravel()
+        start[:, others[1]] = grid_c.ravel()
+        end = start.copy()
+        start[:, axis] = lows[axis]
+        end[:, axis] = highs[axis]
+
+        starts.append(start)
+        ends.append(end)
+
+    return np.concatenate(starts), np.concatenate(ends)
+
+
+@lru_cache(maxsize=None)
+def cube_geometry(size, center):
+    """
+    Calcule la géométrie d'un cube (mise en cache)
+
+    Args:
+        size: Nombre de cellules par arête
+        center: Centre (cx, cy, cz) sous forme de tuple
+
+    Returns:
+        CubeGeometry dont les tableaux sont en lecture seule
+    """
+    half = size / 2
+    center = np.asarray(center, dtype=float)
+    corners = np.array([
+        [-1, -1, -1], [1, -1, -1], [1, 1, -1], [-1, 1, -1],
+        [-1, -1, 1], [1, -1, 1], [1, 1, 1], [-1, 1, 1]
+    ], dtype=float)
+    vertices = center + half * corners
+
+    edge_lines = segments_to_lines(vertices[CUBE_EDGES[:, 0]], vertices[CUBE_EDGES[:, 1]])
+    lattice_lines = segments_to_lines(*lattice_segments(
+        center - half, center + half, [int(size)] * 3
+    ))
+
+    geometry = CubeGeometry(vertices, CUBE_EDGES, CUBE_FACES, edge_lines, lattice_lines)
+    for array in geometry:
+        array.setflags(write=False)
+    return geometry
+
+
+@lru_cache(maxsize=None)
+def plane_geometry(size, z):
+    """
+    Calcule la grille d'un plan horizontal (mise en cache)
+
+    Args:
+        size: Tuple (nx, ny) du nombre de cellules
+        z: Altitude du plan
+
+    Returns:
+        PlaneGeometry dont le tableau est en lecture seule
+    """
+    nx, ny = size
+    xs = np.arange(nx + 1, dtype=float)
+    ys = np.arange(ny + 1, dtype=float)
+
+    starts = np.concatenate([
+        np.column_stack([np.zeros_like(ys), ys, np.full_like(ys, z)]),
+        np.column_stack([xs, np.zeros_like(xs), np.full_like(xs, z)])
+    ])
+    ends = np.concatenate([
+        np.column_stack([np.full_like(ys, nx), ys, np.full_like(ys, z)]),
+        np.column_stack([xs, np.full_like(xs, ny), np.full_like(xs, z)])
+    ])
+
+    lines = segments_to_lines(starts, ends)
+    lines.setflags(write=False)
+    return PlaneGeometry(lines)
+
+
+def layer_geometry(config):
+    """
+    Retourne la géométrie précalculée d'une entrée de CUBE_CONFIGS
+
+    Args:
+        config: Configuration de la couche (type 'cube' ou 'plane')
+
+    Returns:
+        CubeGeometry ou PlaneGeometry
+    """
+    if config.get('type') == 'plane':
+        return plane_geometry(tuple(config['size']), float(config['z']))
+    return cube_geometry(config['size'], tuple(config['center']))
@@ -0,0 +1,174 @@
+"""
+TranSysTor Visualization - Niveaux de détail
+Rendu adapté au nombre de points pour les grands nuages d'instances CM3
+"""
+
+import numpy as np
+import plotly.graph_objects as go
+
+# Seuils (nombre de principes par couche) au-delà desquels le détail baisse
+LOD_THRESHOLDS = {
+    'labels': 500,     # Au-delà : plus d'étiquettes texte
+    'hover': 5000,     # Au-delà : survol construit à la demande (hovertemplate)
+    'voxels': 50000    # Au-delà : agrégation en voxels du réseau du cube
+}
+
+# Niveaux de détail, du plus riche au plus sobre
+LOD_LEVELS = ('full', 'markers', 'lazy', 'voxels')
+
+
+def detail_level(count, thresholds=None):
+    """
+    Détermine le niveau de détail selon le nombre de points
+
+    Args:
+        count: Nombre de points à afficher
+        thresholds: Dict de seuils (défaut LOD_THRESHOLDS)
+
+    Returns:
+        Niveau parmi LOD_LEVELS
+    """
+    limits = dict(LOD_THRESHOLDS, **(thresholds or {}))
+
+    if count > limits['voxels']:
+        return 'voxels'
+    if count > limits['hover']:
+        return 'lazy'
+    if count > limits['labels']:
+        return 'markers'
+    return 'full'
+
+
+def voxel_aggregate(positions, cell_size=1.0):
+    """
+    Regroupe des positions dans les cellules du réseau du cube
+
+    Les cellules sont centrées sur les coordonnées entières (le cube
+    5×5×5 centré en [2, 2, 2] couvre exactement les cellules 0..4).
+
+    Args:
+        positions: Tableau (n, 3) des positions
+        cell_size: Arête d'une cellule
+
+    Returns:
+        Tuple (centres (m, 3), effectifs (m,))
+    """
+    positions = np.asarray(positions, dtype=float)
+    if not len(positions):
+        return np.zeros((0, 3)), np.zeros(0, dtype=int)
+
+    cells = np.floor(positions / cell_size + 0.5).astype(np.int64)
+    cells, counts = np.unique(cells, axis=0, return_counts=True)
+    return cells * cell_size, counts
+
+
+def color_codes(colors):
+    """
+    Encode des couleurs en entiers et échelle discrète
+
+    La validation Plotly d'une liste de couleurs CSS est linéaire et
+    lente ; des codes entiers avec une échelle par paliers donnent le
+    même rendu pour un coût négligeable.
+
+    Args:
+        colors: Liste des couleurs CSS par point
+
+    Returns:
+        Dict d'attributs de marker (color, colorscale, cmin, cmax)
+    """
+    palette, codes = np.unique(np.asarray(colors, dtype=object).astype(str), return_inverse=True)
+    k = len(palette)
+
+    colorscale = []
+    for i, color in enumerate(palette):
+        colorscale.append([i / k, color])
+        colorscale.append([(i + 1) / k, color])
+
+    return dict(color=codes, colorscale=colorscale, cmin=-0.5, cmax=k - 0.5, showscale=False)
+
+
+def layer_traces(layer, principles, color, hover_text, level=None, thresholds=None,
+                 positions=None, names=None, colors=None):
+    """
+    Construit les traces des principes d'une couche
+
+    Args:
+        layer: Nom de la couche
+        principles: Liste des principes de la couche
+        color: Couleur de la couche (voxels, couleur par défaut)
+        hover_text: Fonction principe -> texte de survol HTML
+        level: Niveau imposé (sinon déduit du nombre de points)
+        thresholds: Seuils de niveaux de détail
+        positions: Tableau (n, 3) des positions s'il est déjà disponible
+            (PrincipleStore), sinon extrait des dicts
+        names: Noms des principes s'ils sont déjà disponibles
+        colors: Couleurs des principes si elles sont déjà disponibles
+
+    Returns:
+        Liste de traces Plotly
+    """
+    count = len(principles)
+    if not count:
+        return []
+
+    level = level or detail_level(count, thresholds)
+    if positions is None:
+        positions = np.array([p['position'][:3] for p in principles], dtype=float)
+
+    if level == 'voxels':
+        centers, counts = voxel_aggregate(positions)
+        sizes = 4 + 12 * np.sqrt(counts / counts.max())
+        return [go.Scatter3d(
+            x=centers[:, 0], y=centers[:, 1], z=centers[:, 2],
+            mode='markers',
+            marker=dict(size=sizes, color=color, opacity=0.7),
+            customdata=counts,
+            name=f'{layer} ({count})',
+            hovertemplate='[%{x}, %{y}, %{z}]<br>%{customdata} principes<extra>' + layer + '</extra>'
+        )]
+
+    if colors is None:
+        colors = [p.get('color', color) for p in principles]
+    if names is None:
+        names = [p['name'] for p in principles]
+    colors, names = list(colors), list(names)
+
+    if level == 'full':
+        return [go.Scatter3d(
+            x=positions[:, 0], y=positions[:, 1], z=positions[:, 2],
+            mode='markers+text',
+            marker=dict(
+                size=10,
+                color=colors,
+                line=dict(color='white', width=2),
+                opacity=0.9
+            ),
+            text=names,
+            textposition='top center',
+            textfont=dict(size=9, color=colors),
+            name=layer,
+            hovertext=[hover_text(p) for p in principles],
+            hoverinfo='text'
+        )]
+
+    marker = dict(size=4, opacity=0.8, **color_codes(colors))
+
+    if level == 'markers':
+        return [go.Scatter3d(
+            x=positions[:, 0], y=positions[:, 1], z=positions[:, 2],
+            mode='markers',
+            marker=marker,
+            name=f'{layer} ({count})',
+            hovertext=[hover_text(p) for p in principles],
+            hoverinfo='text'
+        )]
+
+    # 'lazy' : le texte de survol est composé côté navigateur au survol
+    return [go.Scatter3d(
+        x=positions[:, 0], y=positions[:, 1], z=positions[:, 2],
+        mode='markers',
+        marker=marker,
+        customdata=names,
+        name=f'{layer} ({count})',
+        hovertemplate='<b>%{customdata}</b><br>[%{x:.1f}, %{y:.1f}, %{z:.1f}]<extra>' + layer + '</extra>'
+    )]